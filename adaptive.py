@@ -0,0 +1,112 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from item_bank import ItemBank
+from scoring import AXIS_PAIRS, CODE_INDEX
+
+
+# =========================================
+# 적응형(조기 종료) 출제 순서
+#  - 네 축의 문항을 번갈아 낸다. (E/I, S/N, T/F, J/P, E/I, …)
+#  - 남은 문항을 모두 반대쪽으로 답해도 결과 글자가 바뀌지 않으면
+#    그 축은 "결정됨"으로 보고 나머지 문항을 건너뛴다.
+#    동점이면 앞 글자(E/S/T/J)이므로 (>= 규칙)
+#      앞 글자 확정: front >= back + 남은 수
+#      뒷 글자 확정: back > front + 남은 수
+#    축당 9문항이면 한쪽이 5개가 되는 순간이다.
+#  - 건너뛴 문항 id는 결과와 함께 저장한다. (점수는 답한 문항 기준)
+# =========================================
+@dataclass(frozen=True)
+class AdaptivePlan:
+    ids: Tuple[int, ...]
+    axes: Tuple[int, ...]       # 문항 위치별 축 번호 (AXIS_PAIRS 기준, 모르면 -1)
+    order: Tuple[int, ...]      # 출제할 문항 위치 순서 (축 교차)
+    axis_totals: Tuple[int, ...]  # 축별 문항 수
+
+    def axis_counts(self, answers: Dict[int, str]) -> List[List[int]]:
+        # 축별 [앞 글자 수, 뒷 글자 수, 답한 문항 수]
+        counts = [[0, 0, 0] for _ in AXIS_PAIRS]
+        for pos, (qid, axis) in enumerate(zip(self.ids, self.axes)):
+            code = answers.get(qid)
+            if axis < 0 or code is None:
+                continue
+            counts[axis][2] += 1
+            idx = CODE_INDEX.get(code)
+            if idx is not None and idx // 2 == axis:
+                counts[axis][idx % 2] += 1
+        return counts
+
+    def decided_axes(self, answers: Dict[int, str]) -> List[bool]:
+        decided = []
+        for (front, back, answered), total in zip(self.axis_counts(answers), self.axis_totals):
+            remaining = total - answered
+            decided.append(front >= back + remaining or back > front + remaining)
+        return decided
+
+    def next_position(self, answers: Dict[int, str]) -> Optional[int]:
+        # 다음에 낼 문항 위치 (없으면 None = 검사 끝)
+        decided = self.decided_axes(answers)
+        for pos in self.order:
+            if self.ids[pos] in answers:
+                continue
+            axis = self.axes[pos]
+            if axis >= 0 and decided[axis]:
+                continue
+            return pos
+        return None
+
+    def skipped(self, answers: Dict[int, str]) -> List[int]:
+        # 결정된 축에서 답하지 않은 문항 id
+        decided = self.decided_axes(answers)
+        return [
+            qid
+            for qid, axis in zip(self.ids, self.axes)
+            if qid not in answers and axis >= 0 and decided[axis]
+        ]
+
+    def remaining(self, answers: Dict[int, str]) -> int:
+        # 앞으로 물을 수 있는 최대 문항 수 (진행률 표시용)
+        return len(self.ids) - sum(1 for qid in self.ids if qid in answers) - len(self.skipped(answers))
+
+
+def _axis_of(a_code_index: int, b_code_index: int) -> int:
+    # 선택지 코드로 축을 정한다. (채점과 같은 기준)
+    for idx in (a_code_index, b_code_index):
+        if idx >= 0:
+            return idx // 2
+    return -1
+
+
+def build_adaptive_plan(bank: ItemBank) -> AdaptivePlan:
+    axes = tuple(_axis_of(a, b) for a, b in zip(bank.a_code_index, bank.b_code_index))
+
+    # 축별 대기열을 만든 뒤 한 문항씩 번갈아 꺼낸다. (축 안의 순서는 CSV 순서)
+    queues: List[List[int]] = [[] for _ in AXIS_PAIRS]
+    unknown: List[int] = []
+    for pos, axis in enumerate(axes):
+        (queues[axis] if axis >= 0 else unknown).append(pos)
+    order: List[int] = []
+    for step in range(max((len(q) for q in queues), default=0)):
+        order.extend(q[step] for q in queues if step < len(q))
+    order.extend(unknown)
+
+    return AdaptivePlan(
+        ids=bank.ids,
+        axes=axes,
+        order=tuple(order),
+        axis_totals=tuple(len(q) for q in queues),
+    )
+
+
+_plans: Dict[str, AdaptivePlan] = {}
+_plans_lock = threading.Lock()
+
+
+def get_adaptive_plan(bank: ItemBank) -> AdaptivePlan:
+    plan = _plans.get(bank.content_hash)
+    if plan is None:
+        plan = build_adaptive_plan(bank)
+        with _plans_lock:
+            _plans[bank.content_hash] = plan
+    return plan
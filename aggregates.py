@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from scoring import ALL_TYPES, AXIS_PAIRS, CODE_INDEX, SCORE_KEYS
+
+
+# =========================================
+# 학교·학년·반 단위 유형 분포 (증분 집계)
+#  - 결과가 확정될 때마다 카운터만 더한다. (결과를 다시 읽거나 채점하지 않음)
+#  - cohort 는 "학교/학년/반" 처럼 '/' 로 나눈 경로이고, 모든 상위 경로에도 더한다.
+#    예: "A고/2학년/3반" -> "*", "A고", "A고/2학년", "A고/2학년/3반"
+#  - 시간 창(최근 10분 등)은 분 단위 버킷을 밀어 가며 합계를 유지하므로,
+#    대시보드 새로고침 한 번은 집계 수와 무관하게 상수 시간이다.
+#  - 워커 프로세스가 여럿이면 catch_up() 으로 공유 결과 DB 에서 마지막으로 읽은 id 이후의
+#    결과만 더한다. (모든 워커가 같은 분포를 보고, 새로고침 비용은 새 결과 수만큼)
+# =========================================
+ALL_COHORTS = "*"
+TYPE_INDEX: Dict[str, int] = {t: i for i, t in enumerate(ALL_TYPES)}
+DEFAULT_WINDOWS = (10 * 60, 60 * 60, 24 * 60 * 60)  # 초
+BUCKET_SECONDS = 60
+
+
+class Aggregate:
+    __slots__ = ("count", "types", "score_sums", "histograms")
+
+    def __init__(self, max_score: int):
+        self.count = 0
+        self.types = [0] * len(ALL_TYPES)
+        self.score_sums = [0] * len(SCORE_KEYS)
+        # 축별 앞 글자(E/S/T/J) 점수 분포
+        self.histograms = [[0] * (max_score + 1) for _ in AXIS_PAIRS]
+
+    def add_result(self, mbti_type: str, scores: Dict[str, int], sign: int = 1) -> None:
+        self.count += sign
+        idx = TYPE_INDEX.get(mbti_type)
+        if idx is not None:
+            self.types[idx] += sign
+        for k, v in scores.items():
+            self.score_sums[CODE_INDEX[k]] += sign * int(v)
+        for hist, (a, _) in zip(self.histograms, AXIS_PAIRS):
+            hist[min(int(scores[a]), len(hist) - 1)] += sign
+
+    def merge(self, other: "Aggregate", sign: int = 1) -> None:
+        self.count += sign * other.count
+        for i, v in enumerate(other.types):
+            self.types[i] += sign * v
+        for i, v in enumerate(other.score_sums):
+            self.score_sums[i] += sign * v
+        for hist, other_hist in zip(self.histograms, other.histograms):
+            for i, v in enumerate(other_hist):
+                hist[i] += sign * v
+
+    # 화면용 요약
+    def type_counts(self) -> Dict[str, int]:
+        return dict(zip(ALL_TYPES, self.types))
+
+    def mean_scores(self) -> Dict[str, float]:
+        if self.count == 0:
+            return {k: 0.0 for k in SCORE_KEYS}
+        return {k: v / self.count for k, v in zip(SCORE_KEYS, self.score_sums)}
+
+    def axis_histograms(self) -> Dict[str, List[int]]:
+        return {f"{a}{b}": list(h) for h, (a, b) in zip(self.histograms, AXIS_PAIRS)}
+
+
+class _Window:
+    __slots__ = ("buckets", "index", "total", "span", "latest", "max_score")
+
+    def __init__(self, seconds: int, max_score: int):
+        self.span = max(1, seconds // BUCKET_SECONDS)
+        self.max_score = max_score
+        self.buckets: Deque[Tuple[int, Aggregate]] = deque()  # 버킷 번호 순
+        self.index: Dict[int, Aggregate] = {}  # 버킷 번호 -> 같은 Aggregate
+        self.total = Aggregate(max_score)
+        self.latest: Optional[int] = None  # 지금까지 본 가장 최근 버킷 (결과 또는 조회 시각)
+
+    def add(self, bucket: int, mbti_type: str, scores: Dict[str, int]) -> None:
+        agg = self.index.get(bucket)
+        if agg is None:
+            if self.latest is not None and bucket <= self.latest - self.span:
+                return  # 창보다 오래된 결과는 이 창에 넣지 않는다.
+            agg = self.index[bucket] = Aggregate(self.max_score)
+            # 늦게 들어온 결과도 번호 순서 자리에 끼운다. (대부분 맨 뒤 근처라 짧게 훑는다)
+            pos = len(self.buckets)
+            while pos and self.buckets[pos - 1][0] > bucket:
+                pos -= 1
+            self.buckets.insert(pos, (bucket, agg))
+            if self.latest is None or bucket > self.latest:
+                self.latest = bucket
+                self._drop_through(bucket - self.span)
+        agg.add_result(mbti_type, scores)
+        self.total.add_result(mbti_type, scores)
+
+    def expire(self, now_bucket: int) -> None:
+        if self.latest is None or now_bucket > self.latest:
+            self.latest = now_bucket
+        self._drop_through(now_bucket - self.span)
+
+    def _drop_through(self, last_bucket: int) -> None:
+        while self.buckets and self.buckets[0][0] <= last_bucket:
+            bucket, agg = self.buckets.popleft()
+            del self.index[bucket]
+            self.total.merge(agg, sign=-1)
+
+
+class CohortStats:
+    def __init__(self, max_score: int, windows: Sequence[int]):
+        self.max_score = max_score
+        self.total = Aggregate(max_score)
+        self.windows: Dict[int, _Window] = {w: _Window(w, max_score) for w in windows}
+
+    def add(self, bucket: int, mbti_type: str, scores: Dict[str, int]) -> None:
+        # 늦게 들어온(과거 시각) 결과도 아직 창 안의 버킷이면 그 버킷에 더한다.
+        self.total.add_result(mbti_type, scores)
+        for window in self.windows.values():
+            window.add(bucket, mbti_type, scores)
+
+    def window(self, seconds: int, now_bucket: int) -> Aggregate:
+        window = self.windows[seconds]
+        window.expire(now_bucket)
+        return window.total
+
+
+class DistributionAggregator:
+    def __init__(
+        self,
+        max_score: int = 9,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_score = max_score
+        self.windows = tuple(windows)
+        self.clock = clock
+        self._cohorts: Dict[str, CohortStats] = {}
+        self._lock = threading.Lock()
+        self._catch_up_lock = threading.Lock()
+        self.last_id = 0  # catch_up 으로 마지막에 더한 결과 id
+
+    @staticmethod
+    def cohort_paths(cohort: Optional[str]) -> List[str]:
+        paths = [ALL_COHORTS]
+        parts = [p.strip() for p in (cohort or "").split("/") if p.strip()]
+        for i in range(len(parts)):
+            paths.append("/".join(parts[: i + 1]))
+        return paths
+
+    def record(
+        self,
+        mbti_type: str,
+        scores: Dict[str, int],
+        cohort: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        bucket = int((self.clock() if timestamp is None else timestamp) // BUCKET_SECONDS)
+        with self._lock:
+            for path in self.cohort_paths(cohort):
+                stats = self._cohorts.get(path)
+                if stats is None:
+                    stats = self._cohorts[path] = CohortStats(self.max_score, self.windows)
+                stats.add(bucket, mbti_type, scores)
+
+    def record_many(self, results: Iterable[Tuple[float, Optional[str], str, Dict[str, int]]]) -> int:
+        # (timestamp, cohort, mbti_type, scores) — 시작할 때 저장된 결과로 채우는 용도
+        n = 0
+        for timestamp, cohort, mbti_type, scores in results:
+            self.record(mbti_type, scores, cohort, timestamp)
+            n += 1
+        return n
+
+    def catch_up(
+        self,
+        summaries_after: Callable[[int], Iterable[Tuple[int, float, Optional[str], str, Dict[str, int]]]],
+    ) -> int:
+        # summaries_after(last_id) -> (id, timestamp, cohort, mbti_type, scores) 를 id 순서로
+        # (예: ResultStore.iter_summaries_after). 여러 세션이 동시에 불러도 한 번씩만 더한다.
+        with self._catch_up_lock:
+            n = 0
+            for row_id, timestamp, cohort, mbti_type, scores in summaries_after(self.last_id):
+                self.record(mbti_type, scores, cohort, timestamp)
+                self.last_id = row_id
+                n += 1
+            return n
+
+    def cohorts(self) -> List[str]:
+        with self._lock:
+            return sorted(self._cohorts)
+
+    def snapshot(self, cohort: str = ALL_COHORTS, window: Optional[int] = None) -> Aggregate:
+        # 반환값은 복사본이다. (화면 그리는 동안 값이 바뀌지 않게)
+        with self._lock:
+            stats = self._cohorts.get(cohort)
+            result = Aggregate(self.max_score)
+            if stats is None:
+                return result
+            source = stats.total if window is None else stats.window(window, int(self.clock() // BUCKET_SECONDS))
+            result.merge(source)
+            return result
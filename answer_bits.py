@@ -0,0 +1,157 @@
+import base64
+import threading
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from item_bank import ItemBank
+from scoring import SCORE_KEYS, mbti_type_from_scores
+
+
+# =========================================
+# 비트 응답 표현 (answered / choices 비트마스크)
+#  - 문항 위치 i 가 비트 i 이다.
+#      answered: 답한 문항이면 1
+#      choices : option_b 를 골랐으면 1 (option_a 면 0)
+#  - 채점: 코드별로 미리 만든 마스크와 AND 한 뒤 popcount
+#      score[k] = popcount(answered & ~choices & a_mask[k])
+#               + popcount(answered &  choices & b_mask[k])
+#  - 토큰: 주소(?r=)에 넣을 수 있는 짧은 문자열 (36문항이면 20자)
+#      [형식 1B][플래그 1B][문항 은행 태그 3B][answered][choices]
+#    문항 은행이 바뀌면 태그가 달라지므로 예전 토큰은 거절한다.
+# =========================================
+TOKEN_FORMAT = 1
+FLAG_FINISHED = 1
+FLAG_ADAPTIVE = 2
+_TAG_BYTES = 3
+INT64_BITS = 63  # SQLite INTEGER 에 그대로 넣을 수 있는 문항 수
+
+
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:  # Python 3.9
+    def _popcount(x: int) -> int:
+        return bin(x).count("1")
+
+
+class AnswerTokenError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class AnswerBits:
+    answered: int = 0
+    choices: int = 0
+
+    def __len__(self) -> int:
+        return _popcount(self.answered)
+
+
+@dataclass(frozen=True)
+class BankMasks:
+    ids: Tuple[int, ...]
+    position: Dict[int, int]
+    a_codes: Tuple[str, ...]
+    b_codes: Tuple[str, ...]
+    a_masks: Tuple[int, ...]  # SCORE_KEYS 순서
+    b_masks: Tuple[int, ...]
+    tag: bytes
+
+    @property
+    def n_items(self) -> int:
+        return len(self.ids)
+
+    @property
+    def fits_int64(self) -> bool:
+        return self.n_items <= INT64_BITS
+
+    def encode(self, answers: Dict[int, str]) -> AnswerBits:
+        answered = choices = 0
+        for qid, code in answers.items():
+            pos = self.position.get(int(qid))
+            if pos is None:
+                continue
+            if code == self.a_codes[pos]:
+                answered |= 1 << pos
+            elif code == self.b_codes[pos]:
+                answered |= 1 << pos
+                choices |= 1 << pos
+        return AnswerBits(answered, choices)
+
+    def decode(self, bits: AnswerBits) -> Dict[int, str]:
+        answers: Dict[int, str] = {}
+        for pos, qid in enumerate(self.ids):
+            if bits.answered >> pos & 1:
+                answers[qid] = self.b_codes[pos] if bits.choices >> pos & 1 else self.a_codes[pos]
+        return answers
+
+    def score(self, bits: AnswerBits) -> Tuple[str, Dict[str, int]]:
+        a_sel = bits.answered & ~bits.choices
+        b_sel = bits.answered & bits.choices
+        scores = {
+            k: _popcount(a_sel & am) + _popcount(b_sel & bm)
+            for k, am, bm in zip(SCORE_KEYS, self.a_masks, self.b_masks)
+        }
+        return mbti_type_from_scores(scores), scores
+
+    # -----------------------------
+    # 주소용 토큰
+    # -----------------------------
+    def to_token(self, bits: AnswerBits, flags: int = 0) -> str:
+        size = (self.n_items + 7) // 8
+        raw = (
+            bytes((TOKEN_FORMAT, flags))
+            + self.tag
+            + bits.answered.to_bytes(size, "little")
+            + (bits.choices & bits.answered).to_bytes(size, "little")
+        )
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    def from_token(self, token: str) -> Tuple[AnswerBits, int]:
+        # (응답 비트, 플래그)
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (ValueError, TypeError):
+            raise AnswerTokenError("결과 코드 형식이 올바르지 않습니다.") from None
+        size = (self.n_items + 7) // 8
+        header = 2 + _TAG_BYTES
+        if len(raw) != header + 2 * size or raw[0] != TOKEN_FORMAT:
+            raise AnswerTokenError("결과 코드 형식이 올바르지 않습니다.")
+        if raw[2:header] != self.tag:
+            raise AnswerTokenError("다른 버전의 문항으로 만든 결과 코드입니다.")
+        answered = int.from_bytes(raw[header:header + size], "little")
+        choices = int.from_bytes(raw[header + size:], "little")
+        if answered >> self.n_items or choices & ~answered:
+            raise AnswerTokenError("결과 코드 형식이 올바르지 않습니다.")
+        return AnswerBits(answered, choices), raw[1]
+
+
+def build_bank_masks(bank: ItemBank) -> BankMasks:
+    a_masks = [0] * len(SCORE_KEYS)
+    b_masks = [0] * len(SCORE_KEYS)
+    for pos, (a, b) in enumerate(zip(bank.a_code_index, bank.b_code_index)):
+        if a >= 0:
+            a_masks[a] |= 1 << pos
+        if b >= 0:
+            b_masks[b] |= 1 << pos
+    return BankMasks(
+        ids=bank.ids,
+        position={qid: pos for pos, qid in enumerate(bank.ids)},
+        a_codes=bank.a_codes,
+        b_codes=bank.b_codes,
+        a_masks=tuple(a_masks),
+        b_masks=tuple(b_masks),
+        tag=bytes.fromhex(bank.content_hash[: 2 * _TAG_BYTES]),
+    )
+
+
+_masks: Dict[str, BankMasks] = {}
+_masks_lock = threading.Lock()
+
+
+def get_bank_masks(bank: ItemBank) -> BankMasks:
+    masks = _masks.get(bank.content_hash)
+    if masks is None:
+        masks = build_bank_masks(bank)
+        with _masks_lock:
+            _masks[bank.content_hash] = masks
+    return masks
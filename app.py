@@ -1,431 +1,623 @@
 import io
-from typing import Dict, List, Tuple
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
 
-import matplotlib
-matplotlib.use("Agg")  # GUI 없는 서버 환경용
-import matplotlib.pyplot as plt
 import pandas as pd
 import streamlit as st
 
+from adaptive import get_adaptive_plan
+from aggregates import ALL_COHORTS, DEFAULT_WINDOWS, DistributionAggregator
+from answer_bits import FLAG_ADAPTIVE, FLAG_FINISHED, AnswerTokenError, get_bank_masks
+from bank_registry import DEFAULT_BANK, BankRegistry, configured_banks
+from bulk_score import AnswerSheetError, AnswerSheetScorer, BulkProgress, score_answer_stream
+from client_form import FORM_KEY, client_questionnaire, is_complete
+from item_analysis import analyze, iter_store_chunks, render_html_report, write_item_csv
+from item_bank import ItemBank
+from metrics import RerunTimer, registry, start_exporter
+from mbti_core import (
+    PROFILE_HEADING,
+    get_result_fragments,
+    recommendation_source,
+    recommendations_for,
+    render_dimension_markdown,
+)
+from norms import NormStore
+from report_export import ExportProgress, export_reports, read_report_jobs
+from result_figure import configured_renderer, figure_cache, get_result_image, start_prewarm_thread
+from result_store import ResultRecord, ResultStore
+from scoring import AXIS_PAIRS
+from session_store import SessionRecord, SessionStore, open_session_backend
+from warmup import start_health_server, start_warmup_thread, state as warmup_state
+
 
 # =========================================
 # 기본 설정 & 세션 상태
 # =========================================
+rerun_timer = RerunTimer()  # 이번 rerun의 단계별 시간 측정
 st.set_page_config(page_title="고등학생 진로 MBTI 검사", layout="wide")
 
+
+# =========================================
+# 시작 준비 (프로세스당 한 번, 백그라운드)
+#  - 문항 은행, 유형 설명, 한글 글꼴, matplotlib 첫 그림을 미리 준비한다.
+#  - python -m warmup serve 로 띄웠으면 같은 warmup 모듈(state)을 쓰므로 이미 끝나 있어 바로 돌아온다.
+#    (이때 로드밸런서는 준비 상태 포트의 /ready 를 확인한다. warmup.py 참고)
+#  - streamlit run 으로 띄울 때 /ready 가 필요하면 MBTI_HEALTH_PORT 를 준다.
+#    (첫 접속 때 준비 상태 서버를 띄운다. serve 로 이미 띄웠으면 그 서버를 그대로 쓴다)
+# =========================================
+@st.cache_resource
+def _start_warmup():
+    health_port = os.environ.get("MBTI_HEALTH_PORT")
+    if health_port:
+        try:
+            start_health_server(int(health_port), app_port=int(st.get_option("server.port")))
+        except OSError as e:
+            # 같은 서버의 다른 워커가 이미 그 포트를 쓰는 경우 등 — 앱은 그대로 띄운다.
+            print(f"준비 상태 서버를 띄우지 못했습니다 (포트 {health_port}): {e}", file=sys.stderr)
+    return start_warmup_thread()
+
+
+_start_warmup()
+rerun_timer.mark("warmup")
+
+
+# =========================================
+# 1) 문항 은행 (clean_mbti 형식, 여러 개 등록 가능)
+#    컬럼 검증·정리·컴파일은 item_bank.load_item_bank 에서 한다.
+#  - MBTI_BANKS / MBTI_BANK_DIR: 등록할 문항 은행 (bank_registry 참고, 기본 default=mbti.csv)
+#  - MBTI_DEFAULT_BANK: ?bank= 가 없을 때 쓸 이름
+#  - MBTI_BANK_RELOAD_INTERVAL: 파일 변경 확인 주기(초, 기본 5)
+# =========================================
+@st.cache_resource
+def get_bank_registry() -> BankRegistry:
+    banks = BankRegistry(configured_banks(), os.environ.get("MBTI_DEFAULT_BANK", DEFAULT_BANK))
+    banks.start_watcher(float(os.environ.get("MBTI_BANK_RELOAD_INTERVAL", "5")))
+    return banks
+
+
+def current_bank() -> ItemBank:
+    # 이 세션이 시작할 때의 버전 (도중에 파일이 바뀌어도 유지)
+    return get_bank_registry().get(st.session_state.bank_version, st.session_state.bank_name)
+
+
+# =========================================
+# 진행 상태 저장소 (워커 프로세스끼리 공유)
+#  - MBTI_SESSION_STORE: sqlite:경로 (기본 sqlite:mbti_sessions.db), file:디렉터리, memory
+#  - MBTI_SESSION_TTL: 이 시간(초) 동안 진행이 없으면 지운다. (기본 7200)
+#  - 새 연결이면 주소의 ?sid= 로 이전 진행 상태를 불러온다.
+# =========================================
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    return SessionStore(
+        open_session_backend(os.environ.get("MBTI_SESSION_STORE", "sqlite:mbti_sessions.db")),
+        ttl=float(os.environ.get("MBTI_SESSION_TTL", "7200")),
+    )
+
+
+def answer_token() -> str:
+    # 지금까지의 응답을 주소용 결과 코드(?r=)로 만든다.
+    masks = get_bank_masks(current_bank())
+    flags = (FLAG_FINISHED if st.session_state.finished else 0) | (
+        FLAG_ADAPTIVE if st.session_state.adaptive else 0
+    )
+    return masks.to_token(masks.encode(st.session_state.answers), flags)
+
+
+# 주소의 결과 코드(?r=)는 서버 진행 상태가 없어졌을 때를 위한 예비용이라
+# 답할 때마다 바꾸지 않는다. 검사가 끝났을 때와 MBTI_TOKEN_URL_INTERVAL 초(기본 10)마다만 쓴다.
+TOKEN_URL_INTERVAL = float(os.environ.get("MBTI_TOKEN_URL_INTERVAL", "10"))
+
+
+def persist_session() -> None:
+    get_session_store().save(SessionRecord.from_state(st.session_state))
+    now = time.monotonic()
+    if st.session_state.finished or now - st.session_state.get("token_written_at", 0.0) >= TOKEN_URL_INTERVAL:
+        st.query_params["r"] = answer_token()
+        st.session_state.token_written_at = now
+
+
+def restore_from_token(token: str) -> None:
+    # 서버에 진행 상태가 없으면 주소의 결과 코드로 되살린다. (공유받은 결과 포함)
+    # 결과 코드를 만든 버전을 찾아 그 버전으로 이어 간다.
+    error = None
+    for bank in get_bank_registry().versions(st.session_state.bank_name):
+        masks = get_bank_masks(bank)
+        try:
+            bits, flags = masks.from_token(token)
+            break
+        except AnswerTokenError as e:
+            error = e
+    else:
+        st.warning(str(error))
+        return
+    st.session_state.bank_version = bank.content_hash
+    st.session_state.answers = masks.decode(bits)
+    st.session_state.idx = len(bits)
+    st.session_state.finished = bool(flags & FLAG_FINISHED)
+    st.session_state.adaptive = bool(flags & FLAG_ADAPTIVE)
+    # 끝난 결과는 이미 저장된 것이므로 다시 저장하지 않는다.
+    st.session_state.result_saved = st.session_state.finished
+
+
+if "session_id" not in st.session_state:
+    saved = get_session_store().load(st.query_params.get("sid"))
+    if saved is not None:
+        st.session_state.update(saved.to_state())
+    else:
+        st.session_state.session_id = uuid.uuid4().hex
+        banks = get_bank_registry()
+        st.session_state.bank_name = banks.resolve_name(st.query_params.get("bank"))
+        st.session_state.bank_version = banks.current(st.session_state.bank_name).content_hash
+        if st.query_params.get("r"):
+            restore_from_token(st.query_params["r"])
+    st.query_params["sid"] = st.session_state.session_id
+
+if "bank_name" not in st.session_state:
+    st.session_state.bank_name = None     # 이전 버전에서 저장된 세션 (기본 은행)
+    st.session_state.bank_version = None
 if "idx" not in st.session_state:
     st.session_state.idx = 0          # 현재 문항 index
 if "answers" not in st.session_state:
     st.session_state.answers = {}     # id -> code(E/I/…)
 if "finished" not in st.session_state:
     st.session_state.finished = False # 검사 완료 여부
+if "figure_requested" not in st.session_state:
+    st.session_state.figure_requested = False  # 결과 이미지 생성 요청 여부
+if "result_saved" not in st.session_state:
+    st.session_state.result_saved = False  # 결과 DB 저장 여부
+if "reruns" not in st.session_state:
+    st.session_state.reruns = 0  # 이번 검사의 rerun 수 (지표용)
+if "cohort" not in st.session_state:
+    # 교사가 나눠 준 링크의 ?cohort=학교/학년/반 (집계 단위)
+    st.session_state.cohort = st.query_params.get("cohort") or None
+if "adaptive" not in st.session_state:
+    # 적응형 모드: 축 결과가 정해지면 그 축의 남은 문항을 건너뛴다.
+    # (?adaptive=1 또는 MBTI_ADAPTIVE=1)
+    st.session_state.adaptive = (
+        st.query_params.get("adaptive", os.environ.get("MBTI_ADAPTIVE", "0")) == "1"
+    )
+if "client_form" not in st.session_state:
+    # 브라우저 문항지: 문항을 한 번에 보내고 제출할 때만 서버로 온다. (client_form 참고)
+    # (?form=client 또는 MBTI_CLIENT_FORM=1)
+    st.session_state.client_form = (
+        st.query_params.get("form") == "client" or os.environ.get("MBTI_CLIENT_FORM") == "1"
+    )
+st.session_state.reruns += 1
+rerun_timer.mark("session_restore")
+
+
+def rerun(phase: str) -> None:
+    # 진행 상태를 저장하고 단계 시간을 기록한 뒤 스크립트를 다시 실행한다.
+    persist_session()
+    rerun_timer.mark(phase)
+    rerun_timer.finish()
+    st.rerun()
+
+
+# 이 세션의 문항 은행 (DataFrame은 버전마다 하나를 모든 세션이 같이 쓴다)
+bank = current_bank()
+df: pd.DataFrame = get_bank_registry().frame(bank)
+rerun_timer.mark("load_items")
 
 
 # =========================================
-# 1) mbti.csv 로딩 (clean_mbti 형식)
-#    필요한 컬럼:
-#    id, dimension_pair, question,
-#    option_a_text, option_a_code,
-#    option_b_text, option_b_code
+# 결과 이미지 사전 렌더링 (선택)
+#  - MBTI_PREWARM_FIGURES=1 이면 프로세스당 한 번 백그라운드에서
+#    자주 나오는 점수 조합의 결과 이미지를 미리 만들어 둔다.
 # =========================================
-@st.cache_data
-def load_mbti(csv_path: str = "mbti.csv") -> pd.DataFrame:
-    try:
-        df = pd.read_csv(csv_path, encoding="utf-8-sig")
-    except UnicodeDecodeError:
-        df = pd.read_csv(csv_path, encoding="cp949")
-
-    df = df.loc[:, ~df.columns.str.contains("Unnamed")]
-
-    required = [
-        "id",
-        "dimension_pair",
-        "question",
-        "option_a_text",
-        "option_a_code",
-        "option_b_text",
-        "option_b_code",
+@st.cache_resource
+def _start_figure_prewarm(spread: int):
+    items_per_axis = [
+        int((df["dimension_pair"] == a + b).sum())
+        for a, b in AXIS_PAIRS
     ]
-    missing = [c for c in required if c not in df.columns]
-    if missing:
-        raise ValueError(
-            f"mbti.csv에 다음 컬럼이 필요합니다: {missing}\n"
-            "현재 파일이 clean_mbti 템플릿과 같은 구조인지 확인해 주세요."
-        )
+    return start_prewarm_thread(items_per_axis, recommendations_for, spread)
+
+
+if os.environ.get("MBTI_PREWARM_FIGURES") == "1":
+    _start_figure_prewarm(int(os.environ.get("MBTI_PREWARM_SPREAD", "0")))
+
 
-    df["id"] = df["id"].astype(int)
-    df["question"] = df["question"].astype(str)
-    df.loc[df["question"].isin(["nan", "", "None"]), "question"] = df["id"].apply(
-        lambda x: f"{x}번 문항"
+# =========================================
+# 지표 내보내기 (선택, 프로세스당 한 번)
+#  - MBTI_METRICS_PROM: Prometheus 텍스트 파일 경로 (.prom)
+#  - MBTI_METRICS_JSON: JSON 로그 경로 (스냅숏을 한 줄씩 덧붙임)
+#  - MBTI_METRICS_INTERVAL: 내보내기 주기(초, 기본 15)
+# =========================================
+@st.cache_resource
+def _setup_metrics():
+    registry.add_collector(
+        lambda: {
+            "figure_renders_total": figure_cache.misses,
+            "figure_cache_hits_total": figure_cache.hits,
+        }
     )
-    return df
+    prom_path = os.environ.get("MBTI_METRICS_PROM")
+    json_path = os.environ.get("MBTI_METRICS_JSON")
+    if not (prom_path or json_path):
+        return None
+    return start_exporter(prom_path, json_path, float(os.environ.get("MBTI_METRICS_INTERVAL", "15")))
 
 
-df = load_mbti()
+_setup_metrics()
 
 
 # =========================================
-# 2) 각 유형별 긴 설명 (사용자가 준 문장들)
+# 검사 결과 저장소 (SQLite, 프로세스당 하나)
+#  - 경로: MBTI_RESULTS_DB (기본 mbti_results.db)
 # =========================================
-MBTI_PROFILES: Dict[str, List[str]] = {
-    "ISTJ": [
-        "＊부끄럼을 많이 탄다.",
-        "＊성실하고 책임감이 강하고 정리정돈을 잘한다.",
-        "＊예정에 없던 일을 몹시 힘들어한다.",
-        "＊자발성이 부족한 편이다.",
-        "＊표현이 적으며 표정변화가 없다.",
-        "＊절약과 준비정신이 철저하다.",
-        "＊양처럼 순하고 순종적이다.",
-        "＊외유내강의 느낌을 준다.",
-        "＊자세가 바르며 계획을 세워 공부한다.",
-        "＊자세한 설명을 선호한다.",
-        "＊창의적인 면과 융통성이 부족한 편이다.",
-    ],
-    "ISTP": [
-        "＊말수가 적고 표정변화가 거의 없다.",
-        "＊의욕적이며 고집이 세다.",
-        "＊앞에 나서지는 않지만 소집단에서는 리더 역할을 하려고 한다.",
-        "＊여러 가지에 관심이 많다.",
-        "＊왠지 강한 구석이 있다.",
-        "＊뒷마무리가 부족하다. 끈기가 부족하다.",
-        "＊타인에 대한 배려가 적다.",
-        "＊손재주가 있다.",
-        "＊친구와 잘 다투고 잘 따진다.",
-        "＊조용하다가도 일은 성급하게 한다.",
-    ],
-    "ESTP": [
-        "＊개방적, 활동적, 적극적, 진취적이다.",
-        "＊항상 즐겁다. 재치꾼이다.",
-        "＊모든 일에 관심을 갖고 지나치게 참견한다.",
-        "＊끝마무리가 부족하고 말과 행동에 불일치가 있다.",
-        "＊복잡한 것을 싫어한다.",
-        "＊욕심이 많다. 은근히 승부근성이 강하다.",
-        "＊대중 앞에 강하다. 과행동적이고 목소리가 크다.",
-        "＊말이 많고 잘 따지며 꾸중을 해도 자신의 입장을 끝까지 말한다.",
-        "＊임기응변이 뛰어나고 호탕하다.",
-        "＊어떤 권위나 강압에 굴하지 않는다.",
-    ],
-    "ESTJ": [
-        "＊모범적이고 솔선수범한다.",
-        "＊정리정돈을 잘하고 책임감이 강하다.",
-        "＊웃어른을 공경하고 예의가 바르다.",
-        "＊합리적으로 생각하고 공정한 것을 선호한다.",
-        "＊경쟁에서는 이겨야 한다.",
-        "＊친구나 주변 사람을 배려하는 리더 타입이다.",
-        "＊질서와 사회적인 관습을 중시한다.",
-        "＊여러 친구들과 두루 잘 지낸다.",
-        "＊친절하다. 중재·타협·분배를 잘한다.",
-        "＊불평이 없다. 활발하다.",
-    ],
-    "INFJ": [
-        "＊조용하고 침착하고 책임감이 강하다.",
-        "＊내면적인 욕심이 많고 잔걱정이 많다.",
-        "＊또래에 비해 성숙한 사고력을 지닌다.",
-        "＊민감하고 복잡한 정서를 가지고 비유를 잘한다.",
-        "＊교사의 의도를 잘 알아챈다.",
-        "＊개인적인 칭찬을 해주면 크게 향상된다.",
-        "＊시끄럽고 복잡한 것, 나서기를 싫어한다.",
-        "＊학급일에 적극적으로 임하지 않는다.",
-        "＊완벽성을 추구하고 소외받는 아동에 관심이 많다.",
-        "＊좋아하는 것과 좋아하지 않는 것 차이가 심하다. 교사와의 관계가 좋으면 열심히 공부한다.",
-    ],
-    "INFP": [
-        "＊조용하고 말이 없으나 마음이 깊고 따뜻하다.",
-        "＊친구나 주변 상황에 민감하고 영향을 많이 받는다.",
-        "＊민감한 정서세계, 동정심이 많다. 사려 깊다.",
-        "＊약간 느리며 꾸준하지 못하다.",
-        "＊실천력이 부족하다. 낮잠을 좋아한다.",
-        "＊좋아하는 것과 그렇지 않은 것 사이에 차이가 많이 난다.",
-        "＊온화하고 부드럽다. 자신의 가치를 중시한다.",
-        "＊학교 생활 패턴에 따라가지 못한다.",
-        "＊상징에 대한 해석이 뛰어나다.",
-        "＊교사 입장: 기다림이 필요한 아이다.",
-    ],
-    "ENFP": [
-        "＊순진하고 순수하다.",
-        "＊변덕쟁이, 기발하다.",
-        "＊분위기만 맞으면 과잉행동을 한다.",
-        "＊좋아하는 것과 그렇지 않은 것 사이에 집중력의 차이가 난다.",
-        "＊딴 생각을 잘한다.",
-        "＊칭찬에 민감하다.",
-        "＊용돈이 헤프다.",
-        "＊사람을 좋아한다.",
-        "＊반복 훈련·연습을 싫어한다.",
-        "＊정리정돈이 안 된다.",
-    ],
-    "ENFJ": [
-        "＊온순하고 착하다.",
-        "＊책임감이 강하고 신뢰감을 준다.",
-        "＊주변 상황에 영향을 많이 받는다.",
-        "＊정리정돈을 잘한다.",
-        "＊딴 세계에 빠져 있을 때가 종종 있다.",
-        "＊예능적인 분야를 좋아한다.",
-        "＊특정 분야는 지나칠 정도로 진지하다.",
-        "＊참을성이 많다.",
-        "＊친구들과 잘 어울린다.",
-        "＊뜻밖의 행동으로 주변을 놀라게 한다.",
-        "＊터질 것 같은 화산을 마음에 품고 사는 아이.",
-    ],
-    "ISFJ": [
-        "＊온순하다. 성실하고 책임감이 강하다.",
-        "＊말을 참고 삭이는 경우가 많다.",
-        "＊봉사적이며 착하다.",
-        "＊소수와 깊게 사귀고 친한 친구와 논다.",
-        "＊인내심이 있으며 꾸준하다.",
-        "＊준비물을 잘 챙긴다. 깔끔 단정하다.",
-        "＊규칙을 준수하며 계획적이다.",
-        "＊행동력이 부족하다.",
-        "＊신뢰감이 간다.",
-        "＊변화를 싫어한다.",
-        "＊다른 사람에게 도움이 되고자 하는 욕구가 크다.",
-    ],
-    "ISFP": [
-        "＊마음이 너그럽고 순하다.",
-        "＊낙천적이고 천하태평, 행동이 느리다.",
-        "＊놀 줄 알며 무대 체질이고 예술적 매체를 통해 자신을 드러내는 것을 좋아한다.",
-        "＊성급한 결론을 잘 내린다.",
-        "＊끈기가 부족하다.",
-        "＊부끄럼을 많이 타고 외모에 관심이 많다.",
-        "＊동식물 사육이나 재배를 좋아한다.",
-        "＊권위적인 분위기에서는 눈치를 살핀다.",
-        "＊잔잔하게 산만한 편이다.",
-        "＊주변의 요구를 뿌리치지 못한다.",
-    ],
-    "ESFP": [
-        "＊활발하다. 천방지축이고 과잉행동을 하며 먹는 것을 좋아하고 감정적이다.",
-        "＊표정이 밝다. 목소리가 크고 말이 많다.",
-        "＊언제나 놀고 싶다. 단순하고 솔직하다.",
-        "＊장난이 심하고 붙임성이 있다.",
-        "＊지적을 많이 받아 자신을 착하다고 생각하지 않는다.",
-        "＊뭐든지 급하게 해치운다.",
-        "＊적응력이 뛰어나다. (학원을 빼먹진 않음).",
-        "＊진지함이 부족하다. 실전에 불안해한다.",
-        "＊group study가 효과적이며 선의의 경쟁을 좋아한다.",
-        "＊인정받고 싶은 욕구가 강하다.",
-    ],
-    "ESFJ": [
-        "＊명랑쾌활하고 감정이 풍부하다. 활력소 같은 아이.",
-        "＊타인의 무관심에 쉽게 좌절한다.",
-        "＊남 앞에 나서기를 좋아한다.",
-        "＊교실을 꾸미는 일을 잘한다.",
-        "＊미리 걱정하는 경향이 있다.",
-        "＊왕성한 발표력, 언어 계열을 선호한다.",
-        "＊표현력과 리더십이 뛰어나다.",
-        "＊일기를 잘 쓰고 운동을 좋아한다.",
-        "＊이야기 중심의 소설류를 많이 읽는다.",
-        "＊분명한 과제와 자세한 설명을 좋아한다.",
-        "＊말이 많다.",
-    ],
-    "INTJ": [
-        "＊“애늙은이” 같고 소수와 깊게 사귄다.",
-        "＊외모에 무관심하며 독립적·독창적이고 효율성을 강조한다.",
-        "＊고집이 아주 세고 대단히 강하다.",
-        "＊충분한 시간을 주는 것이 필요한 타입이다.",
-        "＊이유가 타당하지 않으면 끝까지 승복하지 않는다. 모든 일에 이유가 많다.",
-        "＊이론적으로, 논리적으로 따진다.",
-        "＊감정 표현은 없으나 상처를 쉽게 받는다.",
-        "＊칭찬이나 벌에 무관심하지만 실제로는 많은 칭찬이 필요하다.",
-        "＊승부욕이 강하고 이길 때까지 한다.",
-        "＊사소한 옷, 먹는 이야기만 하면 속상해한다.",
-    ],
-    "INTP": [
-        "＊만물박사 타입으로 논리적이고 호기심이 많다.",
-        "＊주관이 강하고 고집이 세며 솔직하다.",
-        "＊자기중심적이고 간섭이나 잔소리를 싫어한다.",
-        "＊주변 상황에 별로 영향을 받지 않는다.",
-        "＊정리정돈을 잘 하지 못하고 감정이 단순하다.",
-        "＊잘못된 일은 꼭 지적한다. 학급에서 외톨이가 되기도 한다.",
-        "＊과학 영역에 관심이 많고 운동을 싫어한다.",
-        "＊잘난 척하는 경향이 있다.",
-        "＊못하는 친구를 무시하는 경향이 있다.",
-        "＊관심이 없는 영역은 하지 않는다.",
-        "＊앎을 나누지 못하는 고독을 느끼며, 교사의 믿음이 중요하다.",
-    ],
-    "ENTP": [
-        "＊활발하며 독창적이다.",
-        "＊상상력과 표현력이 뛰어나다.",
-        "＊친구들과 잘 어울린다.",
-        "＊게으르고 정리정돈이 안 된다.",
-        "＊개인주의적 경향이 있고 고집이 강하다.",
-        "＊다방면에 관심을 가지고 있는 분야가 많다.",
-        "＊반복 설명을 싫어하고 자기 논리에 빠지기 쉽다.",
-        "＊쉽게 포기하는 편이고 마무리가 약하다.",
-        "＊친구를 리드하려고 한다.",
-        "＊교사의 권위를 잘 인정하지 못한다.",
-        "＊교사가 자기를 인정해 주는 것을 좋아한다.",
-    ],
-    "ENTJ": [
-        "＊원리원칙주의자로 자기 주관이 강하다.",
-        "＊활발하다.",
-        "＊논리적인 언어 표현을 잘한다.",
-        "＊고집이 강하다.",
-        "＊간섭을 싫어한다.",
-        "＊잘못된 것, 부당한 것은 꼭 바로잡고 넘어간다.",
-        "＊철저한 준비 자세를 갖추고 있다.",
-        "＊통솔력이 있다.",
-        "＊계획하고 마음먹은 것은 해낸다.",
-        "＊교사가 인정해주는 것이 필요하다.",
-    ],
-}
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    return ResultStore(os.environ.get("MBTI_RESULTS_DB", "mbti_results.db"))
 
 
 # =========================================
-# 3) 간단 진로 추천 (없으면 '준비중' 표시)
+# 유형 분포 집계 (프로세스당 하나, 결과 DB 기준)
+#  - 대시보드를 새로고침할 때마다 결과 DB 에서 마지막으로 읽은 id 이후의 결과만 더한다.
+#    워커 프로세스가 여럿이어도 모두 같은 DB 를 따라가므로 같은 분포를 보여 준다.
+#    (write-behind 라 방금 끝난 결과는 0.5초쯤 늦게 보인다)
 # =========================================
-MBTI_RECOMMENDATIONS: Dict[str, Dict[str, List[str]]] = {
-    "INTJ": {
-        "majors": ["컴퓨터·소프트웨어공학", "데이터사이언스", "경영학", "정책학"],
-        "careers": ["전략기획자", "데이터 분석가", "경영 컨설턴트", "프로덕트 매니저"],
-    },
-    "INFP": {
-        "majors": ["심리학", "사회복지학", "국어국문·영문학", "콘텐츠·문화예술 관련 전공"],
-        "careers": ["상담·복지 분야", "작가·에디터", "콘텐츠 기획자", "교육 관련 직무"],
-    },
-}
+@st.cache_resource
+def get_aggregator() -> DistributionAggregator:
+    max_score = max(int((df["dimension_pair"] == a + b).sum()) for a, b in AXIS_PAIRS)
+    return DistributionAggregator(max_score=max_score)
+
+
+def refresh_aggregator() -> DistributionAggregator:
+    aggregator = get_aggregator()
+    aggregator.catch_up(get_result_store().iter_summaries_after)
+    return aggregator
 
 
 # =========================================
-# 4) MBTI 계산 & PNG 그림 생성
+# 축별 백분위 규준 (결과 DB의 norm_sketches 표, 워커끼리 공유)
+#  - 처음 한 번만 저장된 결과로 채우고, 이후에는 결과가 확정될 때마다 더한다.
+#    채우기와 첫 sync 는 시작 준비 때 백그라운드 스레드에서 한다. (첫 결과 화면을 막지 않음)
+#  - MBTI_NORMS_SYNC_INTERVAL: 다른 워커 몫을 합쳐 다시 읽는 주기(초, 기본 30)
+#  - MBTI_NORMS_MIN_COUNT: 이보다 결과가 적은 집단은 상위 집단과 비교한다. (기본 30)
 # =========================================
-def compute_mbti(df_items: pd.DataFrame, answers: Dict[int, str]) -> Tuple[str, Dict[str, int]]:
-    scores = {k: 0 for k in ["E", "I", "S", "N", "T", "F", "J", "P"]}
-
-    for _, row in df_items.iterrows():
-        qid = row["id"]
-        code = answers.get(qid)
-        if code in scores:
-            scores[code] += 1
-
-    e_or_i = "E" if scores["E"] >= scores["I"] else "I"
-    s_or_n = "S" if scores["S"] >= scores["N"] else "N"
-    t_or_f = "T" if scores["T"] >= scores["F"] else "F"
-    j_or_p = "J" if scores["J"] >= scores["P"] else "P"
-
-    mbti_type = e_or_i + s_or_n + t_or_f + j_or_p
-    return mbti_type, scores
-
-
-def create_result_figure(
-    mbti_type: str,
-    scores: Dict[str, int],
-    recommendations: Dict[str, List[str]],
-) -> bytes:
-    plt.rcParams["font.family"] = plt.rcParams.get("font.family", "sans-serif")
-
-    fig, ax = plt.subplots(figsize=(7, 10))
-    fig.suptitle("고등학생 진로 MBTI 결과 요약", fontsize=16, fontweight="bold")
-
-    fig.text(
-        0.5,
-        0.92,
-        f"MBTI 유형: {mbti_type}",
-        ha="center",
-        va="center",
-        fontsize=18,
-        fontweight="bold",
+@st.cache_resource
+def get_norms() -> NormStore:
+    norms = NormStore(
+        os.environ.get("MBTI_RESULTS_DB", "mbti_results.db"),
+        backfill=get_result_store().iter_summaries,
     )
+    norms.start_sync_thread(float(os.environ.get("MBTI_NORMS_SYNC_INTERVAL", "30")))
+    return norms
 
-    y_labels = ["E / I", "S / N", "T / F", "J / P"]
-    front_scores = [scores["E"], scores["S"], scores["T"], scores["J"]]
-    back_scores = [scores["I"], scores["N"], scores["F"], scores["P"]]
-
-    ax.barh(
-        [y + 0.15 for y in range(len(y_labels))],
-        front_scores,
-        height=0.3,
-        label="앞 글자(E/S/T/J)",
-    )
-    ax.barh(
-        [y - 0.15 for y in range(len(y_labels))],
-        back_scores,
-        height=0.3,
-        label="뒷 글자(I/N/F/P)",
-    )
 
-    ax.set_yticks(range(len(y_labels)))
-    ax.set_yticklabels(y_labels, fontsize=11)
-    ax.invert_yaxis()
-    ax.set_xlabel("점수(문항 수)", fontsize=11)
-    ax.legend(loc="lower right", fontsize=9)
-    ax.grid(axis="x", linestyle="--", alpha=0.4)
+get_norms()
 
-    major_list = recommendations.get("majors", [])
-    career_list = recommendations.get("careers", [])
 
-    majors_text = "추천 전공 예시\n- " + "\n- ".join(major_list) if major_list else "추천 전공 데이터 없음"
-    careers_text = "추천 직업군 예시\n- " + "\n- ".join(career_list) if career_list else "추천 직업군 데이터 없음"
+def _check_admin_password() -> bool:
+    # 비밀번호가 설정되지 않은 배포에서는 교사용 화면을 아예 열지 않는다.
+    password = os.environ.get("MBTI_ADMIN_PASSWORD")
+    if not password:
+        st.error("교사용 화면을 쓰려면 서버에 MBTI_ADMIN_PASSWORD 환경 변수를 설정해 주세요.")
+        return False
+    if st.text_input("관리자 비밀번호", type="password") != password:
+        st.info("관리자 비밀번호를 입력해 주세요.")
+        return False
+    return True
 
-    text = majors_text + "\n\n" + careers_text
 
-    fig.text(
-        0.02,
-        0.02,
-        "※ 본 결과는 참고용이며, 공식 심리검사를 대체하지 않습니다.",
-        fontsize=8,
-        color="gray",
+# =========================================
+# 교사용 실시간 분포 대시보드 (?mode=dashboard)
+#  - 미리 더해 둔 집계만 읽으므로 새로고침 비용이 결과 수와 무관하다.
+#  - MBTI_DASHBOARD_REFRESH: 자동 새로고침 주기(초, 기본 5)
+# =========================================
+WINDOW_LABELS = {None: "전체 기간"}
+WINDOW_LABELS.update(
+    {w: f"최근 {w // 3600}시간" if w >= 3600 else f"최근 {w // 60}분" for w in DEFAULT_WINDOWS}
+)
+
+
+def render_dashboard_page() -> None:
+    st.title("유형 분포 대시보드 (교사용)")
+    if not _check_admin_password():
+        return
+
+    aggregator = refresh_aggregator()
+    cohorts = aggregator.cohorts() or [ALL_COHORTS]
+    default = st.query_params.get("cohort")
+    cohort = st.selectbox(
+        "집계 단위 (학교/학년/반)",
+        cohorts,
+        index=cohorts.index(default) if default in cohorts else 0,
+        format_func=lambda c: "전체" if c == ALL_COHORTS else c,
     )
-    fig.text(
-        0.52,
-        0.25,
-        text,
-        fontsize=10,
-        va="top",
-        bbox=dict(boxstyle="round", facecolor="#f5f5f5", alpha=0.9),
+    window = st.radio(
+        "기간", list(WINDOW_LABELS), format_func=WINDOW_LABELS.get, horizontal=True
     )
 
-    buf = io.BytesIO()
-    fig.tight_layout(rect=[0, 0.05, 1, 0.9])
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
+    @st.fragment(run_every=float(os.environ.get("MBTI_DASHBOARD_REFRESH", "5")))
+    def live_view() -> None:
+        agg = refresh_aggregator().snapshot(cohort, window)
+        st.metric("완료한 학생 수", agg.count)
+        if agg.count == 0:
+            st.info("아직 이 조건에 해당하는 결과가 없습니다.")
+            return
+
+        st.markdown("#### 유형별 인원")
+        st.bar_chart(pd.Series(agg.type_counts(), name="인원"))
+
+        st.markdown("#### 축별 평균 점수와 분포")
+        means = agg.mean_scores()
+        columns = st.columns(len(AXIS_PAIRS))
+        for col, (axis, hist) in zip(columns, agg.axis_histograms().items()):
+            a, b = axis
+            col.markdown(f"**{a} {means[a]:.1f} / {b} {means[b]:.1f}**")
+            col.bar_chart(pd.Series(hist, name="인원").rename_axis(f"{a} 점수"))
+
+    live_view()
 
 
 # =========================================
-# 5) 축별 자연어 설명
+# 교사/관리자 모드 (?mode=admin)
+#  - MBTI_ADMIN_PASSWORD 로 비밀번호를 묻는다. (설정하지 않으면 열리지 않는다)
+#  - 답안지 일괄 채점: 결과는 임시 파일로 스트리밍해서 쓰고, 다 끝나면 내려받는다.
+#  - 결과 이미지 일괄 생성: 채점 결과 CSV로 학생별 이미지(MBTI_RESULT_RENDERER 형식)를 만들어 ZIP으로 내려받는다.
+#    MBTI_EXPORT_WORKERS: 워커 프로세스 수 (기본 CPU 수)
+#  - 문항 분석: 저장된 결과(이 문항 은행 버전)로 문항별 선택 비율·변별도, 축별 α 를 보고
+#    HTML/CSV 보고서를 내려받는다.
 # =========================================
-def build_dimension_explanation(scores: Dict[str, int]) -> List[str]:
-    lines: List[str] = []
-
-    def one_pair(a_key, b_key, a_name, b_name, label):
-        a = scores[a_key]
-        b = scores[b_key]
-        diff = a - b
-        if diff > 0:
-            lines.append(
-                f"- **{label}** : {a_name}({a}) 점수가 {b_name}({b})보다 {abs(diff)}점 높아 "
-                f"{a_name} 쪽 경향이 조금 더 강하게 나타납니다."
-            )
-        elif diff < 0:
-            lines.append(
-                f"- **{label}** : {b_name}({b}) 점수가 {a_name}({a})보다 {abs(diff)}점 높아 "
-                f"{b_name} 쪽 경향이 조금 더 강하게 나타납니다."
-            )
-        else:
-            lines.append(
-                f"- **{label}** : 두 성향의 점수가 같아, 상황에 따라 {a_name}·{b_name} 성향이 모두 나타날 수 있습니다."
-            )
+def render_admin_page() -> None:
+    st.title("교사용 도구")
+    if not _check_admin_password():
+        return
+
+    with st.expander("문항 은행 상태"):
+        st.caption(f"이 페이지는 `{get_bank_registry().resolve_name(st.session_state.bank_name)}` 문항 은행으로 채점합니다. (?bank= 로 변경)")
+        st.json(get_bank_registry().status())
+    with st.expander("진로 추천 표 상태"):
+        st.json(recommendation_source.status())
+    with st.expander("시작 준비 상태"):
+        st.json(warmup_state.to_dict())
+    with st.expander("결과 저장 상태"):
+        status = get_result_store().status()
+        if status["dropped"]:
+            st.error(f"저장하지 못한 검사 결과가 {status['dropped']:,}건 있습니다. 서버 로그를 확인해 주세요.")
+        elif status["retrying"]:
+            st.warning(f"DB 잠금으로 {status['retrying']:,}건을 다시 저장하는 중입니다.")
+        st.json(status)
+
+    scoring_tab, export_tab, analysis_tab = st.tabs(["답안지 일괄 채점", "결과 이미지 일괄 생성", "문항 분석"])
+    with scoring_tab:
+        _bulk_scoring_tab()
+    with export_tab:
+        _report_export_tab()
+    with analysis_tab:
+        _item_analysis_tab()
+
+
+def _bulk_scoring_tab() -> None:
+    st.markdown(
+        "- 문항 열 헤더: 문항 번호(`1`) 또는 `q1` 형태\n"
+        "- 응답 값: `A`/`B`, `1`/`2`, 선택지 코드(`E`/`I`…), 선택지 문장\n"
+        "- 그 밖의 열(학번, 이름 등)은 결과 파일에 그대로 들어갑니다."
+    )
+    uploaded = st.file_uploader("답안 CSV 파일", type=["csv"])
+    fmt = st.radio("결과 형식", ["csv", "parquet"], horizontal=True)
+    if uploaded is None or not st.button("채점 시작"):
+        return
+
+    bar = st.progress(0.0, text="채점 준비 중…")
+
+    def on_progress(state: BulkProgress) -> None:
+        bar.progress(
+            state.fraction or 0.0,
+            text=f"{state.rows:,}행 처리 (채점 {state.scored:,} / 오류 {state.invalid:,})",
+        )
+
+    out_path = os.path.join(tempfile.mkdtemp(prefix="mbti_bulk_"), f"mbti_results.{fmt}")
+    try:
+        state = score_answer_stream(
+            uploaded,
+            AnswerSheetScorer.from_bank(bank),
+            out_path,
+            output_format=fmt,
+            total_bytes=uploaded.size,
+            progress=on_progress,
+        )
+    except (AnswerSheetError, RuntimeError) as e:
+        st.error(str(e))
+        return
+
+    bar.progress(1.0, text="채점 완료")
+    st.success(f"총 {state.rows:,}행 중 {state.scored:,}행을 채점했습니다. (오류 {state.invalid:,}행)")
+    with open(out_path, "rb") as f:
+        st.download_button(
+            label="채점 결과 다운로드",
+            data=f,
+            file_name=os.path.basename(out_path),
+            mime="text/csv" if fmt == "csv" else "application/octet-stream",
+        )
+
+
+def _report_export_tab() -> None:
+    st.markdown(
+        "- 입력: 답안지 일괄 채점 결과 CSV (`mbti_type`, `E`…`P` 열)\n"
+        "- 파일 이름: 채점 결과가 아닌 열(학번, 이름 등)을 이어 붙여 만듭니다.\n"
+        "- 오류가 있는 행은 건너뜁니다. ZIP 안의 `summary.csv` 에 목록이 있습니다."
+    )
+    uploaded = st.file_uploader("채점 결과 CSV 파일", type=["csv"], key="export_upload")
+    max_workers = max(1, os.cpu_count() or 1)
+    workers = st.number_input(
+        "동시에 그릴 프로세스 수",
+        min_value=1,
+        max_value=max_workers,
+        value=min(max_workers, int(os.environ.get("MBTI_EXPORT_WORKERS", max_workers))),
+    )
+    if uploaded is None:
+        return
+    try:
+        uploaded.seek(0)
+        jobs = read_report_jobs(uploaded)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    st.caption(f"{len(jobs):,}명의 결과 이미지를 만듭니다.")
+    if not st.button("이미지 만들기"):
+        return
+
+    # 중지 버튼은 이 세션의 cancel 이벤트를 켠다. export_reports 는 새 작업을 넣지 않고
+    # 그리는 중인 것만 마무리한 뒤 돌아온다. (그때까지 만든 이미지는 ZIP에 남는다)
+    cancel = st.session_state.export_cancel = threading.Event()
+    st.button("중지", key="export_cancel_button", on_click=cancel.set)
+    bar = st.progress(0.0, text="워커 준비 중…")
+
+    def on_progress(state: ExportProgress) -> None:
+        bar.progress(state.fraction, text=f"{state.done:,} / {state.total:,}장 ({state.elapsed:.0f}초)")
+
+    out_path = os.path.join(tempfile.mkdtemp(prefix="mbti_reports_"), "mbti_reports.zip")
+    state = export_reports(
+        jobs,
+        out_path,
+        workers=int(workers),
+        renderer=configured_renderer(),
+        progress=on_progress,
+        cancel=cancel,
+    )
+    if state.cancelled:
+        bar.progress(state.fraction, text=f"중지됨 — {state.done:,} / {state.total:,}장 ({state.elapsed:.0f}초)")
+    else:
+        bar.progress(1.0, text=f"완료 ({state.elapsed:.0f}초)")
+    if state.failed:
+        st.warning(f"{state.failed:,}명의 이미지를 만들지 못했습니다. ZIP 안 `summary.csv` 의 error 열을 확인하세요.")
+    with open(out_path, "rb") as f:
+        st.download_button(
+            label="결과 이미지 ZIP 다운로드",
+            data=f,
+            file_name="mbti_reports.zip",
+            mime="application/zip",
+        )
 
-    one_pair("E", "I", "외향(E)", "내향(I)", "에너지 방향 (E / I)")
-    one_pair("S", "N", "감각(S)", "직관(N)", "정보 수용 방식 (S / N)")
-    one_pair("T", "F", "사고(T)", "감정(F)", "판단 기준 (T / F)")
-    one_pair("J", "P", "판단(J)", "인식(P)", "생활 방식 (J / P)")
 
-    return lines
+def _item_analysis_tab() -> None:
+    st.markdown(
+        f"- 저장된 결과 중 `{bank.version}` 버전 문항 은행으로 본 응답만 씁니다.\n"
+        "- 문항-나머지 r: 같은 축의 다른 문항 합과의 상관 (낮으면 변별이 약한 문항)\n"
+        "- α 는 그 축 문항에 모두 답한 응답으로 계산합니다. (적응형으로 건너뛴 응답 제외)"
+    )
+    if not st.button("분석 실행"):
+        return
+
+    store = get_result_store()
+    store.flush()
+    with st.spinner("응답을 읽는 중…"):
+        analysis = analyze(bank, iter_store_chunks(store, bank))
+    if analysis.n_responses == 0:
+        st.info("이 문항 은행 버전으로 저장된 결과가 없습니다.")
+        return
+
+    st.caption(f"응답 {analysis.n_responses:,}건")
+    st.dataframe(
+        pd.DataFrame(
+            [{"축": a.axis, "문항 수": a.n_items, "모두 답한 응답": a.n_complete, "α": a.alpha} for a in analysis.axes]
+        ),
+        hide_index=True,
+    )
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "id": i.id,
+                    "축": i.axis or i.dimension_pair,
+                    "A 선택 비율": i.a_rate,
+                    "B 선택 비율": i.b_rate,
+                    "응답 수": i.n_answered,
+                    "문항-나머지 r": i.item_rest_r,
+                    "뺐을 때 α": i.alpha_if_deleted,
+                    "점검": ", ".join(i.flags),
+                }
+                for i in analysis.items
+            ]
+        ),
+        hide_index=True,
+    )
+    csv_buffer = io.StringIO()
+    write_item_csv(analysis, csv_buffer)
+
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        label="HTML 보고서 다운로드",
+        data=render_html_report(analysis, bank),
+        file_name="item_report.html",
+        mime="text/html",
+    )
+    col2.download_button(
+        label="문항별 CSV 다운로드",
+        data=csv_buffer.getvalue().encode("utf-8-sig"),
+        file_name="item_report.csv",
+        mime="text/csv",
+    )
 
 
 # =========================================
-# 6) 메인 화면
+# 2) 메인 화면
 # =========================================
+if st.query_params.get("mode") == "admin":
+    render_admin_page()
+    rerun_timer.mark("admin")
+    rerun_timer.finish()
+    st.stop()
+if st.query_params.get("mode") == "dashboard":
+    render_dashboard_page()
+    rerun_timer.mark("dashboard")
+    rerun_timer.finish()
+    st.stop()
+
 st.title("고등학생 진로 MBTI 검사")
+if len(get_bank_registry().names) > 1:
+    st.caption(f"문항 세트: {get_bank_registry().resolve_name(st.session_state.bank_name)} (버전 {bank.version})")
+
+# 검사 단계 (브라우저 문항지)
+if not st.session_state.finished and st.session_state.client_form:
+    try:
+        submitted = client_questionnaire(
+            bank, st.session_state.answers, st.session_state.session_id, st.session_state.adaptive
+        )
+    except ValueError as e:
+        submitted = None
+        st.warning(f"제출한 응답을 읽지 못했습니다. 다시 제출해 주세요. ({e})")
+    if submitted is not None:
+        st.session_state.answers = submitted
+        if is_complete(bank, submitted, st.session_state.adaptive):
+            st.session_state.idx = len(submitted)
+            st.session_state.finished = True
+        else:
+            # 빠진 문항이 있으면 서버 화면에서 첫 빈 문항부터 이어서 답한다.
+            st.session_state.idx = next(
+                (pos for pos, qid in enumerate(bank.ids) if qid not in submitted), len(bank)
+            )
+            st.session_state.client_form = False
+        rerun("question")
+    rerun_timer.mark("question")
 
 # 검사 단계
-if not st.session_state.finished:
+elif not st.session_state.finished:
     idx = st.session_state.idx
     total = len(df)
 
-    if idx < total:
-        row = df.iloc[idx]
+    if st.session_state.adaptive:
+        plan = get_adaptive_plan(bank)
+        pos = plan.next_position(st.session_state.answers)
+        answered = len(st.session_state.answers)
+        total = answered + plan.remaining(st.session_state.answers)
+        idx = answered
+    else:
+        # 이미 답한 문항(브라우저 문항지에서 일부 제출한 경우 등)은 건너뛴다.
+        answers = st.session_state.answers
+        pos = next((p for p in range(idx, total) if bank.ids[p] not in answers), None)
+        if pos is not None:
+            idx = pos
+
+    if pos is not None:
+        row = df.iloc[pos]
 
         st.progress((idx + 1) / total)
         st.subheader(f"{row['id']}번 문항")
@@ -442,60 +634,87 @@ if not st.session_state.finished:
             else:
                 st.session_state.answers[row["id"]] = row["option_b_code"]
 
-            st.session_state.idx += 1
-            st.rerun()
+            st.session_state.idx = pos + 1
+            rerun("question")
     else:
         st.success("✔ 모든 문항을 완료했습니다.")
         if st.button("결과 보기"):
             st.session_state.finished = True
-            st.rerun()
+            rerun("question")
+    rerun_timer.mark("question")
 
 # 결과 단계
 else:
-    mbti_type, scores = compute_mbti(df, st.session_state.answers)
+    # 비트 응답으로 바꿔 popcount 로 채점한다.
+    masks = get_bank_masks(bank)
+    bits = masks.encode(st.session_state.answers)
+    mbti_type, scores = masks.score(bits)
+    rerun_timer.mark("compute_mbti")
+
+    # 완료된 검사는 한 번만 저장한다. (큐에 넣기만 하므로 화면을 막지 않음)
+    if not st.session_state.result_saved:
+        skipped = (
+            get_adaptive_plan(bank).skipped(st.session_state.answers)
+            if st.session_state.adaptive
+            else []
+        )
+        get_result_store().submit(
+            ResultRecord(
+                mbti_type=mbti_type,
+                scores=scores,
+                # 문항이 63개 이하면 비트 두 개만 저장한다.
+                answers={} if masks.fits_int64 else {int(k): v for k, v in st.session_state.answers.items()},
+                answered_mask=bits.answered if masks.fits_int64 else None,
+                choice_mask=bits.choices if masks.fits_int64 else None,
+                bank_version=bank.version,
+                session_id=st.session_state.session_id,
+                cohort=st.session_state.cohort,
+                skipped=skipped,
+            )
+        )
+        # 저장 큐에 들어간 결과만 규준에 더한다.
+        get_norms().record(scores, st.session_state.cohort)
+        st.session_state.result_saved = True
+        persist_session()
+        registry.inc("tests_completed_total")
+        registry.observe("reruns_per_test", st.session_state.reruns)
+        rerun_timer.mark("save_result")
+
     st.header("📊 검사 결과")
     st.success(f"현재 성향에 기반한 MBTI 유형은 **{mbti_type}** 입니다.")
+    if st.session_state.adaptive:
+        n_skipped = len(df) - len(st.session_state.answers)
+        if n_skipped:
+            st.caption(
+                f"적응형 검사: 결과가 이미 정해진 축의 {n_skipped}개 문항은 건너뛰었습니다. "
+                "아래 점수는 답한 문항 기준입니다."
+            )
+
+    st.caption(
+        "결과 코드 — 이 앱 주소 끝에 아래 내용을 붙이면 다른 기기에서도 같은 결과를 볼 수 있습니다."
+    )
+    st.code(f"?r={answer_token()}", language=None)
 
-    # 축별 설명
-    st.markdown("#### 검사 결과 해석")
-    for line in build_dimension_explanation(scores):
-        st.markdown(line)
+    # 축별 설명 (점수에 따라 달라지는 부분만 세션마다 만든다)
+    st.markdown(render_dimension_markdown(scores))
 
-    # 긴 설명 (위에서 정의한 리스트)
+    # 긴 설명·진로 추천은 유형별로 미리 만든 블록을 그대로 보낸다.
+    fragments = get_result_fragments(mbti_type, scores)
     st.markdown("---")
-    st.markdown("#### 성격·행동 특징 (검사지 기반 상세 설명)")
-    bullets = MBTI_PROFILES.get(mbti_type, [])
-    if bullets:
-        for b in bullets:
-            st.markdown(f"- {b}")
+    if fragments.profile:
+        st.markdown(fragments.profile)
     else:
+        st.markdown(PROFILE_HEADING)
         st.info("이 유형에 대한 상세 설명 문장은 아직 등록되지 않았습니다.")
 
     # 진로 추천
     st.markdown("---")
-    rec = MBTI_RECOMMENDATIONS.get(mbti_type, {})
-    major_list = rec.get("majors", [])
-    career_list = rec.get("careers", [])
-
     col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("#### 추천 전공 예시")
-        if major_list:
-            for m in major_list:
-                st.markdown(f"- {m}")
-        else:
-            st.write("전공 추천 정보가 준비 중입니다.")
-    with col2:
-        st.markdown("#### 추천 직업군 예시")
-        if career_list:
-            for c in career_list:
-                st.markdown(f"- {c}")
-        else:
-            st.write("직업군 추천 정보가 준비 중입니다.")
+    col1.markdown(fragments.majors)
+    col2.markdown(fragments.careers)
 
     # 점수 요약
-    st.markdown("---")
-    st.markdown("### 세부 점수(축별 경향)")
+    st.markdown("---\n### 세부 점수(축별 경향)")
     c1, c2, c3, c4 = st.columns(4)
     with c1:
         st.metric("E (외향)", scores["E"])
@@ -510,17 +729,37 @@ else:
         st.metric("J (판단)", scores["J"])
         st.metric("P (인식)", scores["P"])
 
-    # PNG 다운로드
-    st.markdown("---")
-    st.markdown("### 📁 결과 요약 이미지(PNG) 다운로드")
-    rec_for_fig = MBTI_RECOMMENDATIONS.get(mbti_type, {})
-    png_bytes = create_result_figure(mbti_type, scores, rec_for_fig)
-    st.download_button(
-        label="결과 이미지 다운로드",
-        data=png_bytes,
-        file_name=f"mbti_result_{mbti_type}.png",
-        mime="image/png",
+    # 같은 집단(반 → 학년 → 학교 → 전체 순으로, 결과가 충분한 집단) 대비 백분위
+    norm = get_norms().percentiles(
+        scores, st.session_state.cohort, int(os.environ.get("MBTI_NORMS_MIN_COUNT", "30"))
     )
+    if norm is not None:
+        group = "전체 학생" if norm.cohort == ALL_COHORTS else norm.cohort
+        parts = [f"**{letter}** {pct:.0f}" for letter, pct in norm.for_letters(mbti_type).items() if pct is not None]
+        st.caption(
+            f"백분위 ({group} {norm.count:,}명 기준): " + " · ".join(parts)
+            + " — 100에 가까울수록 같은 집단 안에서 그 성향이 뚜렷한 편입니다."
+        )
+
+    rerun_timer.mark("render_results")
+
+    # 결과 이미지 다운로드
+    st.markdown("---\n### 📁 결과 요약 이미지 다운로드")
+    # 이미지는 요청했을 때만 만든다. (같은 결과는 캐시에서 재사용)
+    if not st.session_state.figure_requested:
+        if st.button("결과 이미지 만들기"):
+            st.session_state.figure_requested = True
+            rerun("figure")
+    else:
+        rec_for_fig = recommendations_for(mbti_type, scores)
+        image = get_result_image(mbti_type, scores, rec_for_fig)
+        st.download_button(
+            label="결과 이미지 다운로드",
+            data=image.data,
+            file_name=f"mbti_result_{mbti_type}.{image.extension}",
+            mime=image.mime,
+        )
+    rerun_timer.mark("figure")
 
     # 다시 검사하기
     st.markdown("---")
@@ -528,4 +767,11 @@ else:
         st.session_state.idx = 0
         st.session_state.answers = {}
         st.session_state.finished = False
-        st.rerun()
+        st.session_state.figure_requested = False
+        st.session_state.result_saved = False
+        st.session_state.reruns = 0
+        st.session_state.pop(FORM_KEY, None)  # 브라우저 문항지의 지난 제출 값
+        rerun("restart")
+    rerun_timer.mark("restart")
+
+rerun_timer.finish()
@@ -0,0 +1,174 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from item_bank import ItemBank, load_item_bank, load_item_bank_version
+
+
+# =========================================
+# 문항 은행 목록 (버전별, 실행 중 다시 읽기)
+#  - 이름 -> CSV 경로로 여러 문항 은행을 등록한다. (예: default, screener, grade1)
+#      MBTI_BANKS="default=mbti.csv,screener=banks/screener.csv"
+#      MBTI_BANK_DIR=banks  -> banks/*.csv 를 파일 이름(확장자 제외)으로 등록
+#  - 감시 스레드가 파일이 바뀐 것을 보면 새로 컴파일한 뒤 "현재 버전"만 바꿔 끼운다.
+#    이미 시작한 세션은 시작할 때의 버전(content_hash)을 계속 쓴다.
+#  - 한 번 읽은 버전은 프로세스가 떠 있는 동안 보관하고 모든 세션이 같이 쓴다.
+#    (문항 은행 하나에 수십 KB 이하)
+# =========================================
+DEFAULT_BANK = "default"
+
+
+@dataclass
+class BankSource:
+    name: str
+    path: str
+    stat: Optional[Tuple[int, int]] = None  # (mtime_ns, size) — 바뀌었는지만 본다.
+    last_error: Optional[str] = None
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def parse_bank_spec(spec: str) -> Dict[str, str]:
+    # "이름=경로,이름=경로" (경로만 쓰면 파일 이름이 이름이 된다)
+    banks: Dict[str, str] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, sep, path = part.partition("=")
+        if not sep:
+            name, path = os.path.splitext(os.path.basename(part))[0], part
+        banks[name.strip()] = path.strip()
+    return banks
+
+
+def configured_banks() -> Dict[str, str]:
+    banks = {DEFAULT_BANK: "mbti.csv"}
+    bank_dir = os.environ.get("MBTI_BANK_DIR")
+    if bank_dir and os.path.isdir(bank_dir):
+        for entry in sorted(os.listdir(bank_dir)):
+            if entry.lower().endswith(".csv"):
+                banks[os.path.splitext(entry)[0]] = os.path.join(bank_dir, entry)
+    banks.update(parse_bank_spec(os.environ.get("MBTI_BANKS", "")))
+    return banks
+
+
+class BankRegistry:
+    def __init__(self, banks: Dict[str, str], default: str = DEFAULT_BANK):
+        if not banks:
+            raise ValueError("등록된 문항 은행이 없습니다.")
+        self.default = default if default in banks else next(iter(banks))
+        self._sources = {name: BankSource(name, path) for name, path in banks.items()}
+        self._current: Dict[str, ItemBank] = {}
+        self._versions: Dict[str, ItemBank] = {}     # content_hash -> 은행
+        self._history: Dict[str, List[str]] = {}     # 이름 -> 읽은 버전 (오래된 순)
+        self._frames: Dict[str, object] = {}         # content_hash -> DataFrame (화면용)
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        for name in self._sources:
+            self.reload(name)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._sources)
+
+    # -----------------------------
+    # 읽기 & 바꿔 끼우기
+    # -----------------------------
+    def reload(self, name: str) -> bool:
+        # 파일이 바뀌었으면 새 버전을 현재 버전으로 바꾼다. (바뀌었으면 True)
+        source = self._sources[name]
+        stat = _stat(source.path)
+        if stat is not None and stat == source.stat and name in self._current:
+            return False
+        try:
+            bank = load_item_bank(source.path)
+        except (OSError, ValueError) as e:
+            # 고치는 중인 파일 등 — 지금 버전을 그대로 쓴다.
+            source.last_error = str(e)
+            if name not in self._current and name == self.default:
+                raise
+            return False
+        source.stat = stat
+        source.last_error = None
+
+        with self._lock:
+            current = self._current.get(name)
+            if current is not None and current.content_hash == bank.content_hash:
+                return False
+            self._versions.setdefault(bank.content_hash, bank)
+            self._history.setdefault(name, []).append(bank.content_hash)
+            self._current[name] = self._versions[bank.content_hash]
+        return True
+
+    def reload_all(self) -> List[str]:
+        return [name for name in self._sources if self.reload(name)]
+
+    def start_watcher(self, interval: float = 5.0) -> threading.Thread:
+        if self._watcher is not None:
+            return self._watcher
+
+        def loop() -> None:
+            while True:
+                time.sleep(interval)
+                self.reload_all()
+
+        self._watcher = threading.Thread(target=loop, name="item-bank-watcher", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def resolve_name(self, name: Optional[str]) -> str:
+        return name if name in self._current else self.default
+
+    def current(self, name: Optional[str] = None) -> ItemBank:
+        return self._current[self.resolve_name(name)]
+
+    def get(self, content_hash: Optional[str], name: Optional[str] = None) -> ItemBank:
+        # 세션이 시작할 때의 버전. 다른 워커가 만든 버전이면 컴파일 산출물에서 찾고,
+        # 그것도 없으면 지금 버전을 쓴다.
+        bank = self._versions.get(content_hash or "")
+        if bank is not None:
+            return bank
+        name = self.resolve_name(name)
+        if content_hash:
+            bank = load_item_bank_version(self._sources[name].path, content_hash)
+            if bank is not None:
+                with self._lock:
+                    return self._versions.setdefault(content_hash, bank)
+        return self._current[name]
+
+    def versions(self, name: Optional[str] = None) -> List[ItemBank]:
+        # 최신 버전부터
+        name = self.resolve_name(name)
+        return [self._versions[h] for h in reversed(self._history.get(name, []))]
+
+    def frame(self, bank: ItemBank):
+        # 버전마다 DataFrame 하나만 만들어 모든 세션이 같이 쓴다. (읽기 전용)
+        frame = self._frames.get(bank.content_hash)
+        if frame is None:
+            frame = bank.to_frame()
+            with self._lock:
+                frame = self._frames.setdefault(bank.content_hash, frame)
+        return frame
+
+    def status(self) -> Dict[str, Dict[str, object]]:
+        return {
+            name: {
+                "path": source.path,
+                "version": self._current[name].version if name in self._current else None,
+                "versions_loaded": len(self._history.get(name, [])),
+                "last_error": source.last_error,
+            }
+            for name, source in self._sources.items()
+        }
@@ -0,0 +1,156 @@
+# 동시 세션 부하 테스트 (Streamlit AppTest, headless)
+#  - 세션 N개를 동시에 띄워 36문항을 모두 풀고 결과 화면(+결과 이미지)까지 연다.
+#  - rerun 지연 시간 백분위, 세션당 최대 RSS 증가량을 출력한다.
+#  - 함수 단위 비용(load_mbti, compute_mbti, create_result_figure)은 micro.py 에서 잰다.
+#
+#  python benchmarks/load_test.py --sessions 20
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class RssSampler:
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class Session:
+    # 세션 하나가 검사를 한 단계씩 진행한다. (step() 한 번 = rerun 한 번)
+    def __init__(self, seed: int, with_figure: bool):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = random.Random(seed)
+        self.with_figure = with_figure
+        self.at = AppTest.from_file(APP_PATH, default_timeout=60)
+        self.timings: Dict[str, List[float]] = {"question": [], "results": [], "figure": []}
+        self.done = False
+        self._phase = "question"
+        self._started = False
+
+    def _run(self, phase: str) -> None:
+        started = time.perf_counter()
+        self.at.run()
+        self.timings[phase].append(time.perf_counter() - started)
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].message)
+
+    def step(self) -> None:
+        at = self.at
+        if not self._started:
+            self._started = True
+            self._run("question")
+            return
+
+        labels = [b.label for b in at.button]
+        if labels and labels[0].startswith("다음 문항"):
+            # 세션마다 응답을 달리해 결과 이미지 캐시가 모두 적중하지 않게 한다.
+            at.radio[0].set_value(self.rng.choice(at.radio[0].options))
+            at.button[0].click()
+            self._run("question")
+        elif "결과 보기" in labels:
+            at.button[labels.index("결과 보기")].click()
+            self._run("results")
+        elif self.with_figure and "결과 이미지 만들기" in labels:
+            at.button[labels.index("결과 이미지 만들기")].click()
+            self._run("figure")
+        else:
+            self.done = True
+
+
+def run_sessions(count: int, with_figure: bool, seed: int = 0) -> List[Session]:
+    # AppTest는 한 프로세스 안에서 스레드 동시 실행을 지원하지 않으므로,
+    # 세션 N개를 모두 띄워 둔 채 한 rerun씩 번갈아 진행한다.
+    # (N개 세션 상태가 동시에 메모리에 있고, 캐시는 서버처럼 공유된다.)
+    sessions = [Session(seed + i, with_figure) for i in range(count)]
+    active = list(sessions)
+    while active:
+        for s in active:
+            s.step()
+        active = [s for s in active if not s.done]
+    return sessions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="동시 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수")
+    parser.add_argument("--no-figure", action="store_true", help="결과 이미지 생성은 건너뜀")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    os.chdir(ROOT)
+    # 운영 DB(결과·진행 상태)에 가짜 세션을 쓰지 않도록 따로 둔다.
+    os.environ.setdefault("MBTI_RESULTS_DB", os.path.join(tempfile.mkdtemp(), "bench.db"))
+    os.environ.setdefault("MBTI_SESSION_STORE", "memory")
+
+    # 첫 세션으로 import·캐시를 데운 뒤 측정한다.
+    run_sessions(1, with_figure=False, seed=0)
+
+    base_rss = _rss_bytes()
+    started = time.perf_counter()
+    with RssSampler() as sampler:
+        sessions = run_sessions(args.sessions, not args.no_figure, seed=1)
+    wall = time.perf_counter() - started
+
+    all_reruns = [v for s in sessions for r in s.timings.values() for v in r]
+    print(f"세션 {args.sessions}개, rerun {len(all_reruns)}회, 전체 {wall:.2f}s")
+    for phase in ("question", "results", "figure"):
+        values = [v for s in sessions for v in s.timings[phase]]
+        if not values:
+            continue
+        print(
+            f"  {phase:9s} rerun {len(values):5d}회  "
+            f"p50 {percentile(values, 50) * 1000:7.1f}ms  "
+            f"p90 {percentile(values, 90) * 1000:7.1f}ms  "
+            f"p99 {percentile(values, 99) * 1000:7.1f}ms  "
+            f"mean {statistics.mean(values) * 1000:7.1f}ms"
+        )
+    per_session = (sampler.peak - base_rss) / args.sessions
+    print(f"  최대 RSS {sampler.peak / 2**20:.1f}MB, 세션당 증가 {per_session / 2**20:.2f}MB")
+    reruns_per_student = len(all_reruns) / args.sessions
+    students_per_min = 60 / (sum(all_reruns) / args.sessions)
+    print(
+        f"  학생당 rerun {reruns_per_student:.0f}회 -> "
+        f"워커 프로세스 하나(코어 하나)가 분당 약 {students_per_min:.0f}명 처리"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
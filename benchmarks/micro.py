@@ -0,0 +1,132 @@
+# 마이크로 벤치마크 (기준값 대비 회귀 검사)
+#  - load_mbti / compute_mbti / score_bits / score_batch / norm_percentiles / item_analysis /
+#    create_result_figure / render_result_svg 시간을 잰다.
+#  - benchmarks/baselines.json 의 기준값보다 --tolerance 배(기본 2.0) 이상 느리면 실패(exit 1).
+#  - 기준값은 장비마다 다르므로, 배포 장비에서 --update 로 다시 기록한다.
+#
+#  python benchmarks/micro.py            # 비교
+#  python benchmarks/micro.py --update   # 기준값 갱신
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+from typing import Callable, Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baselines.json")
+sys.path.insert(0, ROOT)
+
+
+def measure(fn: Callable[[], object], repeat: int, number: int = 1) -> float:
+    fn()  # 첫 호출(import, 캐시 준비)은 제외한다.
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    return min(samples)
+
+
+def build_cases() -> Dict[str, Tuple[Callable[[], object], int, int]]:
+    import numpy as np
+
+    import item_bank
+    from answer_bits import get_bank_masks
+    from item_analysis import analyze
+    from mbti_core import MBTI_RECOMMENDATIONS, compute_mbti
+    from norms import NormStore
+    from result_figure import create_result_figure
+    from result_svg import render_result_svg
+    from scoring import SCORE_KEYS, item_index_from_bank, score_batch
+
+    csv_path = os.path.join(ROOT, "mbti.csv")
+    bank = item_bank.load_item_bank(csv_path)
+    df = bank.to_frame()
+    rng = np.random.default_rng(0)
+    answers = {
+        qid: (a if rng.random() < 0.5 else b)
+        for qid, a, b in zip(bank.ids, bank.a_codes, bank.b_codes)
+    }
+    choices = rng.integers(0, 3, size=(10_000, len(bank)), dtype=np.int8)
+    index = item_index_from_bank(bank)
+    mbti_type, scores = compute_mbti(df, answers)
+    masks = get_bank_masks(bank)
+    norms = NormStore(":memory:")
+    for row in score_batch(index, choices[:2000])[1]:
+        norms.record(dict(zip(SCORE_KEYS, map(int, row))), "A고/2학년/3반")
+
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+
+    def load_cached() -> object:
+        item_bank._memo.clear()
+        return item_bank.load_item_bank(csv_path)
+
+    return {
+        # 이름: (함수, 반복 횟수, 1회 측정당 호출 수)
+        "load_mbti_compile": (lambda: item_bank.compile_item_bank(raw), 20, 10),
+        "load_mbti_artifact": (load_cached, 20, 10),
+        "load_mbti_frame": (lambda: load_cached().to_frame(), 20, 5),
+        "compute_mbti": (lambda: compute_mbti(df, answers), 20, 100),
+        "score_bits": (lambda: masks.score(masks.encode(answers)), 20, 1000),
+        "score_batch_10k": (lambda: score_batch(index, choices), 10, 1),
+        "item_analysis_10k": (lambda: analyze(bank, [choices]), 10, 1),
+        "norm_percentiles": (lambda: norms.percentiles(scores, "A고/2학년/3반"), 20, 1000),
+        "create_result_figure": (
+            lambda: create_result_figure(mbti_type, scores, MBTI_RECOMMENDATIONS.get(mbti_type, {})),
+            3,
+            1,
+        ),
+        "render_result_svg": (
+            lambda: render_result_svg(mbti_type, scores, MBTI_RECOMMENDATIONS.get(mbti_type, {})),
+            20,
+            100,
+        ),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="마이크로 벤치마크")
+    parser.add_argument("--update", action="store_true", help="현재 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="허용 배수 (기본 2.0)")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")  # 한글 글리프 경고 등
+    results = {name: measure(fn, repeat, number) for name, (fn, repeat, number) in build_cases().items()}
+
+    baselines: Dict[str, float] = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    failed = []
+    for name, seconds in results.items():
+        base = baselines.get(name)
+        if base is None:
+            status = "(기준값 없음)"
+        else:
+            ratio = seconds / base
+            status = f"x{ratio:.2f}"
+            if ratio > args.tolerance:
+                status += "  <-- 회귀"
+                failed.append(name)
+        print(f"{name:24s} {seconds * 1000:10.3f}ms  {status}")
+
+    if args.update:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({k: round(v, 6) for k, v in results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"기준값 저장: {BASELINE_PATH}")
+        return 0
+
+    if failed:
+        print(f"회귀 {len(failed)}건: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+import argparse
+import codecs
+import csv
+import io
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scoring import ANSWER_A, ANSWER_B, ANSWER_NONE, SCORE_KEYS, build_item_index, score_batch
+
+
+# =========================================
+# 답안지 일괄 채점 (스트리밍)
+#  - 큰 답안 CSV를 chunk 단위로 읽고, 검증·채점한 뒤 바로 결과 파일에 쓴다.
+#  - 메모리는 chunk 크기만큼만 쓴다. (입력 크기와 무관)
+#
+#  답안 CSV 형식
+#   - 문항 열: 문항 id("1") 또는 "q1" / "Q1" 형태의 헤더
+#   - 그 밖의 열(학번, 이름 등)은 결과 파일에 그대로 옮긴다.
+#   - 응답 값: A/B, 1/2, 선택지 코드(E/I/…), 선택지 문장. 빈칸은 무응답.
+# =========================================
+DEFAULT_CHUNK_SIZE = 5000
+RESULT_COLUMNS = ["mbti_type", *SCORE_KEYS, "answered", "error"]
+
+
+class AnswerSheetError(ValueError):
+    pass
+
+
+@dataclass
+class BulkProgress:
+    rows: int = 0
+    scored: int = 0
+    invalid: int = 0
+    bytes_read: int = 0
+    total_bytes: Optional[int] = None
+    elapsed: float = 0.0
+
+    @property
+    def fraction(self) -> Optional[float]:
+        if not self.total_bytes:
+            return None
+        return min(1.0, self.bytes_read / self.total_bytes)
+
+
+ProgressCallback = Callable[[BulkProgress], None]
+
+
+class AnswerSheetScorer:
+    def __init__(
+        self,
+        ids: Sequence[int],
+        a_codes: Sequence[str],
+        b_codes: Sequence[str],
+        a_texts: Sequence[str],
+        b_texts: Sequence[str],
+    ):
+        self.ids = [int(i) for i in ids]
+        self.index = build_item_index(ids, a_codes, b_codes)
+
+        # 문항별 응답 값 -> ANSWER_A / ANSWER_B
+        self._value_maps: List[Dict[str, int]] = []
+        for a_code, b_code, a_text, b_text in zip(a_codes, b_codes, a_texts, b_texts):
+            values = {"": ANSWER_NONE}
+            for key, answer in [
+                (str(a_text).strip(), ANSWER_A),
+                (str(b_text).strip(), ANSWER_B),
+                (str(a_code).upper(), ANSWER_A),
+                (str(b_code).upper(), ANSWER_B),
+                ("A", ANSWER_A),
+                ("B", ANSWER_B),
+                ("1", ANSWER_A),
+                ("2", ANSWER_B),
+            ]:
+                values.setdefault(key, answer)
+            self._value_maps.append(values)
+
+    @classmethod
+    def from_bank(cls, bank) -> "AnswerSheetScorer":
+        return cls(bank.ids, bank.a_codes, bank.b_codes, bank.a_texts, bank.b_texts)
+
+    @classmethod
+    def from_frame(cls, df_items) -> "AnswerSheetScorer":
+        return cls(
+            df_items["id"].tolist(),
+            df_items["option_a_code"].tolist(),
+            df_items["option_b_code"].tolist(),
+            df_items["option_a_text"].tolist(),
+            df_items["option_b_text"].tolist(),
+        )
+
+    def resolve_header(self, header: Sequence[str]) -> Tuple[List[int], List[int]]:
+        # (문항 순서대로 답안 열 위치, 그대로 옮길 열 위치)
+        by_name: Dict[str, int] = {}
+        for pos, name in enumerate(header):
+            key = name.strip().lower()
+            if key.startswith("q") and key[1:].isdigit():
+                key = key[1:]
+            by_name.setdefault(key, pos)
+
+        missing = [qid for qid in self.ids if str(qid) not in by_name]
+        if missing:
+            raise AnswerSheetError(
+                f"답안 파일에 다음 문항 열이 없습니다: {missing}\n"
+                "문항 id(예: 1) 또는 q1 형태의 헤더가 필요합니다."
+            )
+        item_positions = [by_name[str(qid)] for qid in self.ids]
+        used = set(item_positions)
+        passthrough = [pos for pos in range(len(header)) if pos not in used]
+        return item_positions, passthrough
+
+    def parse_row(self, values: Sequence[str], item_positions: Sequence[int], out: np.ndarray) -> str:
+        # out 에 응답을 채우고, 문제가 있으면 오류 메시지를 돌려준다.
+        errors: List[str] = []
+        for col, (pos, value_map) in enumerate(zip(item_positions, self._value_maps)):
+            raw = values[pos].strip() if pos < len(values) else ""
+            answer = value_map.get(raw)
+            if answer is None:
+                answer = value_map.get(raw.upper())
+            if answer is None:
+                errors.append(f"{self.ids[col]}번 문항: 알 수 없는 응답 '{raw}'")
+                answer = ANSWER_NONE
+            out[col] = answer
+        return "; ".join(errors)
+
+
+# =========================================
+# 결과 쓰기 (CSV / Parquet)
+# =========================================
+class CsvResultWriter:
+    def __init__(self, path: str, columns: Sequence[str]):
+        self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write_rows(self, rows: List[list]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetResultWriter:
+    def __init__(self, path: str, columns: Sequence[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet 출력에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)") from e
+
+        self._pa = pa
+        self._columns = list(columns)
+        fields = []
+        for name in self._columns:
+            if name in SCORE_KEYS or name == "answered":
+                fields.append(pa.field(name, pa.int16()))
+            else:
+                fields.append(pa.field(name, pa.string()))
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_rows(self, rows: List[list]) -> None:
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        table = self._pa.Table.from_arrays(
+            [self._pa.array(list(col), type=f.type) for col, f in zip(columns, self._schema)],
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def open_result_writer(path: str, columns: Sequence[str], fmt: Optional[str] = None):
+    fmt = fmt or ("parquet" if path.lower().endswith(".parquet") else "csv")
+    if fmt == "parquet":
+        return ParquetResultWriter(path, columns)
+    if fmt == "csv":
+        return CsvResultWriter(path, columns)
+    raise ValueError(f"지원하지 않는 출력 형식입니다: {fmt}")
+
+
+# =========================================
+# 스트리밍 채점
+# =========================================
+def detect_encoding(stream: BinaryIO, sample_size: int = 64 * 1024) -> str:
+    # utf-8(BOM 포함)이 아니면 엑셀 한글 기본값인 cp949로 본다.
+    start = stream.tell()
+    sample = stream.read(sample_size)
+    stream.seek(start)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "cp949"
+    return "utf-8"
+
+
+def _line_of_decode_error(stream: BinaryIO, error: UnicodeDecodeError) -> int:
+    # 디코더가 방금 읽은 덩어리(error.object) 안의 깨진 위치 -> 파일의 몇 번째 줄인지
+    offset = stream.tell() - len(error.object) + error.start
+    stream.seek(0)
+    lines = 1
+    while offset > 0:
+        block = stream.read(min(offset, 1 << 20))
+        if not block:
+            break
+        lines += block.count(b"\n")
+        offset -= len(block)
+    return lines
+
+
+def decoded_rows(reader, stream: BinaryIO, encoding: str) -> Iterator[List[str]]:
+    # 인코딩 자동 감지는 앞부분만 보므로, 뒤에서 글자가 깨지면 몇 번째 줄인지 알려 준다.
+    while True:
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as e:
+            raise AnswerSheetError(
+                f"{_line_of_decode_error(stream, e)}행을 {encoding} 인코딩으로 읽을 수 없습니다. "
+                "파일 전체를 UTF-8 또는 CP949 하나로 저장했는지 확인해 주세요."
+            ) from None
+        yield values
+
+
+def score_answer_stream(
+    stream: BinaryIO,
+    scorer: AnswerSheetScorer,
+    output_path: str,
+    output_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: Optional[str] = None,
+    total_bytes: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> BulkProgress:
+    encoding = encoding or detect_encoding(stream)
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        return _score_rows(
+            decoded_rows(csv.reader(text), stream, encoding),
+            stream,
+            scorer,
+            output_path,
+            output_format,
+            chunk_size,
+            total_bytes,
+            progress,
+        )
+    finally:
+        # 호출한 쪽이 연 스트림은 닫지 않는다.
+        text.detach()
+
+
+def _score_rows(
+    reader,
+    stream: BinaryIO,
+    scorer: AnswerSheetScorer,
+    output_path: str,
+    output_format: Optional[str],
+    chunk_size: int,
+    total_bytes: Optional[int],
+    progress: Optional[ProgressCallback],
+) -> BulkProgress:
+    try:
+        header = next(reader)
+    except StopIteration:
+        raise AnswerSheetError("답안 파일이 비어 있습니다.") from None
+    item_positions, passthrough = scorer.resolve_header(header)
+
+    columns = [header[pos] for pos in passthrough] + RESULT_COLUMNS
+    writer = open_result_writer(output_path, columns, output_format)
+    state = BulkProgress(total_bytes=total_bytes)
+    started = time.perf_counter()
+
+    # chunk 버퍼는 한 번만 만들고 계속 재사용한다.
+    choices = np.zeros((chunk_size, len(scorer.ids)), dtype=np.int8)
+    extra: List[List[str]] = []
+    errors: List[str] = []
+
+    def flush() -> None:
+        n = len(extra)
+        if n == 0:
+            return
+        types, score_matrix = score_batch(scorer.index, choices[:n])
+        answered = np.count_nonzero(choices[:n], axis=1)
+        rows = []
+        for i in range(n):
+            if errors[i]:
+                rows.append(extra[i] + [""] + [None] * len(SCORE_KEYS) + [int(answered[i]), errors[i]])
+                state.invalid += 1
+            else:
+                rows.append(extra[i] + [str(types[i])] + score_matrix[i].tolist() + [int(answered[i]), ""])
+                state.scored += 1
+        writer.write_rows(rows)
+        state.rows += n
+        state.bytes_read = stream.tell()
+        state.elapsed = time.perf_counter() - started
+        extra.clear()
+        errors.clear()
+        if progress is not None:
+            progress(state)
+
+    try:
+        for values in reader:
+            if not any(v.strip() for v in values):
+                continue
+            errors.append(scorer.parse_row(values, item_positions, choices[len(extra)]))
+            extra.append([values[pos] if pos < len(values) else "" for pos in passthrough])
+            if len(extra) == chunk_size:
+                flush()
+        flush()
+    finally:
+        writer.close()
+
+    if total_bytes:
+        state.bytes_read = total_bytes
+    return state
+
+
+def score_answer_file(
+    input_path: str,
+    scorer: AnswerSheetScorer,
+    output_path: str,
+    **kwargs,
+) -> BulkProgress:
+    with open(input_path, "rb") as f:
+        return score_answer_stream(
+            f,
+            scorer,
+            output_path,
+            total_bytes=os.path.getsize(input_path),
+            **kwargs,
+        )
+
+
+# =========================================
+# CLI
+#  python -m bulk_score answers.csv -o results.csv
+# =========================================
+def _print_progress(state: BulkProgress) -> None:
+    pct = f"{state.fraction * 100:5.1f}%" if state.fraction is not None else "  -  "
+    print(
+        f"\r{pct}  {state.rows:,}행 처리 (채점 {state.scored:,} / 오류 {state.invalid:,})"
+        f"  {state.elapsed:.1f}s",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MBTI 답안지 CSV 일괄 채점")
+    parser.add_argument("answers", help="답안 CSV 경로")
+    parser.add_argument("-o", "--output", required=True, help="결과 파일 경로 (.csv 또는 .parquet)")
+    parser.add_argument("--items", default="mbti.csv", help="문항 은행 CSV (기본: mbti.csv)")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="출력 형식 (기본: 확장자로 판단)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--encoding", help="답안 파일 인코딩 (기본: 자동 감지)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황을 출력하지 않음")
+    args = parser.parse_args(argv)
+
+    from item_bank import load_item_bank
+
+    scorer = AnswerSheetScorer.from_bank(load_item_bank(args.items))
+    try:
+        state = score_answer_file(
+            args.answers,
+            scorer,
+            args.output,
+            output_format=args.format,
+            chunk_size=args.chunk_size,
+            encoding=args.encoding,
+            progress=None if args.quiet else _print_progress,
+        )
+    except AnswerSheetError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"완료: {state.rows:,}행 (채점 {state.scored:,} / 오류 {state.invalid:,}) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
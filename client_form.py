@@ -0,0 +1,115 @@
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from adaptive import get_adaptive_plan
+from item_bank import ItemBank
+from scoring import ANSWER_A, ANSWER_B, ANSWER_NONE
+
+
+# =========================================
+# 브라우저 문항지 (한 번에 보내고, 한 번에 받기)
+#  - 문항 은행 전체를 컴포넌트(client_form_frontend/index.html)로 한 번 보낸다.
+#    문항 이동·선택·적응형 건너뛰기는 브라우저 안에서 하고,
+#    "결과 보기"를 누를 때만 응답 벡터가 서버로 온다.
+#    (학생 한 명당 스크립트 실행: 문항마다 1번씩 ~38번 -> 시작·제출 ~2번)
+#  - 응답 벡터: 문항 위치별 0 = 무응답, 1 = option_a, 2 = option_b (scoring.ANSWER_*)
+#  - 보낼 내용은 문항 은행 버전(content_hash)·적응형 여부마다 한 번만 만든다.
+# =========================================
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "client_form_frontend")
+FORM_KEY = "client_form_submission"  # st.session_state 의 컴포넌트 키 (다시 검사할 때 지운다)
+
+_component = None
+_forms: Dict[tuple, Dict[str, object]] = {}
+_forms_lock = threading.Lock()
+
+
+def _side(code_index: int, axis: int) -> int:
+    # 선택지 코드가 그 축의 앞 글자면 0, 뒷 글자면 1, 아니면 -1 (adaptive.axis_counts 와 같은 기준)
+    return code_index % 2 if code_index >= 0 and code_index // 2 == axis else -1
+
+
+def build_form(bank: ItemBank, adaptive: bool = False) -> Dict[str, object]:
+    plan = get_adaptive_plan(bank)
+    return {
+        "bank": bank.content_hash,
+        "adaptive": adaptive,
+        "ids": list(bank.ids),
+        "a_texts": list(bank.a_texts),
+        "b_texts": list(bank.b_texts),
+        "order": list(plan.order) if adaptive else list(range(len(bank))),
+        "axes": list(plan.axes),
+        "a_side": [_side(i, axis) for i, axis in zip(bank.a_code_index, plan.axes)],
+        "b_side": [_side(i, axis) for i, axis in zip(bank.b_code_index, plan.axes)],
+        "axis_totals": list(plan.axis_totals),
+    }
+
+
+def get_form(bank: ItemBank, adaptive: bool = False) -> Dict[str, object]:
+    key = (bank.content_hash, adaptive)
+    form = _forms.get(key)
+    if form is None:
+        form = build_form(bank, adaptive)
+        with _forms_lock:
+            _forms[key] = form
+    return form
+
+
+# -----------------------------
+# 응답 벡터 <-> answers(id -> 코드)
+# -----------------------------
+def answers_to_vector(bank: ItemBank, answers: Dict[int, str]) -> List[int]:
+    vector = []
+    for qid, a_code, b_code in zip(bank.ids, bank.a_codes, bank.b_codes):
+        code = answers.get(qid)
+        vector.append(ANSWER_A if code == a_code else ANSWER_B if code == b_code else ANSWER_NONE)
+    return vector
+
+
+def answers_from_vector(bank: ItemBank, vector: Sequence[int]) -> Dict[int, str]:
+    # 브라우저에서 온 값이므로 길이와 값을 검사한다.
+    if not isinstance(vector, list) or len(vector) != len(bank):
+        raise ValueError("응답 수가 문항 수와 다릅니다.")
+    answers: Dict[int, str] = {}
+    for qid, a_code, b_code, value in zip(bank.ids, bank.a_codes, bank.b_codes, vector):
+        if value == ANSWER_A:
+            answers[qid] = a_code
+        elif value == ANSWER_B:
+            answers[qid] = b_code
+        elif value != ANSWER_NONE:
+            raise ValueError(f"알 수 없는 응답 값입니다: {value!r}")
+    return answers
+
+
+def is_complete(bank: ItemBank, answers: Dict[int, str], adaptive: bool = False) -> bool:
+    if adaptive:
+        return get_adaptive_plan(bank).next_position(answers) is None
+    return all(qid in answers for qid in bank.ids)
+
+
+# -----------------------------
+# 컴포넌트
+# -----------------------------
+def client_questionnaire(
+    bank: ItemBank,
+    answers: Dict[int, str],
+    session_id: str,
+    adaptive: bool = False,
+) -> Optional[Dict[int, str]]:
+    # 제출했으면 answers(id -> 코드), 아직이면 None
+    global _component
+    if _component is None:
+        import streamlit.components.v1 as components
+
+        _component = components.declare_component("mbti_client_form", path=_FRONTEND_DIR)
+
+    value = _component(
+        form=get_form(bank, adaptive),
+        initial=answers_to_vector(bank, answers),  # 서버에 저장된 진행 상태에서 이어 간다.
+        session=session_id,
+        key=FORM_KEY,
+        default=None,
+    )
+    if not value or value.get("bank") != bank.content_hash:
+        return None  # 다른 버전의 문항지에서 온 값은 버린다.
+    return answers_from_vector(bank, value.get("answers"))
@@ -0,0 +1,397 @@
+import argparse
+import csv
+import html
+import io
+import json
+import math
+import os
+import sqlite3
+import sys
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from bulk_score import DEFAULT_CHUNK_SIZE, AnswerSheetError, AnswerSheetScorer, decoded_rows, detect_encoding
+from item_bank import ItemBank, load_item_bank
+from scoring import ANSWER_A, ANSWER_B, ANSWER_NONE, AXIS_PAIRS
+
+
+# =========================================
+# 문항 분석 (저장된 응답 전체, NumPy 일괄 계산)
+#  - 문항마다: option_a / option_b 선택 비율, 같은 축 안의 문항-나머지 상관(item-rest r),
+#    그 문항을 뺐을 때의 Cronbach α
+#  - 축마다: Cronbach α (그 축 문항에 모두 답한 응답만)
+#  - 응답은 "앞 글자(E/S/T/J)를 골랐으면 1" 로 바꿔서 계산한다.
+#  - chunk 마다 합계와 교차곱(XᵀX)만 더하므로 메모리는 chunk 크기만큼만 쓴다.
+#    (저장된 결과 DB, 답안 CSV 둘 다 스트리밍)
+#
+#  python -m item_analysis --db mbti_results.db -o item_report.html --csv item_report.csv
+#  python -m item_analysis --answers answers.csv -o item_report.html
+# =========================================
+MIN_ITEM_REST_R = 0.2       # 이보다 낮으면 "변별 낮음"
+MAX_ENDORSEMENT = 0.9       # 한쪽 선택 비율이 이 이상이면 "한쪽 쏠림"
+
+AXIS_NAMES = tuple(a + b for a, b in AXIS_PAIRS)
+CSV_COLUMNS = [
+    "id", "dimension_pair", "axis", "option_a_code", "option_b_code", "n_answered",
+    "a_rate", "b_rate", "item_rest_r", "alpha_if_deleted", "flags",
+]
+
+
+@dataclass(frozen=True)
+class ItemStats:
+    id: int
+    position: int
+    dimension_pair: str
+    axis: str                # 코드로 정한 축 (모르면 "")
+    option_a_code: str
+    option_b_code: str
+    n_answered: int
+    a_rate: float
+    b_rate: float
+    item_rest_r: float       # 값이 없으면 nan
+    alpha_if_deleted: float
+    flags: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class AxisStats:
+    axis: str
+    n_items: int
+    n_complete: int          # 이 축 문항에 모두 답한 응답 수 (α 계산에 쓴 수)
+    alpha: float
+
+
+@dataclass(frozen=True)
+class ItemAnalysis:
+    bank_version: str
+    n_responses: int
+    axes: List[AxisStats]
+    items: List[ItemStats]
+
+
+# =========================================
+# 누적기 (chunk 단위로 더하고, 서로 합칠 수 있다)
+# =========================================
+class _AxisAccumulator:
+    __slots__ = ("positions", "n", "sums", "cross")
+
+    def __init__(self, positions: np.ndarray):
+        self.positions = positions
+        self.n = 0
+        self.sums = np.zeros(len(positions))
+        self.cross = np.zeros((len(positions), len(positions)))
+
+
+class ItemAnalyzer:
+    def __init__(self, bank: ItemBank):
+        self.bank = bank
+        n_items = len(bank)
+        a_index = np.array(bank.a_code_index)
+        b_index = np.array(bank.b_code_index)
+        # 문항의 축: 선택지 코드로 정한다. (채점과 같은 기준)
+        self.axes = np.where(a_index >= 0, a_index // 2, np.where(b_index >= 0, b_index // 2, -1))
+        # option_a 를 고르면 앞 글자인가 (a 코드가 없으면 b 코드의 반대)
+        self.front_if_a = np.where(a_index >= 0, a_index % 2 == 0, b_index % 2 == 1)
+        self._axes = [
+            _AxisAccumulator(np.flatnonzero(self.axes == axis)) for axis in range(len(AXIS_PAIRS))
+        ]
+        self.n_rows = 0
+        self.answered = np.zeros(n_items, dtype=np.int64)
+        self.a_counts = np.zeros(n_items, dtype=np.int64)
+
+    def add(self, choices: np.ndarray) -> None:
+        # choices: (N, M) 응답 행렬 (scoring.ANSWER_*)
+        if len(choices) == 0:
+            return
+        answered = choices != ANSWER_NONE
+        a_sel = choices == ANSWER_A
+        self.n_rows += len(choices)
+        self.answered += answered.sum(axis=0)
+        self.a_counts += a_sel.sum(axis=0)
+
+        front = (a_sel == self.front_if_a) & answered  # (N, M) 앞 글자 선택 여부
+        for acc in self._axes:
+            if len(acc.positions) == 0:
+                continue
+            complete = answered[:, acc.positions].all(axis=1)
+            x = front[complete][:, acc.positions].astype(np.float64)
+            acc.n += len(x)
+            acc.sums += x.sum(axis=0)
+            acc.cross += x.T @ x
+
+    def merge(self, other: "ItemAnalyzer") -> None:
+        self.n_rows += other.n_rows
+        self.answered += other.answered
+        self.a_counts += other.a_counts
+        for acc, o in zip(self._axes, other._axes):
+            acc.n += o.n
+            acc.sums += o.sums
+            acc.cross += o.cross
+
+    # -----------------------------
+    # 결과
+    # -----------------------------
+    @staticmethod
+    def _axis_stats(acc: _AxisAccumulator) -> Tuple[float, np.ndarray, np.ndarray]:
+        # (α, 문항별 item-rest r, 문항별 α-if-deleted)
+        k = len(acc.positions)
+        nan = np.full(k, np.nan)
+        if acc.n < 2 or k < 2:
+            return math.nan, nan, nan
+        cov = (acc.cross - np.outer(acc.sums, acc.sums) / acc.n) / (acc.n - 1)
+        item_var = np.diag(cov)
+        row = cov.sum(axis=1)
+        total = cov.sum()
+        rest_var = total - 2 * row + item_var   # 그 문항을 뺀 나머지 합의 분산
+        with np.errstate(invalid="ignore", divide="ignore"):
+            alpha = k / (k - 1) * (1 - item_var.sum() / total) if total > 0 else math.nan
+            item_rest = (row - item_var) / np.sqrt(item_var * rest_var)
+            if k > 2:
+                alpha_deleted = (k - 1) / (k - 2) * (1 - (item_var.sum() - item_var) / rest_var)
+            else:
+                alpha_deleted = nan
+        return float(alpha), item_rest, alpha_deleted
+
+    def result(self) -> ItemAnalysis:
+        bank = self.bank
+        n_items = len(bank)
+        item_rest = np.full(n_items, np.nan)
+        alpha_deleted = np.full(n_items, np.nan)
+        axes: List[AxisStats] = []
+        alphas = {}
+        for axis, acc in enumerate(self._axes):
+            alpha, r, a_del = self._axis_stats(acc)
+            item_rest[acc.positions] = r
+            alpha_deleted[acc.positions] = a_del
+            alphas[axis] = alpha
+            axes.append(AxisStats(AXIS_NAMES[axis], len(acc.positions), acc.n, alpha))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            a_rate = self.a_counts / self.answered
+        items: List[ItemStats] = []
+        for pos in range(n_items):
+            axis = int(self.axes[pos])
+            flags = []
+            if axis < 0:
+                flags.append("축을 알 수 없는 코드")
+            elif bank.dimension_pairs[pos] != AXIS_NAMES[axis]:
+                flags.append("dimension_pair 와 코드가 다름")
+            if self.answered[pos] and max(a_rate[pos], 1 - a_rate[pos]) >= MAX_ENDORSEMENT:
+                flags.append("한쪽 쏠림")
+            if item_rest[pos] < MIN_ITEM_REST_R:
+                flags.append("변별 낮음")
+            if axis >= 0 and alpha_deleted[pos] > alphas[axis]:
+                flags.append("빼면 α 상승")
+            items.append(
+                ItemStats(
+                    id=bank.ids[pos],
+                    position=pos,
+                    dimension_pair=bank.dimension_pairs[pos],
+                    axis=AXIS_NAMES[axis] if axis >= 0 else "",
+                    option_a_code=bank.a_codes[pos],
+                    option_b_code=bank.b_codes[pos],
+                    n_answered=int(self.answered[pos]),
+                    a_rate=float(a_rate[pos]),
+                    b_rate=float(1 - a_rate[pos]),
+                    item_rest_r=float(item_rest[pos]),
+                    alpha_if_deleted=float(alpha_deleted[pos]),
+                    flags=tuple(flags),
+                )
+            )
+        return ItemAnalysis(bank.version, self.n_rows, axes, items)
+
+
+def analyze(bank: ItemBank, chunks: Iterable[np.ndarray]) -> ItemAnalysis:
+    analyzer = ItemAnalyzer(bank)
+    for choices in chunks:
+        analyzer.add(choices)
+    return analyzer.result()
+
+
+# =========================================
+# 입력 (chunk 단위 응답 행렬)
+# =========================================
+def choices_from_rows(bank: ItemBank, rows: Sequence[Tuple[str, Optional[int], Optional[int]]]) -> np.ndarray:
+    # 결과 DB 의 (answers JSON, answered_mask, choice_mask) -> (N, M) 응답 행렬
+    n_items = len(bank)
+    choices = np.zeros((len(rows), n_items), dtype=np.int8)
+    bit_rows = [i for i, (_, answered, _) in enumerate(rows) if answered is not None]
+    if bit_rows:
+        # 비트로 저장된 응답은 한 번에 푼다. (문항 63개 이하)
+        shifts = np.arange(n_items, dtype=np.int64)
+        answered = np.array([rows[i][1] for i in bit_rows], dtype=np.int64)[:, None] >> shifts & 1
+        chosen_b = np.array([rows[i][2] or 0 for i in bit_rows], dtype=np.int64)[:, None] >> shifts & 1
+        choices[bit_rows] = np.where(answered == 1, np.where(chosen_b == 1, ANSWER_B, ANSWER_A), ANSWER_NONE)
+
+    position = {qid: pos for pos, qid in enumerate(bank.ids)}
+    for i, (answers_json, answered, _) in enumerate(rows):
+        if answered is not None or not answers_json:
+            continue
+        for qid, code in json.loads(answers_json).items():
+            pos = position.get(int(qid))
+            if pos is None:
+                continue
+            if code == bank.a_codes[pos]:
+                choices[i, pos] = ANSWER_A
+            elif code == bank.b_codes[pos]:
+                choices[i, pos] = ANSWER_B
+    return choices
+
+
+def iter_store_chunks(store, bank: ItemBank, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    # 결과 DB (result_store.ResultStore) 에서 이 문항 은행 버전의 응답만
+    for rows in store.iter_answer_batches(bank.version, chunk_size):
+        yield choices_from_rows(bank, rows)
+
+
+def iter_answer_sheet_chunks(
+    stream: BinaryIO,
+    scorer: AnswerSheetScorer,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[np.ndarray]:
+    # 답안 CSV (bulk_score 와 같은 형식). 알 수 없는 응답 칸은 무응답으로 본다.
+    encoding = detect_encoding(stream)
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        reader = decoded_rows(csv.reader(text), stream, encoding)
+        try:
+            header = next(reader)
+        except StopIteration:
+            raise AnswerSheetError("답안 파일이 비어 있습니다.") from None
+        item_positions, _ = scorer.resolve_header(header)
+
+        choices = np.zeros((chunk_size, len(scorer.ids)), dtype=np.int8)
+        n = 0
+        for values in reader:
+            if not any(v.strip() for v in values):
+                continue
+            scorer.parse_row(values, item_positions, choices[n])
+            n += 1
+            if n == chunk_size:
+                yield choices
+                choices = np.zeros_like(choices)
+                n = 0
+        if n:
+            yield choices[:n]
+    finally:
+        text.detach()
+
+
+# =========================================
+# 보고서 (CSV / HTML)
+# =========================================
+def _fmt(value: float, digits: int = 3) -> str:
+    return "" if math.isnan(value) else f"{value:.{digits}f}"
+
+
+def write_item_csv(analysis: ItemAnalysis, out: TextIO) -> None:
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    for item in analysis.items:
+        writer.writerow([
+            item.id, item.dimension_pair, item.axis, item.option_a_code, item.option_b_code,
+            item.n_answered, _fmt(item.a_rate), _fmt(item.b_rate), _fmt(item.item_rest_r),
+            _fmt(item.alpha_if_deleted), "; ".join(item.flags),
+        ])
+
+
+def render_html_report(analysis: ItemAnalysis, bank: Optional[ItemBank] = None) -> str:
+    esc = html.escape
+    alpha_by_axis = {a.axis: a.alpha for a in analysis.axes}
+    axis_rows = "".join(
+        f"<tr><td>{esc(a.axis)}</td><td>{a.n_items}</td><td>{a.n_complete:,}</td><td>{_fmt(a.alpha)}</td></tr>"
+        for a in analysis.axes
+    )
+    item_rows = []
+    for item in analysis.items:
+        text = ""
+        if bank is not None:
+            text = f"{bank.a_texts[item.position]} / {bank.b_texts[item.position]}"
+        item_rows.append(
+            f"<tr class=\"{'weak' if item.flags else ''}\">"
+            f"<td>{item.id}</td><td>{esc(item.axis or item.dimension_pair)}</td><td class=\"text\">{esc(text)}</td>"
+            f"<td>{esc(item.option_a_code)} {_fmt(item.a_rate * 100, 1)}%</td>"
+            f"<td>{esc(item.option_b_code)} {_fmt(item.b_rate * 100, 1)}%</td>"
+            f"<td>{item.n_answered:,}</td><td>{_fmt(item.item_rest_r)}</td>"
+            f"<td>{_fmt(item.alpha_if_deleted)} <small>(α {_fmt(alpha_by_axis.get(item.axis, math.nan))})</small></td>"
+            f"<td>{esc(', '.join(item.flags))}</td></tr>"
+        )
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>문항 분석 보고서</title>
+<style>
+body {{ font-family: sans-serif; margin: 24px; color: #222; }}
+table {{ border-collapse: collapse; margin-bottom: 24px; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; font-size: 13px; text-align: right; }}
+th {{ background: #f3f3f3; }}
+td.text {{ text-align: left; max-width: 420px; }}
+tr.weak td {{ background: #fff4e5; }}
+</style></head><body>
+<h1>문항 분석 보고서</h1>
+<p>문항 은행 버전 {esc(analysis.bank_version)} · 응답 {analysis.n_responses:,}건</p>
+<p>주황색 행: 변별 낮음(문항-나머지 r &lt; {MIN_ITEM_REST_R}), 한쪽 쏠림(한 선택지 {MAX_ENDORSEMENT:.0%} 이상),
+빼면 α 상승, 코드 불일치 중 하나 이상</p>
+<h2>축별 신뢰도 (Cronbach α)</h2>
+<table><tr><th>축</th><th>문항 수</th><th>모두 답한 응답</th><th>α</th></tr>{axis_rows}</table>
+<h2>문항별</h2>
+<table><tr><th>id</th><th>축</th><th>선택지</th><th>A 선택</th><th>B 선택</th><th>응답 수</th>
+<th>문항-나머지 r</th><th>뺐을 때 α</th><th>점검</th></tr>{''.join(item_rows)}</table>
+</body></html>
+"""
+
+
+# =========================================
+# CLI
+# =========================================
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="저장된 응답으로 문항 분석 보고서 만들기")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="결과 DB 경로 (예: mbti_results.db). 이 문항 은행 버전의 응답만 쓴다.")
+    source.add_argument("--answers", help="답안 CSV 경로 (bulk_score 형식)")
+    parser.add_argument("--items", default="mbti.csv", help="문항 은행 CSV (기본: mbti.csv)")
+    parser.add_argument("-o", "--output", help="HTML 보고서 경로")
+    parser.add_argument("--csv", help="문항별 CSV 경로")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="한 번에 읽을 응답 수")
+    args = parser.parse_args(argv)
+
+    try:
+        bank = load_item_bank(args.items)
+        if args.db:
+            from result_store import ResultStore
+
+            # 보고서만 만들므로 읽기 전용으로 연다. (경로를 잘못 주면 빈 DB를 만들지 않고 오류)
+            if not os.path.isfile(args.db):
+                raise FileNotFoundError(f"결과 DB 파일이 없습니다: {args.db}")
+            store = ResultStore(args.db, readonly=True, read_pool_size=1)
+            try:
+                analysis = analyze(bank, iter_store_chunks(store, bank, args.chunk_size))
+            finally:
+                store.close()
+        else:
+            with open(args.answers, "rb") as f:
+                analysis = analyze(
+                    bank, iter_answer_sheet_chunks(f, AnswerSheetScorer.from_bank(bank), args.chunk_size)
+                )
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(render_html_report(analysis, bank))
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8-sig", newline="") as f:
+            write_item_csv(analysis, f)
+
+    print(f"응답 {analysis.n_responses:,}건 (문항 은행 버전 {analysis.bank_version})")
+    for axis in analysis.axes:
+        print(f"  {axis.axis}: α = {_fmt(axis.alpha)} (모두 답한 응답 {axis.n_complete:,}건)")
+    weak = [item for item in analysis.items if item.flags]
+    for item in weak:
+        print(f"  {item.id}번 문항: {', '.join(item.flags)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
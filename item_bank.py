@@ -0,0 +1,203 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from scoring import CODE_INDEX
+
+
+# =========================================
+# 문항 은행(mbti.csv) 컴파일 (clean_mbti 형식)
+#  - CSV를 한 번 검증·정리해서 내용 해시로 이름 붙인 JSON 산출물로 저장한다.
+#  - CSV 내용이 바뀌면 해시가 바뀌므로 자동으로 다시 만든다.
+#  - 불러올 때 pandas가 필요 없다. (DataFrame은 to_frame()으로만)
+#    필요한 컬럼:
+#    id, dimension_pair, question,
+#    option_a_text, option_a_code,
+#    option_b_text, option_b_code
+# =========================================
+FORMAT_VERSION = 1
+REQUIRED_COLUMNS = [
+    "id",
+    "dimension_pair",
+    "question",
+    "option_a_text",
+    "option_a_code",
+    "option_b_text",
+    "option_b_code",
+]
+
+
+@dataclass(frozen=True)
+class ItemBank:
+    content_hash: str
+    ids: Tuple[int, ...]
+    dimension_pairs: Tuple[str, ...]
+    questions: Tuple[str, ...]
+    a_texts: Tuple[str, ...]
+    a_codes: Tuple[str, ...]
+    b_texts: Tuple[str, ...]
+    b_codes: Tuple[str, ...]
+    a_code_index: Tuple[int, ...]  # scoring.SCORE_KEYS 기준 열 번호 (없으면 -1)
+    b_code_index: Tuple[int, ...]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def version(self) -> str:
+        return self.content_hash[:12]
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "id": list(self.ids),
+                "dimension_pair": list(self.dimension_pairs),
+                "question": list(self.questions),
+                "option_a_text": list(self.a_texts),
+                "option_a_code": list(self.a_codes),
+                "option_b_text": list(self.b_texts),
+                "option_b_code": list(self.b_codes),
+            }
+        )
+
+
+def _decode(raw: bytes) -> str:
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return raw.decode("cp949")
+
+
+def compile_item_bank(raw: bytes, content_hash: Optional[str] = None) -> ItemBank:
+    reader = csv.reader(io.StringIO(_decode(raw), newline=""))
+    try:
+        header = [h.strip() for h in next(reader)]
+    except StopIteration:
+        raise ValueError("mbti.csv가 비어 있습니다.") from None
+
+    # 이름 없는 열(엑셀이 남긴 빈 열, Unnamed: n)은 무시한다.
+    columns = {
+        name: pos
+        for pos, name in enumerate(header)
+        if name and "Unnamed" not in name
+    }
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(
+            f"mbti.csv에 다음 컬럼이 필요합니다: {missing}\n"
+            "현재 파일이 clean_mbti 템플릿과 같은 구조인지 확인해 주세요."
+        )
+
+    fields: Dict[str, List[str]] = {c: [] for c in REQUIRED_COLUMNS}
+    for line_no, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        for c in REQUIRED_COLUMNS:
+            pos = columns[c]
+            fields[c].append(values[pos].strip() if pos < len(values) else "")
+        try:
+            int(fields["id"][-1])
+        except ValueError:
+            raise ValueError(f"mbti.csv {line_no}행의 id가 정수가 아닙니다: {fields['id'][-1]!r}") from None
+
+    ids = tuple(int(x) for x in fields["id"])
+    questions = tuple(
+        q if q not in ("", "nan", "None") else f"{qid}번 문항"
+        for qid, q in zip(ids, fields["question"])
+    )
+    a_codes = tuple(c.upper() for c in fields["option_a_code"])
+    b_codes = tuple(c.upper() for c in fields["option_b_code"])
+
+    return ItemBank(
+        content_hash=content_hash or hashlib.sha256(raw).hexdigest(),
+        ids=ids,
+        dimension_pairs=tuple(p.upper() for p in fields["dimension_pair"]),
+        questions=questions,
+        a_texts=tuple(fields["option_a_text"]),
+        a_codes=a_codes,
+        b_texts=tuple(fields["option_b_text"]),
+        b_codes=b_codes,
+        a_code_index=tuple(CODE_INDEX.get(c, -1) for c in a_codes),
+        b_code_index=tuple(CODE_INDEX.get(c, -1) for c in b_codes),
+    )
+
+
+# =========================================
+# 컴파일 산출물 캐시 (.mbti_cache/item_bank-<해시>.json)
+# =========================================
+def _cache_dir(csv_path: str) -> str:
+    return os.environ.get("MBTI_CACHE_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(csv_path)), ".mbti_cache"
+    )
+
+
+def _artifact_path(cache_dir: str, content_hash: str) -> str:
+    return os.path.join(cache_dir, f"item_bank-{content_hash[:16]}.json")
+
+
+def _read_artifact(path: str, content_hash: str) -> Optional[ItemBank]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("format") != FORMAT_VERSION or data.get("bank", {}).get("content_hash") != content_hash:
+        return None
+    try:
+        return ItemBank(**{k: v if k == "content_hash" else tuple(v) for k, v in data["bank"].items()})
+    except TypeError:
+        return None
+
+
+def _write_artifact(path: str, bank: ItemBank) -> None:
+    # 임시 파일에 쓴 뒤 교체해서, 동시에 시작한 워커가 반쯤 쓴 파일을 읽지 않게 한다.
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": FORMAT_VERSION, "bank": asdict(bank)}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # 캐시를 못 쓰는 환경이면 매번 컴파일한다.
+
+
+_memo: Dict[Tuple[str, str], ItemBank] = {}
+_memo_lock = threading.Lock()
+
+
+def load_item_bank(csv_path: str = "mbti.csv", cache_dir: Optional[str] = None) -> ItemBank:
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    content_hash = hashlib.sha256(raw).hexdigest()
+
+    key = (os.path.abspath(csv_path), content_hash)
+    bank = _memo.get(key)
+    if bank is not None:
+        return bank
+
+    path = _artifact_path(cache_dir or _cache_dir(csv_path), content_hash)
+    bank = _read_artifact(path, content_hash)
+    if bank is None:
+        bank = compile_item_bank(raw, content_hash)
+        _write_artifact(path, bank)
+
+    with _memo_lock:
+        # 같은 파일의 이전 버전은 버린다.
+        for old in [k for k in _memo if k[0] == key[0]]:
+            del _memo[old]
+        _memo[key] = bank
+    return bank
+
+
+def load_item_bank_version(
+    csv_path: str, content_hash: str, cache_dir: Optional[str] = None
+) -> Optional[ItemBank]:
+    # CSV가 이미 바뀐 뒤에도, 남아 있는 컴파일 산출물로 예전 버전을 불러온다. (없으면 None)
+    return _read_artifact(_artifact_path(cache_dir or _cache_dir(csv_path), content_hash), content_hash)
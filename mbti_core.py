@@ -0,0 +1,438 @@
+# MBTI 채점·해석 핵심 모듈 (UI 없음)
+#  - streamlit / pandas / matplotlib 없이 import 할 수 있다.
+#  - CLI: python -m mbti_core explain ABBA…  /  python -m mbti_core score answers.csv -o out.csv
+import argparse
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+
+from item_bank import ItemBank, load_item_bank
+from recommendations import Recommendation, RecommendationIndex, RecommendationSource
+from scoring import ALL_TYPES, item_index_from_bank, item_index_from_frame, score_answers
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# =========================================
+# 1) 각 유형별 긴 설명 (사용자가 준 문장들)
+# =========================================
+MBTI_PROFILES: Dict[str, List[str]] = {
+    "ISTJ": [
+        "＊부끄럼을 많이 탄다.",
+        "＊성실하고 책임감이 강하고 정리정돈을 잘한다.",
+        "＊예정에 없던 일을 몹시 힘들어한다.",
+        "＊자발성이 부족한 편이다.",
+        "＊표현이 적으며 표정변화가 없다.",
+        "＊절약과 준비정신이 철저하다.",
+        "＊양처럼 순하고 순종적이다.",
+        "＊외유내강의 느낌을 준다.",
+        "＊자세가 바르며 계획을 세워 공부한다.",
+        "＊자세한 설명을 선호한다.",
+        "＊창의적인 면과 융통성이 부족한 편이다.",
+    ],
+    "ISTP": [
+        "＊말수가 적고 표정변화가 거의 없다.",
+        "＊의욕적이며 고집이 세다.",
+        "＊앞에 나서지는 않지만 소집단에서는 리더 역할을 하려고 한다.",
+        "＊여러 가지에 관심이 많다.",
+        "＊왠지 강한 구석이 있다.",
+        "＊뒷마무리가 부족하다. 끈기가 부족하다.",
+        "＊타인에 대한 배려가 적다.",
+        "＊손재주가 있다.",
+        "＊친구와 잘 다투고 잘 따진다.",
+        "＊조용하다가도 일은 성급하게 한다.",
+    ],
+    "ESTP": [
+        "＊개방적, 활동적, 적극적, 진취적이다.",
+        "＊항상 즐겁다. 재치꾼이다.",
+        "＊모든 일에 관심을 갖고 지나치게 참견한다.",
+        "＊끝마무리가 부족하고 말과 행동에 불일치가 있다.",
+        "＊복잡한 것을 싫어한다.",
+        "＊욕심이 많다. 은근히 승부근성이 강하다.",
+        "＊대중 앞에 강하다. 과행동적이고 목소리가 크다.",
+        "＊말이 많고 잘 따지며 꾸중을 해도 자신의 입장을 끝까지 말한다.",
+        "＊임기응변이 뛰어나고 호탕하다.",
+        "＊어떤 권위나 강압에 굴하지 않는다.",
+    ],
+    "ESTJ": [
+        "＊모범적이고 솔선수범한다.",
+        "＊정리정돈을 잘하고 책임감이 강하다.",
+        "＊웃어른을 공경하고 예의가 바르다.",
+        "＊합리적으로 생각하고 공정한 것을 선호한다.",
+        "＊경쟁에서는 이겨야 한다.",
+        "＊친구나 주변 사람을 배려하는 리더 타입이다.",
+        "＊질서와 사회적인 관습을 중시한다.",
+        "＊여러 친구들과 두루 잘 지낸다.",
+        "＊친절하다. 중재·타협·분배를 잘한다.",
+        "＊불평이 없다. 활발하다.",
+    ],
+    "INFJ": [
+        "＊조용하고 침착하고 책임감이 강하다.",
+        "＊내면적인 욕심이 많고 잔걱정이 많다.",
+        "＊또래에 비해 성숙한 사고력을 지닌다.",
+        "＊민감하고 복잡한 정서를 가지고 비유를 잘한다.",
+        "＊교사의 의도를 잘 알아챈다.",
+        "＊개인적인 칭찬을 해주면 크게 향상된다.",
+        "＊시끄럽고 복잡한 것, 나서기를 싫어한다.",
+        "＊학급일에 적극적으로 임하지 않는다.",
+        "＊완벽성을 추구하고 소외받는 아동에 관심이 많다.",
+        "＊좋아하는 것과 좋아하지 않는 것 차이가 심하다. 교사와의 관계가 좋으면 열심히 공부한다.",
+    ],
+    "INFP": [
+        "＊조용하고 말이 없으나 마음이 깊고 따뜻하다.",
+        "＊친구나 주변 상황에 민감하고 영향을 많이 받는다.",
+        "＊민감한 정서세계, 동정심이 많다. 사려 깊다.",
+        "＊약간 느리며 꾸준하지 못하다.",
+        "＊실천력이 부족하다. 낮잠을 좋아한다.",
+        "＊좋아하는 것과 그렇지 않은 것 사이에 차이가 많이 난다.",
+        "＊온화하고 부드럽다. 자신의 가치를 중시한다.",
+        "＊학교 생활 패턴에 따라가지 못한다.",
+        "＊상징에 대한 해석이 뛰어나다.",
+        "＊교사 입장: 기다림이 필요한 아이다.",
+    ],
+    "ENFP": [
+        "＊순진하고 순수하다.",
+        "＊변덕쟁이, 기발하다.",
+        "＊분위기만 맞으면 과잉행동을 한다.",
+        "＊좋아하는 것과 그렇지 않은 것 사이에 집중력의 차이가 난다.",
+        "＊딴 생각을 잘한다.",
+        "＊칭찬에 민감하다.",
+        "＊용돈이 헤프다.",
+        "＊사람을 좋아한다.",
+        "＊반복 훈련·연습을 싫어한다.",
+        "＊정리정돈이 안 된다.",
+    ],
+    "ENFJ": [
+        "＊온순하고 착하다.",
+        "＊책임감이 강하고 신뢰감을 준다.",
+        "＊주변 상황에 영향을 많이 받는다.",
+        "＊정리정돈을 잘한다.",
+        "＊딴 세계에 빠져 있을 때가 종종 있다.",
+        "＊예능적인 분야를 좋아한다.",
+        "＊특정 분야는 지나칠 정도로 진지하다.",
+        "＊참을성이 많다.",
+        "＊친구들과 잘 어울린다.",
+        "＊뜻밖의 행동으로 주변을 놀라게 한다.",
+        "＊터질 것 같은 화산을 마음에 품고 사는 아이.",
+    ],
+    "ISFJ": [
+        "＊온순하다. 성실하고 책임감이 강하다.",
+        "＊말을 참고 삭이는 경우가 많다.",
+        "＊봉사적이며 착하다.",
+        "＊소수와 깊게 사귀고 친한 친구와 논다.",
+        "＊인내심이 있으며 꾸준하다.",
+        "＊준비물을 잘 챙긴다. 깔끔 단정하다.",
+        "＊규칙을 준수하며 계획적이다.",
+        "＊행동력이 부족하다.",
+        "＊신뢰감이 간다.",
+        "＊변화를 싫어한다.",
+        "＊다른 사람에게 도움이 되고자 하는 욕구가 크다.",
+    ],
+    "ISFP": [
+        "＊마음이 너그럽고 순하다.",
+        "＊낙천적이고 천하태평, 행동이 느리다.",
+        "＊놀 줄 알며 무대 체질이고 예술적 매체를 통해 자신을 드러내는 것을 좋아한다.",
+        "＊성급한 결론을 잘 내린다.",
+        "＊끈기가 부족하다.",
+        "＊부끄럼을 많이 타고 외모에 관심이 많다.",
+        "＊동식물 사육이나 재배를 좋아한다.",
+        "＊권위적인 분위기에서는 눈치를 살핀다.",
+        "＊잔잔하게 산만한 편이다.",
+        "＊주변의 요구를 뿌리치지 못한다.",
+    ],
+    "ESFP": [
+        "＊활발하다. 천방지축이고 과잉행동을 하며 먹는 것을 좋아하고 감정적이다.",
+        "＊표정이 밝다. 목소리가 크고 말이 많다.",
+        "＊언제나 놀고 싶다. 단순하고 솔직하다.",
+        "＊장난이 심하고 붙임성이 있다.",
+        "＊지적을 많이 받아 자신을 착하다고 생각하지 않는다.",
+        "＊뭐든지 급하게 해치운다.",
+        "＊적응력이 뛰어나다. (학원을 빼먹진 않음).",
+        "＊진지함이 부족하다. 실전에 불안해한다.",
+        "＊group study가 효과적이며 선의의 경쟁을 좋아한다.",
+        "＊인정받고 싶은 욕구가 강하다.",
+    ],
+    "ESFJ": [
+        "＊명랑쾌활하고 감정이 풍부하다. 활력소 같은 아이.",
+        "＊타인의 무관심에 쉽게 좌절한다.",
+        "＊남 앞에 나서기를 좋아한다.",
+        "＊교실을 꾸미는 일을 잘한다.",
+        "＊미리 걱정하는 경향이 있다.",
+        "＊왕성한 발표력, 언어 계열을 선호한다.",
+        "＊표현력과 리더십이 뛰어나다.",
+        "＊일기를 잘 쓰고 운동을 좋아한다.",
+        "＊이야기 중심의 소설류를 많이 읽는다.",
+        "＊분명한 과제와 자세한 설명을 좋아한다.",
+        "＊말이 많다.",
+    ],
+    "INTJ": [
+        "＊“애늙은이” 같고 소수와 깊게 사귄다.",
+        "＊외모에 무관심하며 독립적·독창적이고 효율성을 강조한다.",
+        "＊고집이 아주 세고 대단히 강하다.",
+        "＊충분한 시간을 주는 것이 필요한 타입이다.",
+        "＊이유가 타당하지 않으면 끝까지 승복하지 않는다. 모든 일에 이유가 많다.",
+        "＊이론적으로, 논리적으로 따진다.",
+        "＊감정 표현은 없으나 상처를 쉽게 받는다.",
+        "＊칭찬이나 벌에 무관심하지만 실제로는 많은 칭찬이 필요하다.",
+        "＊승부욕이 강하고 이길 때까지 한다.",
+        "＊사소한 옷, 먹는 이야기만 하면 속상해한다.",
+    ],
+    "INTP": [
+        "＊만물박사 타입으로 논리적이고 호기심이 많다.",
+        "＊주관이 강하고 고집이 세며 솔직하다.",
+        "＊자기중심적이고 간섭이나 잔소리를 싫어한다.",
+        "＊주변 상황에 별로 영향을 받지 않는다.",
+        "＊정리정돈을 잘 하지 못하고 감정이 단순하다.",
+        "＊잘못된 일은 꼭 지적한다. 학급에서 외톨이가 되기도 한다.",
+        "＊과학 영역에 관심이 많고 운동을 싫어한다.",
+        "＊잘난 척하는 경향이 있다.",
+        "＊못하는 친구를 무시하는 경향이 있다.",
+        "＊관심이 없는 영역은 하지 않는다.",
+        "＊앎을 나누지 못하는 고독을 느끼며, 교사의 믿음이 중요하다.",
+    ],
+    "ENTP": [
+        "＊활발하며 독창적이다.",
+        "＊상상력과 표현력이 뛰어나다.",
+        "＊친구들과 잘 어울린다.",
+        "＊게으르고 정리정돈이 안 된다.",
+        "＊개인주의적 경향이 있고 고집이 강하다.",
+        "＊다방면에 관심을 가지고 있는 분야가 많다.",
+        "＊반복 설명을 싫어하고 자기 논리에 빠지기 쉽다.",
+        "＊쉽게 포기하는 편이고 마무리가 약하다.",
+        "＊친구를 리드하려고 한다.",
+        "＊교사의 권위를 잘 인정하지 못한다.",
+        "＊교사가 자기를 인정해 주는 것을 좋아한다.",
+    ],
+    "ENTJ": [
+        "＊원리원칙주의자로 자기 주관이 강하다.",
+        "＊활발하다.",
+        "＊논리적인 언어 표현을 잘한다.",
+        "＊고집이 강하다.",
+        "＊간섭을 싫어한다.",
+        "＊잘못된 것, 부당한 것은 꼭 바로잡고 넘어간다.",
+        "＊철저한 준비 자세를 갖추고 있다.",
+        "＊통솔력이 있다.",
+        "＊계획하고 마음먹은 것은 해낸다.",
+        "＊교사가 인정해주는 것이 필요하다.",
+    ],
+}
+
+
+# =========================================
+# 2) 진로 추천
+#  - 추천 표(CSV)에서 읽는다. (recommendations.py 참고)
+#      MBTI_RECOMMENDATIONS_TABLE: 표 경로 (기본 recommendations.csv)
+#      MBTI_RECOMMENDATIONS_RELOAD_INTERVAL: 표 변경 확인 주기(초, 기본 5)
+#  - 표 파일이 없으면 아래 기본값을 쓴다.
+#  - 추천이 없는 유형은 점수가 가장 가까운 유형의 추천을 보여 준다.
+# =========================================
+MBTI_RECOMMENDATIONS: Dict[str, Dict[str, List[str]]] = {
+    "INTJ": {
+        "majors": ["컴퓨터·소프트웨어공학", "데이터사이언스", "경영학", "정책학"],
+        "careers": ["전략기획자", "데이터 분석가", "경영 컨설턴트", "프로덕트 매니저"],
+    },
+    "INFP": {
+        "majors": ["심리학", "사회복지학", "국어국문·영문학", "콘텐츠·문화예술 관련 전공"],
+        "careers": ["상담·복지 분야", "작가·에디터", "콘텐츠 기획자", "교육 관련 직무"],
+    },
+}
+
+recommendation_source = RecommendationSource(
+    os.environ.get("MBTI_RECOMMENDATIONS_TABLE", "recommendations.csv"),
+    MBTI_RECOMMENDATIONS,
+    float(os.environ.get("MBTI_RECOMMENDATIONS_RELOAD_INTERVAL", "5")),
+)
+
+
+def get_recommendation(mbti_type: str, scores: Optional[Dict[str, int]] = None) -> Recommendation:
+    return recommendation_source.index().lookup(mbti_type, scores)
+
+
+def recommendations_for(mbti_type: str, scores: Optional[Dict[str, int]] = None) -> Dict[str, List[str]]:
+    # {"majors": [...], "careers": [...]} (결과 이미지용)
+    return get_recommendation(mbti_type, scores).as_dict()
+
+
+# =========================================
+# 3) MBTI 계산
+# =========================================
+def compute_mbti(
+    df_items: Union["pd.DataFrame", ItemBank],
+    answers: Dict[int, str],
+) -> Tuple[str, Dict[str, int]]:
+    # 배치 채점 엔진(scoring.py)의 1인용 래퍼. 동점이면 E/S/T/J (>=)
+    # 문항은 DataFrame(load_mbti) 또는 컴파일된 ItemBank 둘 다 받는다.
+    if isinstance(df_items, ItemBank):
+        index = item_index_from_bank(df_items)
+    else:
+        index = item_index_from_frame(df_items)
+    return score_answers(index, answers)
+
+
+# =========================================
+# 4) 축별 자연어 설명
+# =========================================
+def build_dimension_explanation(scores: Dict[str, int]) -> List[str]:
+    lines: List[str] = []
+
+    def one_pair(a_key, b_key, a_name, b_name, label):
+        a = scores[a_key]
+        b = scores[b_key]
+        diff = a - b
+        if diff > 0:
+            lines.append(
+                f"- **{label}** : {a_name}({a}) 점수가 {b_name}({b})보다 {abs(diff)}점 높아 "
+                f"{a_name} 쪽 경향이 조금 더 강하게 나타납니다."
+            )
+        elif diff < 0:
+            lines.append(
+                f"- **{label}** : {b_name}({b}) 점수가 {a_name}({a})보다 {abs(diff)}점 높아 "
+                f"{b_name} 쪽 경향이 조금 더 강하게 나타납니다."
+            )
+        else:
+            lines.append(
+                f"- **{label}** : 두 성향의 점수가 같아, 상황에 따라 {a_name}·{b_name} 성향이 모두 나타날 수 있습니다."
+            )
+
+    one_pair("E", "I", "외향(E)", "내향(I)", "에너지 방향 (E / I)")
+    one_pair("S", "N", "감각(S)", "직관(N)", "정보 수용 방식 (S / N)")
+    one_pair("T", "F", "사고(T)", "감정(F)", "판단 기준 (T / F)")
+    one_pair("J", "P", "판단(J)", "인식(P)", "생활 방식 (J / P)")
+
+    return lines
+
+
+# =========================================
+# 5) 결과 화면 조각 (유형별로 미리 렌더링)
+#  - 점수와 상관없는 부분(상세 설명, 추천 전공·직업군)은
+#    (유형, 추천을 가져온 유형)마다 markdown 블록 하나로 한 번만 만든다.
+#  - 추천 표가 바뀌면 (색인이 바뀌면) 전부 다시 만든다.
+#  - 세션마다 새로 만드는 것은 축별 설명(build_dimension_explanation)뿐이다.
+# =========================================
+PROFILE_HEADING = "#### 성격·행동 특징 (검사지 기반 상세 설명)"
+
+
+@dataclass(frozen=True)
+class ResultFragments:
+    profile: Optional[str]  # 제목 + 상세 설명. 설명이 없으면 None
+    majors: str
+    careers: str
+
+
+def _bullet_block(title: str, items: Sequence[str], empty: str) -> str:
+    if not items:
+        return f"{title}\n\n{empty}"
+    return f"{title}\n\n" + "\n".join(f"- {item}" for item in items)
+
+
+def build_result_fragments(mbti_type: str, rec: Optional[Recommendation] = None) -> ResultFragments:
+    bullets = MBTI_PROFILES.get(mbti_type, [])
+    rec = rec or get_recommendation(mbti_type)
+    majors_title = "#### 추천 전공 예시"
+    if not rec.exact and (rec.majors or rec.careers):
+        majors_title += (
+            f"\n\n_{mbti_type} 유형의 추천 정보가 아직 없어, "
+            f"점수가 가장 가까운 {rec.source_type} 유형의 추천을 보여 드립니다._"
+        )
+    return ResultFragments(
+        profile=_bullet_block(PROFILE_HEADING, bullets, "") if bullets else None,
+        majors=_bullet_block(majors_title, rec.majors, "전공 추천 정보가 준비 중입니다."),
+        careers=_bullet_block("#### 추천 직업군 예시", rec.careers, "직업군 추천 정보가 준비 중입니다."),
+    )
+
+
+# (유형, 추천을 가져온 유형) -> 조각. 이 색인으로 만든 것만 담는다.
+RESULT_FRAGMENTS: Dict[Tuple[str, str], ResultFragments] = {}
+_fragments_index: Optional[RecommendationIndex] = None
+_fragments_lock = threading.Lock()
+
+
+def get_result_fragments(mbti_type: str, scores: Optional[Dict[str, int]] = None) -> ResultFragments:
+    global _fragments_index
+    index = recommendation_source.index()
+    if index is not _fragments_index:
+        with _fragments_lock:
+            if index is not _fragments_index:
+                RESULT_FRAGMENTS.clear()
+                for t in ALL_TYPES:
+                    rec = index.lookup(t)
+                    RESULT_FRAGMENTS[(t, rec.source_type)] = build_result_fragments(t, rec)
+                _fragments_index = index
+
+    rec = index.lookup(mbti_type, scores)
+    fragments = RESULT_FRAGMENTS.get((mbti_type, rec.source_type))
+    if fragments is None:
+        fragments = build_result_fragments(mbti_type, rec)
+        if mbti_type in ALL_TYPES:
+            with _fragments_lock:
+                if _fragments_index is index:
+                    RESULT_FRAGMENTS[(mbti_type, rec.source_type)] = fragments
+    return fragments
+
+
+def render_dimension_markdown(scores: Dict[str, int]) -> str:
+    # 세션마다 달라지는 유일한 부분: 제목 + 축별 설명을 한 블록으로
+    return "#### 검사 결과 해석\n\n" + "\n".join(build_dimension_explanation(scores))
+
+
+# =========================================
+# 6) CLI
+# =========================================
+def explain_answers(bank: ItemBank, choices: str) -> List[str]:
+    # choices: 문항 순서대로 A/B (무응답은 '-' 또는 '.')
+    choices = "".join(choices.split()).upper()
+    if len(choices) != len(bank):
+        raise ValueError(f"응답 {len(choices)}개를 받았지만 문항은 {len(bank)}개입니다.")
+
+    answers: Dict[int, str] = {}
+    for qid, a_code, b_code, c in zip(bank.ids, bank.a_codes, bank.b_codes, choices):
+        if c == "A":
+            answers[qid] = a_code
+        elif c == "B":
+            answers[qid] = b_code
+        elif c not in "-.":
+            raise ValueError(f"{qid}번 문항: 알 수 없는 응답 '{c}' (A/B/- 만 가능)")
+
+    mbti_type, scores = compute_mbti(bank, answers)
+    lines = [f"MBTI 유형: {mbti_type}", ""]
+    lines += build_dimension_explanation(scores)
+    lines += ["", "성격·행동 특징"]
+    lines += [f"- {b}" for b in MBTI_PROFILES.get(mbti_type, [])]
+    rec = get_recommendation(mbti_type, scores)
+    if not rec.exact and (rec.majors or rec.careers):
+        lines += ["", f"({mbti_type} 추천 정보가 없어 가장 가까운 {rec.source_type} 유형의 추천입니다)"]
+    lines += ["", "추천 전공: " + (", ".join(rec.majors) or "준비 중")]
+    lines += ["추천 직업군: " + (", ".join(rec.careers) or "준비 중")]
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] == "score":
+        # 일괄 채점은 bulk_score 의 CLI를 그대로 쓴다.
+        import bulk_score
+
+        return bulk_score.main(argv[1:])
+
+    parser = argparse.ArgumentParser(prog="python -m mbti_core", description="MBTI 채점 CLI")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("score", help="답안 CSV 일괄 채점 (python -m bulk_score 와 같음)")
+    p_explain = sub.add_parser("explain", help="한 학생의 응답을 채점하고 해석을 출력")
+    p_explain.add_argument("choices", help="문항 순서대로 A/B 문자열 (무응답은 -)")
+    p_explain.add_argument("--items", default="mbti.csv", help="문항 은행 CSV (기본: mbti.csv)")
+    args = parser.parse_args(argv)
+
+    try:
+        lines = explain_answers(load_item_bank(args.items), args.choices)
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    print("\n".join(lines))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# =========================================
+# rerun 단계별 시간 측정 & 지표 내보내기
+#  - 카운터 / 히스토그램을 프로세스 전체에서 모은다. (모든 세션 공유)
+#  - Prometheus 텍스트 파일 또는 JSON 로그로 주기적으로 내보낸다.
+#  - 기록 비용은 perf_counter 두 번 + 잠금 한 번 정도라 운영에서 켜 둬도 된다.
+# =========================================
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+COUNT_BUCKETS = (1, 5, 10, 20, 30, 40, 50, 75, 100, 200)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "mbti"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Callable[[], Dict[str, float]]] = []
+
+    def describe(self, name: str, text: str, buckets: Optional[Sequence[float]] = None) -> None:
+        self._help[name] = text
+        if buckets is not None:
+            self._buckets[name] = buckets
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+            hist.observe(value)
+
+    def add_collector(self, fn: Callable[[], Dict[str, float]]) -> None:
+        # 내보낼 때마다 호출해 값을 읽어 오는 카운터 (예: 결과 이미지 캐시 hit 수)
+        self._collectors.append(fn)
+
+    # -----------------------------
+    # 내보내기
+    # -----------------------------
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [
+                    {
+                        "labels": dict(k),
+                        "buckets": list(h.buckets),
+                        "counts": list(h.counts),
+                        "sum": h.sum,
+                        "count": h.count,
+                    }
+                    for k, h in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+        for fn in self._collectors:
+            for name, value in fn().items():
+                counters[name] = [{"labels": {}, "value": value}]
+        return {"time": time.time(), "counters": counters, "histograms": histograms}
+
+    def render_prometheus(self) -> str:
+        snap = self.snapshot()
+        lines: List[str] = []
+
+        def fmt_labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+            items = list(labels.items()) + ([extra] if extra else [])
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+        for name, series in sorted(snap["counters"].items()):
+            full = f"{self.prefix}_{name}"
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} counter")
+            for s in series:
+                lines.append(f"{full}{fmt_labels(s['labels'])} {s['value']}")
+
+        for name, series in sorted(snap["histograms"].items()):
+            full = f"{self.prefix}_{name}"
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} histogram")
+            for s in series:
+                cumulative = 0
+                for bound, n in zip(list(s["buckets"]) + ["+Inf"], s["counts"]):
+                    cumulative += n
+                    lines.append(f"{full}_bucket{fmt_labels(s['labels'], ('le', str(bound)))} {cumulative}")
+                lines.append(f"{full}_sum{fmt_labels(s['labels'])} {s['sum']}")
+                lines.append(f"{full}_count{fmt_labels(s['labels'])} {s['count']}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.describe("reruns_total", "Streamlit 스크립트 rerun 수")
+registry.describe("tests_completed_total", "완료된 검사 수")
+registry.describe("rerun_seconds", "rerun 한 번의 전체 시간(초)")
+registry.describe("phase_seconds", "rerun 단계별 시간(초)")
+registry.describe("reruns_per_test", "검사 하나를 끝내기까지의 rerun 수", buckets=COUNT_BUCKETS)
+registry.describe("figure_renders_total", "결과 이미지를 새로 그린 수")
+registry.describe("figure_cache_hits_total", "결과 이미지 캐시 적중 수")
+
+
+# =========================================
+# rerun 단위 타이머
+#  - mark("단계") 를 부를 때마다 직전 mark 이후 시간을 그 단계로 기록한다.
+#  - st.rerun() / st.stop() 전과 스크립트 끝에서 finish() 를 부른다.
+# =========================================
+class RerunTimer:
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
+        self.metrics = metrics or registry
+        self.started = self._last = time.perf_counter()
+        self.finished = False
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.metrics.observe("phase_seconds", now - self._last, phase=phase)
+        self._last = now
+
+    def finish(self) -> None:
+        if self.finished:
+            return
+        self.finished = True
+        self.metrics.observe("rerun_seconds", time.perf_counter() - self.started)
+        self.metrics.inc("reruns_total")
+
+
+# =========================================
+# 주기적 내보내기 (파일)
+#  - prometheus_path: node_exporter textfile collector 형식 (.prom)
+#  - json_path: 한 줄에 스냅숏 하나씩 덧붙이는 JSON 로그
+# =========================================
+def write_prometheus_file(path: str, metrics: Optional[MetricsRegistry] = None) -> None:
+    metrics = metrics or registry
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(metrics.render_prometheus())
+    os.replace(tmp, path)
+
+
+def append_json_log(path: str, metrics: Optional[MetricsRegistry] = None) -> None:
+    metrics = metrics or registry
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(metrics.snapshot(), ensure_ascii=False) + "\n")
+
+
+def start_exporter(
+    prometheus_path: Optional[str] = None,
+    json_path: Optional[str] = None,
+    interval: float = 15.0,
+    metrics: Optional[MetricsRegistry] = None,
+) -> threading.Thread:
+    def loop() -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                if prometheus_path:
+                    write_prometheus_file(prometheus_path, metrics)
+                if json_path:
+                    append_json_log(json_path, metrics)
+            except OSError:
+                pass  # 다음 주기에 다시 시도한다.
+
+    thread = threading.Thread(target=loop, name="metrics-exporter", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,368 @@
+import atexit
+import itertools
+import math
+import random
+import sqlite3
+import struct
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from aggregates import ALL_COHORTS, DistributionAggregator
+from scoring import AXIS_PAIRS
+
+
+# =========================================
+# 축별 백분위 규준 (스트리밍 분위수 스케치, KLL)
+#  - 축마다 앞 글자 비율 p = 앞 / (앞 + 뒤) 를 cohort 경로별 스케치에 더한다.
+#    (적응형 검사처럼 답한 문항 수가 달라도 비교할 수 있게 비율로)
+#    cohort 경로는 유형 분포 집계와 같다. ("*", "A고", "A고/2학년", …)
+#  - 스케치 크기는 k 에 비례하고 결과 수와는 무관하다. 서로 합칠 수 있다.
+#    순위 오차는 대략 ±1.7/k (k=200 이면 ±1%p 안팎)
+#  - 백분위는 중간 순위(mid-rank)로 계산한다. 점수가 같은 학생은 절반만 아래로 센다.
+#  - 조회는 정렬해 둔 누적 가중치에서 이분 탐색만 한다. (수 µs)
+# =========================================
+DEFAULT_K = 200
+
+
+def _f32(value: float) -> float:
+    # 저장 형식(float32)과 같은 값으로 맞춘다. (동점 판정이 저장 전후로 같게)
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+
+class KLLSketch:
+    __slots__ = ("k", "n", "levels", "_rng", "_view")
+
+    _HEADER = struct.Struct("<BHQB")  # 형식, k, n, 단계 수
+    FORMAT = 1
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.levels: List[List[float]] = [[]]  # 단계 h 의 값 하나는 2^h 명을 대신한다.
+        self._rng = random.Random()
+        self._view: Optional[Tuple[List[float], List[int]]] = None
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        # 넘친 단계는 정렬한 뒤 하나 걸러 하나(시작 위치는 무작위)만 위 단계로 올린다.
+        # 홀수 개면 하나를 남겨서 전체 가중치(= n)가 정확히 유지된다.
+        # 남기는 것은 가장 작은 것 또는 가장 큰 것 중 무작위로 고른다. (한쪽만 남기면 그쪽 분위수가 치우친다)
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                items.sort()
+                keep = [items.pop(-self._rng.getrandbits(1))] if len(items) % 2 else []
+                self.levels[level + 1].extend(items[self._rng.getrandbits(1)::2])
+                self.levels[level] = keep
+            level += 1
+
+    def update(self, value: float) -> None:
+        self.levels[0].append(_f32(value))
+        self.n += 1
+        self._view = None
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.n += other.n
+        self._view = None
+        self._compress()
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def _sorted_view(self) -> Tuple[List[float], List[int]]:
+        view = self._view
+        if view is None:
+            pairs = sorted((v, 1 << h) for h, items in enumerate(self.levels) for v in items)
+            view = self._view = ([v for v, _ in pairs], list(itertools.accumulate(w for _, w in pairs)))
+        return view
+
+    def rank(self, value: float) -> Optional[float]:
+        # 중간 순위 (0 … 1). 비어 있으면 None
+        if self.n == 0:
+            return None
+        values, cumulative = self._sorted_view()
+        value = _f32(value)
+        lo, hi = bisect_left(values, value), bisect_right(values, value)
+        below = cumulative[lo - 1] if lo else 0
+        upto = cumulative[hi - 1] if hi else 0
+        return (below + upto) / 2 / cumulative[-1]
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.n == 0:
+            return None
+        values, cumulative = self._sorted_view()
+        idx = bisect_left(cumulative, q * cumulative[-1])
+        return values[min(idx, len(values) - 1)]
+
+    # -----------------------------
+    # 저장 형식: [형식 1B][k 2B][n 8B][단계 수 1B] + 단계마다 [개수 4B][float32 …]
+    # -----------------------------
+    def to_bytes(self) -> bytes:
+        parts = [self._HEADER.pack(self.FORMAT, self.k, self.n, len(self.levels))]
+        for items in self.levels:
+            parts.append(struct.pack(f"<I{len(items)}f", len(items), *items))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "KLLSketch":
+        fmt, k, n, n_levels = cls._HEADER.unpack_from(data)
+        if fmt != cls.FORMAT:
+            raise ValueError(f"알 수 없는 스케치 형식입니다: {fmt}")
+        sketch = cls(k)
+        sketch.n = n
+        sketch.levels = []
+        offset = cls._HEADER.size
+        for _ in range(n_levels):
+            (count,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            sketch.levels.append(list(struct.unpack_from(f"<{count}f", data, offset)))
+            offset += 4 * count
+        return sketch
+
+
+def axis_values(scores: Dict[str, int]) -> List[Optional[float]]:
+    # 축별 앞 글자 비율 (그 축에 답한 문항이 없으면 None)
+    values: List[Optional[float]] = []
+    for a, b in AXIS_PAIRS:
+        total = scores.get(a, 0) + scores.get(b, 0)
+        values.append(scores.get(a, 0) / total if total else None)
+    return values
+
+
+@dataclass(frozen=True)
+class NormPercentiles:
+    cohort: str                          # 비교한 집단 (cohort 경로, 전체는 "*")
+    count: int                           # 그 집단의 결과 수
+    front: Tuple[Optional[float], ...]  # 축별 앞 글자(E/S/T/J) 쪽 백분위 (0 … 100)
+
+    def for_letters(self, mbti_type: str) -> Dict[str, Optional[float]]:
+        # 학생의 유형 글자 쪽 백분위 (뒷 글자면 100 - 앞 글자 백분위)
+        result: Dict[str, Optional[float]] = {}
+        for letter, (a, _), pct in zip(mbti_type, AXIS_PAIRS, self.front):
+            result[letter] = None if pct is None else (pct if letter == a else 100.0 - pct)
+        return result
+
+
+# =========================================
+# 저장 & 워커 간 공유 (결과 DB 의 norm_sketches 표)
+#  - 워커는 자기가 더한 몫(delta)만 모아 두었다가 sync() 때 새 줄로 쓴다.
+#  - sync() 는 쓰기 잠금 안에서 (cohort, 축)별 줄을 모두 합쳐 한 줄로 줄이고,
+#    그것을 새 기준으로 삼는다. 그 뒤에 들어온 자기 몫만 위에 더한다.
+#    (같은 결과를 두 번 세지 않는다)
+#  - 처음 한 번만, 이미 저장된 결과로 채운다. (backfill)
+#    채우기와 첫 sync 는 prepare() 에서 한다. 만들기만 해서는 DB 를 읽지 않으므로
+#    앱은 시작 준비 때 start_sync_thread() 로 백그라운드에서 부른다. (그 전까지 백분위는 None)
+# =========================================
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS norm_sketches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cohort TEXT NOT NULL,
+    axis TEXT NOT NULL,
+    sketch BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_norm_sketches_key ON norm_sketches (cohort, axis);
+CREATE TABLE IF NOT EXISTS norm_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+AXIS_NAMES = tuple(a + b for a, b in AXIS_PAIRS)
+
+Summaries = Iterable[Tuple[float, Optional[str], str, Dict[str, int]]]
+CohortSketches = Dict[str, List[KLLSketch]]  # cohort 경로 -> 축별 스케치
+
+
+class NormStore:
+    def __init__(
+        self,
+        path: str = "mbti_results.db",
+        k: int = DEFAULT_K,
+        backfill: Optional[Callable[[], Summaries]] = None,
+    ):
+        self.path = path
+        self.k = k
+        self.last_error: Optional[str] = None
+        self._live: CohortSketches = {}     # 조회용 (기준 + 이후 자기 몫)
+        self._pending: CohortSketches = {}  # 아직 저장하지 않은 자기 몫
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._backfill_source = backfill  # prepare() 에서 한 번 채운 뒤 None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        atexit.register(self.sync)  # 종료할 때 남은 몫을 쓴다.
+
+    def _empty(self) -> List[KLLSketch]:
+        return [KLLSketch(self.k) for _ in AXIS_PAIRS]
+
+    def _add(self, target: CohortSketches, scores: Dict[str, int], cohort: Optional[str]) -> None:
+        values = axis_values(scores)
+        for path in DistributionAggregator.cohort_paths(cohort):
+            sketches = target.get(path)
+            if sketches is None:
+                sketches = target[path] = self._empty()
+            for sketch, value in zip(sketches, values):
+                if value is not None:
+                    sketch.update(value)
+
+    def record(self, scores: Dict[str, int], cohort: Optional[str] = None) -> None:
+        with self._lock:
+            self._add(self._live, scores, cohort)
+            self._add(self._pending, scores, cohort)
+
+    # -----------------------------
+    # 저장 · 합치기
+    # -----------------------------
+    def _write(self, sketches: CohortSketches) -> None:
+        self._conn.executemany(
+            "INSERT INTO norm_sketches (cohort, axis, sketch) VALUES (?, ?, ?)",
+            [
+                (cohort, axis, sketch.to_bytes())
+                for cohort, per_axis in sketches.items()
+                for axis, sketch in zip(AXIS_NAMES, per_axis)
+                if sketch.n
+            ],
+        )
+
+    def _backfill(self, summaries: Callable[[], Summaries]) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            done = self._conn.execute("SELECT value FROM norm_meta WHERE key = 'backfilled'").fetchone()
+            if done is None:
+                sketches: CohortSketches = {}
+                for _, cohort, _, scores in summaries():
+                    self._add(sketches, scores, cohort)
+                self._write(sketches)
+                self._conn.execute("INSERT INTO norm_meta (key, value) VALUES ('backfilled', '1')")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def prepare(self) -> None:
+        # 처음에는 채우기(backfill)까지, 그 뒤로는 sync 만 한다.
+        if self._backfill_source is not None:
+            self._backfill(self._backfill_source)
+            self._backfill_source = None
+        self.sync()
+
+    def sync(self) -> None:
+        with self._sync_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            try:
+                base = self._write_and_compact(pending)
+            except sqlite3.Error as e:
+                # 다음 주기에 다시 쓴다.
+                self.last_error = str(e)
+                with self._lock:
+                    for cohort, per_axis in pending.items():
+                        target = self._pending.setdefault(cohort, self._empty())
+                        for sketch, other in zip(target, per_axis):
+                            sketch.merge(other)
+                return
+            self.last_error = None
+
+            with self._lock:
+                # sync 하는 동안 들어온 자기 몫을 새 기준 위에 더한다.
+                for cohort, per_axis in self._pending.items():
+                    target = base.setdefault(cohort, self._empty())
+                    for sketch, other in zip(target, per_axis):
+                        sketch.merge(other)
+                self._live = base
+
+    def _write_and_compact(self, pending: CohortSketches) -> CohortSketches:
+        base: CohortSketches = {}
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write(pending)
+            rows: Dict[Tuple[str, str], List[Tuple[int, bytes]]] = {}
+            for row_id, cohort, axis, blob in self._conn.execute(
+                "SELECT id, cohort, axis, sketch FROM norm_sketches ORDER BY id"
+            ):
+                rows.setdefault((cohort, axis), []).append((row_id, blob))
+
+            for (cohort, axis), entries in rows.items():
+                if axis not in AXIS_NAMES:
+                    continue
+                merged = KLLSketch.from_bytes(entries[0][1])
+                for _, blob in entries[1:]:
+                    merged.merge(KLLSketch.from_bytes(blob))
+                base.setdefault(cohort, self._empty())[AXIS_NAMES.index(axis)] = merged
+                if len(entries) > 1:
+                    self._conn.executemany(
+                        "DELETE FROM norm_sketches WHERE id = ?", [(row_id,) for row_id, _ in entries]
+                    )
+                    self._conn.execute(
+                        "INSERT INTO norm_sketches (cohort, axis, sketch) VALUES (?, ?, ?)",
+                        (cohort, axis, merged.to_bytes()),
+                    )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return base
+
+    def start_sync_thread(self, interval: float = 30.0) -> threading.Thread:
+        if self._thread is not None:
+            return self._thread
+
+        def loop() -> None:
+            event = threading.Event()
+            wait = 0.0  # 처음에는 바로 채우고 읽는다.
+            while not event.wait(wait):
+                wait = interval
+                try:
+                    self.prepare()
+                except sqlite3.Error as e:
+                    self.last_error = str(e)  # 채우기는 다음 주기에 다시 시도한다.
+
+        self._thread = threading.Thread(target=loop, name="norm-sync", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def count(self, cohort: str = ALL_COHORTS) -> int:
+        with self._lock:
+            sketches = self._live.get(cohort)
+            return max((s.n for s in sketches), default=0) if sketches else 0
+
+    def percentiles(
+        self,
+        scores: Dict[str, int],
+        cohort: Optional[str] = None,
+        min_count: int = 30,
+    ) -> Optional[NormPercentiles]:
+        # 가장 좁은 집단부터, 결과가 min_count 이상인 집단과 비교한다. (없으면 None)
+        values = axis_values(scores)
+        with self._lock:
+            for path in reversed(DistributionAggregator.cohort_paths(cohort)):
+                sketches = self._live.get(path)
+                count = max((s.n for s in sketches), default=0) if sketches else 0
+                if count < min_count:
+                    continue
+                front = []
+                for sketch, value in zip(sketches, values):
+                    rank = None if value is None else sketch.rank(value)
+                    front.append(None if rank is None else 100.0 * rank)
+                return NormPercentiles(path, count, tuple(front))
+        return None
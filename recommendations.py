@@ -0,0 +1,205 @@
+import csv
+import hashlib
+import io
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from scoring import ALL_TYPES, AXIS_PAIRS
+
+
+# =========================================
+# 진로 추천 표 (외부 CSV) -> 메모리 색인
+#  - 코드 배포 없이 표만 고쳐서 추천 전공·직업군을 바꾼다.
+#    필요한 컬럼: mbti_type, kind, name   (선택: weight, 기본 1)
+#      kind : major(전공) / career(직업)
+#      weight 가 큰 항목부터 보여 준다.
+#  - 추천이 없는 유형은 점수 벡터가 가장 가까운 "추천이 있는 유형"의 것을 쓴다.
+#      축별 경향 p = (앞 글자 - 뒷 글자) / 축 점수 합   (-1 … 1, 동점 0)
+#      유형의 기준 벡터는 앞 글자 +1, 뒷 글자 -1
+#      거리 = Σ(p - v)²   (같으면 ALL_TYPES 순서가 앞선 유형)
+#    점수 없이 유형만 물으면 유형 자체의 벡터로 고른다. (미리 계산해 둔다)
+#  - 조회: 추천이 있는 유형은 dict 한 번, 없는 유형도 후보(최대 16개)만 비교한다.
+#  - 표 파일이 바뀌었을 때만 색인을 다시 만든다. (RecommendationSource)
+# =========================================
+KINDS = {"major": "majors", "전공": "majors", "career": "careers", "직업": "careers"}
+REQUIRED_COLUMNS = ("mbti_type", "kind", "name")
+
+RecommendationTable = Dict[str, Dict[str, List[str]]]  # 유형 -> {"majors": [...], "careers": [...]}
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    mbti_type: str    # 물어본 유형
+    source_type: str  # 추천을 가져온 유형 (같으면 정확히 일치)
+    majors: Tuple[str, ...]
+    careers: Tuple[str, ...]
+
+    @property
+    def exact(self) -> bool:
+        return self.mbti_type == self.source_type
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        return {"majors": list(self.majors), "careers": list(self.careers)}
+
+
+def type_vector(mbti_type: str) -> Tuple[float, ...]:
+    return tuple(1.0 if letter == a else -1.0 for letter, (a, _) in zip(mbti_type, AXIS_PAIRS))
+
+
+def score_vector(scores: Dict[str, int]) -> Tuple[float, ...]:
+    vector = []
+    for a, b in AXIS_PAIRS:
+        total = scores.get(a, 0) + scores.get(b, 0)
+        vector.append((scores.get(a, 0) - scores.get(b, 0)) / total if total else 0.0)
+    return tuple(vector)
+
+
+# =========================================
+# 표 읽기
+# =========================================
+def _decode(raw: bytes) -> str:
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return raw.decode("cp949")
+
+
+def parse_recommendation_table(raw: bytes) -> RecommendationTable:
+    reader = csv.DictReader(io.StringIO(_decode(raw), newline=""))
+    header = [h.strip() for h in reader.fieldnames or []]
+    missing = [c for c in REQUIRED_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"추천 표에 다음 컬럼이 필요합니다: {missing}")
+    reader.fieldnames = header
+
+    weighted: Dict[str, Dict[str, List[Tuple[float, int, str]]]] = {}
+    for line_no, row in enumerate(reader, start=2):
+        mbti_type = (row.get("mbti_type") or "").strip().upper()
+        name = (row.get("name") or "").strip()
+        if not mbti_type and not name:
+            continue  # 빈 줄
+        if mbti_type not in ALL_TYPES:
+            raise ValueError(f"추천 표 {line_no}행: 알 수 없는 유형입니다: {mbti_type!r}")
+        kind = KINDS.get((row.get("kind") or "").strip().lower())
+        if kind is None:
+            raise ValueError(f"추천 표 {line_no}행: kind 는 major 또는 career 여야 합니다.")
+        try:
+            weight = float((row.get("weight") or "").strip() or 1)
+        except ValueError:
+            raise ValueError(f"추천 표 {line_no}행의 weight가 숫자가 아닙니다: {row.get('weight')!r}") from None
+        if name:
+            weighted.setdefault(mbti_type, {}).setdefault(kind, []).append((-weight, line_no, name))
+
+    # 가중치 큰 순, 같으면 표에 적힌 순서
+    return {
+        mbti_type: {kind: [name for _, _, name in sorted(items)] for kind, items in kinds.items()}
+        for mbti_type, kinds in weighted.items()
+    }
+
+
+# =========================================
+# 색인 (표 한 벌당 한 번 만든다)
+# =========================================
+class RecommendationIndex:
+    def __init__(self, table: RecommendationTable, version: str = ""):
+        self.version = version
+        self._exact: Dict[str, Recommendation] = {
+            t: Recommendation(t, t, tuple(rec.get("majors", [])), tuple(rec.get("careers", [])))
+            for t, rec in table.items()
+            if rec.get("majors") or rec.get("careers")
+        }
+        self._covered: List[Tuple[str, Tuple[float, ...]]] = [
+            (t, type_vector(t)) for t in ALL_TYPES if t in self._exact
+        ]
+        # 유형만으로 찾을 때의 답 (16개 전부)
+        self._by_type: Dict[str, Recommendation] = {
+            t: self._nearest(t, type_vector(t)) for t in ALL_TYPES
+        }
+
+    @property
+    def covered_types(self) -> List[str]:
+        return [t for t, _ in self._covered]
+
+    def _nearest(self, mbti_type: str, vector: Tuple[float, ...]) -> Recommendation:
+        exact = self._exact.get(mbti_type)
+        if exact is not None:
+            return exact
+        best: Optional[Recommendation] = None
+        best_distance = float("inf")
+        for source_type, v in self._covered:
+            distance = sum((p - q) ** 2 for p, q in zip(vector, v))
+            if distance < best_distance:
+                source = self._exact[source_type]
+                best = Recommendation(mbti_type, source_type, source.majors, source.careers)
+                best_distance = distance
+        return best if best is not None else Recommendation(mbti_type, mbti_type, (), ())
+
+    def lookup(self, mbti_type: str, scores: Optional[Dict[str, int]] = None) -> Recommendation:
+        if scores is None or mbti_type in self._exact:
+            found = self._by_type.get(mbti_type)
+            if found is not None:
+                return found
+        return self._nearest(mbti_type, score_vector(scores) if scores else type_vector(mbti_type))
+
+    def as_table(self) -> RecommendationTable:
+        # 유형만으로 찾은 16개 전부 (기존 MBTI_RECOMMENDATIONS 와 같은 모양)
+        return {t: rec.as_dict() for t, rec in self._by_type.items()}
+
+
+# =========================================
+# 표 파일 -> 색인 (바뀌었을 때만 다시 만든다)
+#  - 파일 상태(mtime, 크기)는 check_interval 초에 한 번만 확인한다.
+#  - 파일이 없으면 fallback 표(코드에 든 기본값)를 쓴다.
+#  - 고치는 중이라 읽지 못하면 지금 색인을 그대로 쓰고 last_error 에 남긴다.
+# =========================================
+class RecommendationSource:
+    def __init__(self, path: str, fallback: RecommendationTable, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.last_error: Optional[str] = None
+        self._fallback = RecommendationIndex(fallback, "builtin")
+        self._index = self._fallback
+        self._stat: Optional[Tuple[int, int]] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def index(self) -> RecommendationIndex:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            with self._lock:
+                if now - self._checked_at >= self.check_interval:
+                    self._checked_at = now
+                    self._refresh()
+        return self._index
+
+    def _refresh(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._stat, self._index = None, self._fallback
+            return
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat == self._stat:
+            return
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            table = parse_recommendation_table(raw)
+        except (OSError, ValueError) as e:
+            self.last_error = str(e)
+            return
+        self._stat = stat
+        self.last_error = None
+        self._index = RecommendationIndex(table, hashlib.sha256(raw).hexdigest()[:12])
+
+    def status(self) -> Dict[str, object]:
+        index = self.index()
+        return {
+            "path": self.path,
+            "version": index.version,
+            "covered_types": index.covered_types,
+            "last_error": self.last_error,
+        }
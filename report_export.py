@@ -0,0 +1,239 @@
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from bulk_score import RESULT_COLUMNS, detect_encoding
+from scoring import SCORE_KEYS
+
+
+# =========================================
+# 학생별 결과 이미지 일괄 생성 (ZIP)
+#  - 그림 그리기(matplotlib)는 CPU를 쓰고 GIL을 잡으므로 프로세스 풀로 나눈다.
+#  - 워커는 시작할 때 한 번 matplotlib·글꼴을 데워 두고,
+#    같은 유형·점수는 워커 안의 결과 이미지 캐시(figure_cache)에서 재사용한다.
+#  - 끝난 이미지부터 바로 ZIP에 쓴다. 메모리에는 작업 중인 몇 장만 둔다.
+#  - progress 콜백으로 진행 상황을, cancel 이벤트로 중지를 받는다.
+#  - 한 명의 이미지를 못 그려도 멈추지 않고, summary.csv 의 error 열에 남긴 뒤 계속한다.
+#
+#  입력: bulk_score 결과 CSV (mbti_type, E…P 열 + 학번·이름 등)
+#  python -m report_export results.csv -o reports.zip --label 학번 --label 이름
+# =========================================
+SUMMARY_NAME = "summary.csv"
+
+
+@dataclass(frozen=True)
+class ReportJob:
+    label: str
+    mbti_type: str
+    scores: Dict[str, int]
+
+
+@dataclass
+class ExportProgress:
+    total: int = 0
+    done: int = 0
+    failed: int = 0  # done 중 이미지를 못 만든 수
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 1.0
+
+
+ExportCallback = Callable[[ExportProgress], None]
+
+
+# -----------------------------
+# 입력 (채점 결과 CSV)
+# -----------------------------
+def read_report_jobs(stream: BinaryIO, label_columns: Sequence[str] = ()) -> List[ReportJob]:
+    # label_columns 를 비우면 채점 결과가 아닌 열(학번, 이름 …)을 모두 이름에 쓴다.
+    # 채점 오류가 있는 행은 건너뛴다.
+    encoding = detect_encoding(stream)
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        reader = csv.DictReader(text)
+        header = reader.fieldnames or []
+        missing = [c for c in ("mbti_type", *SCORE_KEYS) if c not in header]
+        if missing:
+            raise ValueError(f"채점 결과 CSV에 다음 열이 필요합니다: {missing}")
+        labels = list(label_columns) or [c for c in header if c not in RESULT_COLUMNS]
+
+        jobs = []
+        for line_no, row in enumerate(reader, start=2):
+            if not row.get("mbti_type") or row.get("error"):
+                continue
+            label = "_".join(str(row.get(c) or "").strip() for c in labels).strip("_")
+            jobs.append(
+                ReportJob(
+                    label=label or f"{line_no}행",
+                    mbti_type=row["mbti_type"].strip().upper(),
+                    scores={k: int(float(row[k] or 0)) for k in SCORE_KEYS},
+                )
+            )
+        return jobs
+    finally:
+        text.detach()
+
+
+def report_filename(index: int, job: ReportJob, extension: str) -> str:
+    safe = re.sub(r'[\\/:*?"<>|\s]+', "_", job.label).strip("_.")[:40]
+    return f"{index + 1:04d}_{safe}_{job.mbti_type}.{extension}" if safe else f"{index + 1:04d}_{job.mbti_type}.{extension}"
+
+
+# -----------------------------
+# 워커 (별도 프로세스)
+# -----------------------------
+def _init_worker(renderer: str) -> None:
+    # import, 글꼴 탐색, 첫 그림 비용을 워커마다 한 번만 치른다.
+    from result_figure import render_result_image
+
+    render_result_image("ESTJ", {k: 0 for k in SCORE_KEYS}, {}, renderer)
+
+
+def _render_job(index: int, job: ReportJob, renderer: str) -> Tuple[int, str, bytes]:
+    from mbti_core import recommendations_for
+    from result_figure import figure_cache
+
+    image = figure_cache.get_or_render(
+        job.mbti_type, job.scores, recommendations_for(job.mbti_type, job.scores), renderer
+    )
+    return index, report_filename(index, job, image.extension), image.data
+
+
+# -----------------------------
+# 내보내기
+# -----------------------------
+def export_reports(
+    jobs: Sequence[ReportJob],
+    output: Union[str, BinaryIO],
+    workers: Optional[int] = None,
+    renderer: str = "matplotlib",
+    progress: Optional[ExportCallback] = None,
+    cancel: Optional[threading.Event] = None,
+    max_in_flight: Optional[int] = None,
+) -> ExportProgress:
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    max_in_flight = max_in_flight or 2 * workers
+    state = ExportProgress(total=len(jobs))
+    started = time.perf_counter()
+    summary: List[Tuple[str, str, str, str]] = []  # (파일, 이름, 유형, 오류)
+
+    # fork 는 서버의 스레드(저장소 writer 등)까지 복제하므로 spawn 으로 띄운다.
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(renderer,),
+    )
+    # PNG는 이미 압축되어 있으므로 ZIP은 저장만 한다.
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as zf:
+        pending: Dict[Future, int] = {}  # 작업 -> jobs 위치
+        queued = iter(enumerate(jobs))
+        try:
+            while True:
+                while len(pending) < max_in_flight and not state.cancelled:
+                    nxt = next(queued, None)
+                    if nxt is None:
+                        break
+                    pending[pool.submit(_render_job, nxt[0], nxt[1], renderer)] = nxt[0]
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = pending.pop(future)
+                    job = jobs[index]
+                    try:
+                        _, name, data = future.result()
+                    except Exception as e:  # 워커 안의 오류, 워커 프로세스가 죽은 경우 포함
+                        summary.append(("", job.label, job.mbti_type, f"{type(e).__name__}: {e}"))
+                        state.failed += 1
+                    else:
+                        zf.writestr(name, data)
+                        summary.append((name, job.label, job.mbti_type, ""))
+                    state.done += 1
+
+                state.elapsed = time.perf_counter() - started
+                if cancel is not None and cancel.is_set():
+                    state.cancelled = True  # 새 작업은 넣지 않고, 그리는 중인 것만 마무리한다.
+                if progress is not None:
+                    progress(state)
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+            lines = io.StringIO()
+            writer = csv.writer(lines)
+            writer.writerow(["file", "label", "mbti_type", "error"])
+            writer.writerows(sorted(summary, key=lambda r: (r[0] == "", r[0], r[1])))
+            zf.writestr(SUMMARY_NAME, lines.getvalue().encode("utf-8-sig"))
+
+    state.elapsed = time.perf_counter() - started
+    return state
+
+
+# =========================================
+# CLI
+#  python -m report_export results.csv -o reports.zip
+# =========================================
+def _print_progress(state: ExportProgress) -> None:
+    print(
+        f"\r{state.fraction * 100:5.1f}%  {state.done:,}/{state.total:,}장  {state.elapsed:.1f}s",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="채점 결과 CSV로 학생별 결과 이미지 ZIP 만들기")
+    parser.add_argument("results", help="bulk_score 결과 CSV 경로")
+    parser.add_argument("-o", "--output", required=True, help="ZIP 파일 경로")
+    parser.add_argument("--label", action="append", default=[], help="파일 이름에 쓸 열 (여러 번 지정 가능)")
+    parser.add_argument("--workers", type=int, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--renderer", choices=["matplotlib", "svg", "svg-png"], default="matplotlib")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황을 출력하지 않음")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.results, "rb") as f:
+            jobs = read_report_jobs(f, args.label)
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        state = export_reports(
+            jobs,
+            args.output,
+            workers=args.workers,
+            renderer=args.renderer,
+            progress=None if args.quiet else _print_progress,
+        )
+    except KeyboardInterrupt:
+        print("\n중지했습니다. (그때까지 만든 이미지는 ZIP에 남아 있습니다)", file=sys.stderr)
+        return 130
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"완료: {state.done:,}/{state.total:,}장, {state.elapsed:.1f}s -> {args.output}")
+    if state.failed:
+        print(f"실패: {state.failed:,}장 (ZIP 안의 {SUMMARY_NAME} 의 error 열 참고)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+import hashlib
+import io
+import itertools
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from result_svg import render_result_svg, svg_to_png
+from scoring import AXIS_PAIRS, SCORE_KEYS, mbti_type_from_scores
+
+
+# =========================================
+# 결과 요약 PNG 생성 (matplotlib)
+#  - matplotlib은 실제로 그림이 필요할 때만 import 한다.
+#  - pyplot(전역 상태)은 쓰지 않는다. 세션·사전 렌더링·시작 준비 스레드가 동시에 그리므로
+#    그림마다 Figure + FigureCanvasAgg 를 따로 만든다.
+# =========================================
+def _new_figure(figsize: Tuple[float, float]):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# 설치되어 있으면 이 순서로 쓴다. (MBTI_FONT_FAMILY 로 맨 앞에 추가 가능)
+KOREAN_FONT_FAMILIES = (
+    "NanumGothic",
+    "Noto Sans CJK KR",
+    "Noto Sans KR",
+    "Malgun Gothic",
+    "Apple SD Gothic Neo",
+    "AppleGothic",
+    "UnDotum",
+)
+
+
+@lru_cache(maxsize=1)
+def resolve_korean_font() -> Optional[str]:
+    # 한글 글꼴을 한 번만 찾아 rcParams 에 넣는다. (없으면 None, 기본 글꼴 유지)
+    import matplotlib
+    from matplotlib import font_manager
+
+    preferred = os.environ.get("MBTI_FONT_FAMILY")
+    installed = {f.name for f in font_manager.fontManager.ttflist}
+    for name in ([preferred] if preferred else []) + list(KOREAN_FONT_FAMILIES):
+        if name in installed:
+            matplotlib.rcParams["font.family"] = [name, "DejaVu Sans"]  # 영문·기호는 DejaVu 로
+            matplotlib.rcParams["axes.unicode_minus"] = False  # 한글 글꼴에 없는 유니코드 빼기 기호
+            return name
+    return None
+
+
+def create_result_figure(
+    mbti_type: str,
+    scores: Dict[str, int],
+    recommendations: Dict[str, List[str]],
+) -> bytes:
+    resolve_korean_font()
+
+    fig = _new_figure((7, 10))
+    ax = fig.subplots()
+    fig.suptitle("고등학생 진로 MBTI 결과 요약", fontsize=16, fontweight="bold")
+
+    fig.text(
+        0.5,
+        0.92,
+        f"MBTI 유형: {mbti_type}",
+        ha="center",
+        va="center",
+        fontsize=18,
+        fontweight="bold",
+    )
+
+    y_labels = ["E / I", "S / N", "T / F", "J / P"]
+    front_scores = [scores["E"], scores["S"], scores["T"], scores["J"]]
+    back_scores = [scores["I"], scores["N"], scores["F"], scores["P"]]
+
+    ax.barh(
+        [y + 0.15 for y in range(len(y_labels))],
+        front_scores,
+        height=0.3,
+        label="앞 글자(E/S/T/J)",
+    )
+    ax.barh(
+        [y - 0.15 for y in range(len(y_labels))],
+        back_scores,
+        height=0.3,
+        label="뒷 글자(I/N/F/P)",
+    )
+
+    ax.set_yticks(range(len(y_labels)))
+    ax.set_yticklabels(y_labels, fontsize=11)
+    ax.invert_yaxis()
+    ax.set_xlabel("점수(문항 수)", fontsize=11)
+    ax.legend(loc="lower right", fontsize=9)
+    ax.grid(axis="x", linestyle="--", alpha=0.4)
+
+    major_list = recommendations.get("majors", [])
+    career_list = recommendations.get("careers", [])
+
+    majors_text = "추천 전공 예시\n- " + "\n- ".join(major_list) if major_list else "추천 전공 데이터 없음"
+    careers_text = "추천 직업군 예시\n- " + "\n- ".join(career_list) if career_list else "추천 직업군 데이터 없음"
+
+    text = majors_text + "\n\n" + careers_text
+
+    fig.text(
+        0.02,
+        0.02,
+        "※ 본 결과는 참고용이며, 공식 심리검사를 대체하지 않습니다.",
+        fontsize=8,
+        color="gray",
+    )
+    fig.text(
+        0.52,
+        0.25,
+        text,
+        fontsize=10,
+        va="top",
+        bbox=dict(boxstyle="round", facecolor="#f5f5f5", alpha=0.9),
+    )
+
+    buf = io.BytesIO()
+    fig.tight_layout(rect=[0, 0.05, 1, 0.9])
+    fig.savefig(buf, format="png", dpi=150)
+    buf.seek(0)
+    return buf.getvalue()
+
+
+# =========================================
+# 렌더러 선택 (MBTI_RESULT_RENDERER)
+#  - matplotlib : 기존 PNG (기본값)
+#  - svg        : SVG 템플릿, SVG 파일 그대로
+#  - svg-png    : SVG 템플릿을 PNG로 변환 (cairosvg 필요, 없으면 matplotlib)
+# =========================================
+RENDERERS = ("matplotlib", "svg", "svg-png")
+
+
+@dataclass(frozen=True)
+class ResultImage:
+    data: bytes
+    mime: str
+    extension: str
+
+
+def configured_renderer() -> str:
+    renderer = os.environ.get("MBTI_RESULT_RENDERER", "matplotlib")
+    return renderer if renderer in RENDERERS else "matplotlib"
+
+
+def render_result_image(
+    mbti_type: str,
+    scores: Dict[str, int],
+    recommendations: Dict[str, List[str]],
+    renderer: Optional[str] = None,
+) -> ResultImage:
+    renderer = renderer or configured_renderer()
+    if renderer == "svg":
+        return ResultImage(render_result_svg(mbti_type, scores, recommendations), "image/svg+xml", "svg")
+    if renderer == "svg-png":
+        try:
+            svg = render_result_svg(mbti_type, scores, recommendations)
+            return ResultImage(svg_to_png(svg), "image/png", "png")
+        except (ImportError, OSError):
+            pass  # cairosvg 또는 libcairo 가 없으면 matplotlib 으로 그린다.
+    return ResultImage(create_result_figure(mbti_type, scores, recommendations), "image/png", "png")
+
+
+# =========================================
+# 결과 이미지 캐시 (내용 기반 키 + LRU / 용량 제한)
+#  - 같은 (렌더러, 유형, 점수, 추천 내용)이면 한 번만 그린다.
+#  - 프로세스 전체(모든 세션)가 공유한다.
+# =========================================
+def figure_cache_key(
+    mbti_type: str,
+    scores: Dict[str, int],
+    recommendations: Dict[str, List[str]],
+    renderer: str = "matplotlib",
+) -> str:
+    payload = json.dumps(
+        [
+            renderer,
+            mbti_type,
+            [int(scores[k]) for k in SCORE_KEYS],
+            {k: list(v) for k, v in sorted(recommendations.items())},
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultFigureCache:
+    def __init__(self, max_items: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[str, ResultImage]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._render_locks: Dict[str, threading.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[ResultImage]:
+        with self._lock:
+            image = self._items.get(key)
+            if image is not None:
+                self._items.move_to_end(key)
+            return image
+
+    def _get_counted(self, key: str) -> Optional[ResultImage]:
+        # get() 과 같고, 적중 수를 잠금 안에서 센다.
+        with self._lock:
+            image = self._items.get(key)
+            if image is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+            return image
+
+    def put(self, key: str, image: ResultImage) -> None:
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.data)
+            # 한 장이 예산보다 크면 저장하지 않는다.
+            if len(image.data) > self.max_bytes:
+                return
+            self._items[key] = image
+            self._bytes += len(image.data)
+            while len(self._items) > self.max_items or self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted.data)
+
+    def get_or_render(
+        self,
+        mbti_type: str,
+        scores: Dict[str, int],
+        recommendations: Dict[str, List[str]],
+        renderer: Optional[str] = None,
+    ) -> ResultImage:
+        renderer = renderer or configured_renderer()
+        key = figure_cache_key(mbti_type, scores, recommendations, renderer)
+        data = self._get_counted(key)
+        if data is not None:
+            return data
+
+        # 같은 키를 여러 세션이 동시에 요청하면 한 번만 그린다.
+        with self._lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+        with render_lock:
+            data = self._get_counted(key)
+            if data is not None:
+                return data
+            with self._lock:
+                self.misses += 1
+            data = render_result_image(mbti_type, scores, recommendations, renderer)
+            self.put(key, data)
+        with self._lock:
+            self._render_locks.pop(key, None)
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+
+figure_cache = ResultFigureCache()
+
+
+def get_result_image(
+    mbti_type: str,
+    scores: Dict[str, int],
+    recommendations: Dict[str, List[str]],
+) -> ResultImage:
+    return figure_cache.get_or_render(mbti_type, scores, recommendations)
+
+
+# =========================================
+# 사전 렌더링 (pre-warm)
+#  - 축마다 가장 나오기 쉬운 점수(절반 부근)를 조합해 미리 그려 둔다.
+#  - 조합 수는 축마다 (2*spread+2)개의 4제곱이라 금방 커진다. (spread=2 이면 1296)
+#    캐시에 다 들어가지 않으면 미리 그린 것을 스스로 밀어내므로,
+#    절반에 가까운 조합부터 캐시 용량(max_items)만큼만 그린다.
+# =========================================
+def likely_score_combinations(
+    items_per_axis: Sequence[int],
+    spread: int = 0,
+) -> Iterator[Dict[str, int]]:
+    per_axis: List[List[Tuple[int, int]]] = []
+    for n in items_per_axis:
+        low = max(0, n // 2 - spread)
+        high = min(n, (n + 1) // 2 + spread)
+        per_axis.append([(a, n - a) for a in range(low, high + 1)])
+
+    for combo in itertools.product(*per_axis):
+        scores: Dict[str, int] = {}
+        for (a_key, b_key), (a, b) in zip(AXIS_PAIRS, combo):
+            scores[a_key] = a
+            scores[b_key] = b
+        yield scores
+
+
+Recommend = Callable[[str, Dict[str, int]], Dict[str, List[str]]]  # (유형, 점수) -> 추천
+
+
+def prewarm_result_figures(
+    items_per_axis: Sequence[int],
+    recommend: Recommend,
+    spread: int = 0,
+    cache: Optional[ResultFigureCache] = None,
+) -> int:
+    cache = figure_cache if cache is None else cache
+    renderer = configured_renderer()
+    halves = [n / 2 for n in items_per_axis]
+    combos = sorted(
+        likely_score_combinations(items_per_axis, spread),
+        key=lambda sc: sum(abs(sc[a] - half) for (a, _), half in zip(AXIS_PAIRS, halves)),
+    )[: cache.max_items]
+    rendered = 0
+    for scores in combos:
+        mbti_type = mbti_type_from_scores(scores)
+        rec = recommend(mbti_type, scores)
+        key = figure_cache_key(mbti_type, scores, rec, renderer)
+        if cache.get(key) is None:
+            cache.put(key, render_result_image(mbti_type, scores, rec, renderer))
+            rendered += 1
+    return rendered
+
+
+def start_prewarm_thread(
+    items_per_axis: Sequence[int],
+    recommend: Recommend,
+    spread: int = 0,
+) -> threading.Thread:
+    thread = threading.Thread(
+        target=prewarm_result_figures,
+        args=(list(items_per_axis), recommend, spread),
+        name="result-figure-prewarm",
+        daemon=True,
+    )
+    thread.start()
+    return thread
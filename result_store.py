@@ -0,0 +1,384 @@
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from metrics import registry
+from scoring import SCORE_KEYS
+
+
+# =========================================
+# 검사 결과 저장소 (SQLite, WAL)
+#  - 쓰기: submit()은 큐에 넣기만 하고 바로 돌아온다.
+#          백그라운드 스레드가 모아서 한 트랜잭션으로 커밋한다. (write-behind)
+#  - 읽기: 읽기 전용 연결 풀에서 빌려 쓴다. WAL이라 쓰기와 동시에 읽을 수 있다.
+#  - 쓰기가 잠금(database is locked 등, OperationalError)으로 실패하면 결과를 버리지 않고
+#    간격을 늘려 가며(retry_delay … MAX_RETRY_DELAY 초) 다음 배치와 함께 다시 쓴다.
+#    그 밖의 오류나 종료 직전까지 못 쓴 결과는 버린 수를 세고 stderr 에 남긴다.
+# =========================================
+MAX_RETRY_DELAY = 5.0
+STOP_ATTEMPTS = 5  # close() 할 때 남은 결과를 쓰려는 최대 횟수
+
+registry.describe("result_store_retries_total", "잠금 등으로 결과 쓰기를 다시 시도한 수")
+registry.describe("result_store_dropped_total", "끝내 저장하지 못하고 버린 결과 수")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    session_id TEXT,
+    bank_version TEXT,
+    mbti_type TEXT NOT NULL,
+    {", ".join(f"{k} INTEGER NOT NULL" for k in SCORE_KEYS)},
+    answers TEXT NOT NULL,
+    cohort TEXT,
+    skipped TEXT,
+    answered_mask INTEGER,
+    choice_mask INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_results_created_at ON results (created_at);
+CREATE INDEX IF NOT EXISTS idx_results_type ON results (mbti_type);
+"""
+# 나중에 추가된 열 (이전 버전 DB는 열려 있을 때 ALTER TABLE 로 붙인다)
+_ADDED_COLUMNS = {
+    "cohort": "TEXT",
+    "skipped": "TEXT",
+    "answered_mask": "INTEGER",
+    "choice_mask": "INTEGER",
+}
+_POST_MIGRATION = "CREATE INDEX IF NOT EXISTS idx_results_cohort ON results (cohort);"
+
+_INSERT = (
+    "INSERT INTO results (created_at, session_id, bank_version, mbti_type, "
+    + ", ".join(SCORE_KEYS)
+    + ", answers, cohort, skipped, answered_mask, choice_mask) VALUES ("
+    + ", ".join("?" * (len(SCORE_KEYS) + 9))
+    + ")"
+)
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass
+class ResultRecord:
+    mbti_type: str
+    scores: Dict[str, int]
+    answers: Dict[int, str]
+    bank_version: Optional[str] = None
+    session_id: Optional[str] = None
+    cohort: Optional[str] = None  # "학교/학년/반"
+    skipped: List[int] = field(default_factory=list)  # 적응형 모드에서 건너뛴 문항 id
+    # 비트 응답 (answer_bits). 있으면 answers JSON 대신 이것만 저장한다.
+    answered_mask: Optional[int] = None
+    choice_mask: Optional[int] = None
+    created_at: str = field(default_factory=_utc_now)
+    id: Optional[int] = None
+
+    def to_row(self) -> tuple:
+        if self.answered_mask is not None:
+            answers = ""  # 비트로 저장하므로 JSON은 비운다.
+        else:
+            answers = json.dumps({str(k): v for k, v in self.answers.items()}, ensure_ascii=False)
+        return (
+            self.created_at,
+            self.session_id,
+            self.bank_version,
+            self.mbti_type,
+            *(int(self.scores[k]) for k in SCORE_KEYS),
+            answers,
+            self.cohort,
+            json.dumps(self.skipped) if self.skipped else None,
+            self.answered_mask,
+            self.choice_mask,
+        )
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "ResultRecord":
+        return cls(
+            id=row["id"],
+            created_at=row["created_at"],
+            session_id=row["session_id"],
+            bank_version=row["bank_version"],
+            cohort=row["cohort"],
+            skipped=json.loads(row["skipped"]) if row["skipped"] else [],
+            mbti_type=row["mbti_type"],
+            scores={k: row[k] for k in SCORE_KEYS},
+            answers={int(k): v for k, v in json.loads(row["answers"] or "{}").items()},
+            answered_mask=row["answered_mask"],
+            choice_mask=row["choice_mask"],
+        )
+
+
+_STOP = object()
+
+
+class ResultStore:
+    def __init__(
+        self,
+        path: str = "mbti_results.db",
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        read_pool_size: int = 4,
+        retry_delay: float = 0.1,
+        readonly: bool = False,
+        busy_timeout: float = 5.0,
+    ):
+        # readonly=True: 보고서용. 파일을 만들거나 고치지 않고 쓰기 스레드도 띄우지 않는다.
+        # (파일이 없으면 sqlite3.OperationalError)
+        self.path = path
+        self.readonly = readonly
+        self.busy_timeout = busy_timeout  # 잠금을 기다리는 시간(초), 지나면 OperationalError
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.written = 0
+        self.retrying = 0  # 다시 쓰려고 들고 있는 결과 수
+        self.dropped = 0
+        self.last_error: Optional[BaseException] = None
+
+        if not readonly:
+            conn = self._connect()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            existing = {r["name"] for r in conn.execute("PRAGMA table_info(results)")}
+            with conn:
+                for name, decl in _ADDED_COLUMNS.items():
+                    if name not in existing:
+                        conn.execute(f"ALTER TABLE results ADD COLUMN {name} {decl}")
+            conn.executescript(_POST_MIGRATION)
+            conn.close()
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(read_pool_size):
+            self._readers.put(self._connect(readonly=True))
+
+        self._writer: Optional[threading.Thread] = None
+        if not readonly:
+            self._writer = threading.Thread(target=self._write_loop, name="result-store-writer", daemon=True)
+            self._writer.start()
+
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        if readonly:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # -----------------------------
+    # 쓰기 (write-behind)
+    # -----------------------------
+    def submit(self, record: ResultRecord) -> None:
+        if self.readonly:
+            raise RuntimeError("읽기 전용으로 연 결과 저장소에는 쓸 수 없습니다.")
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        # 지금까지 넣은 결과가 모두 쓰기 시도될 때까지 기다린다. (잠금으로 다시 쓰는 중인 결과는 기다리지 않는다)
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "path": self.path,
+            "written": self.written,
+            "queued": self._queue.qsize(),
+            "retrying": self.retrying,
+            "dropped": self.dropped,
+            "last_error": None if self.last_error is None else f"{type(self.last_error).__name__}: {self.last_error}",
+        }
+
+    def _insert(self, conn: sqlite3.Connection, batch: List[ResultRecord]) -> Optional[sqlite3.Error]:
+        try:
+            with conn:
+                conn.executemany(_INSERT, [r.to_row() for r in batch])
+        except sqlite3.Error as e:
+            self.last_error = e
+            return e
+        self.written += len(batch)
+        self.last_error = None
+        return None
+
+    def _drop(self, batch: List[ResultRecord], error: sqlite3.Error) -> None:
+        self.dropped += len(batch)
+        registry.inc("result_store_dropped_total", len(batch))
+        print(f"검사 결과 {len(batch)}건을 저장하지 못했습니다 ({self.path}): {error}", file=sys.stderr)
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        retry: List[ResultRecord] = []  # 잠금 등으로 아직 못 쓴 결과
+        delay = self.retry_delay
+        stopping = False
+        while not stopping:
+            batch, retry = retry, []
+            taken = 0
+            try:
+                # 다시 쓸 결과가 있으면 delay 만큼만 기다린다.
+                item = self._queue.get(timeout=delay if batch else None)
+                taken = 1
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+            # 잠깐 기다리며 같이 끝난 결과를 한 번에 모은다.
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                error = self._insert(conn, batch)
+                attempts = 1
+                while stopping and isinstance(error, sqlite3.OperationalError) and attempts < STOP_ATTEMPTS:
+                    time.sleep(delay)
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
+                    registry.inc("result_store_retries_total")
+                    error = self._insert(conn, batch)
+                    attempts += 1
+                if error is None:
+                    delay = self.retry_delay
+                elif isinstance(error, sqlite3.OperationalError) and not stopping:
+                    retry = batch
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
+                    registry.inc("result_store_retries_total")
+                else:
+                    self._drop(batch, error)
+            self.retrying = len(retry)
+            for _ in range(taken):
+                self._queue.task_done()
+        conn.close()
+
+    # -----------------------------
+    # 읽기 (연결 풀)
+    # -----------------------------
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def count(self) -> int:
+        with self._reader() as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def query(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        mbti_type: Optional[str] = None,
+        bank_version: Optional[str] = None,
+        cohort: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[ResultRecord]:
+        where, params = [], []
+        if since is not None:
+            where.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("created_at < ?")
+            params.append(until)
+        if mbti_type is not None:
+            where.append("mbti_type = ?")
+            params.append(mbti_type)
+        if bank_version is not None:
+            where.append("bank_version = ?")
+            params.append(bank_version)
+        if cohort is not None:
+            # 상위 단위로 물으면 하위 반까지 포함한다. ("A고" -> "A고/2학년/3반")
+            where.append("(cohort = ? OR cohort LIKE ? ESCAPE '\\')")
+            escaped = cohort.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.extend([cohort, escaped + "/%"])
+
+        sql = "SELECT * FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._reader() as conn:
+            return [ResultRecord.from_row(r) for r in conn.execute(sql, params)]
+
+    def iter_summaries(self, batch_size: int = 1000) -> Iterator[Tuple[float, Optional[str], str, Dict[str, int]]]:
+        # (시각(epoch 초), cohort, 유형, 점수) — 답안 JSON은 읽지 않는다. (집계 초기화용)
+        for row in self.iter_summaries_after(0, batch_size):
+            yield row[1:]
+
+    def iter_summaries_after(
+        self,
+        after_id: int,
+        batch_size: int = 1000,
+    ) -> Iterator[Tuple[int, float, Optional[str], str, Dict[str, int]]]:
+        # (id, 시각, cohort, 유형, 점수) — id 가 after_id 보다 큰 결과만 (다른 워커 몫까지 따라잡기용)
+        # 쓰기는 한 번에 한 트랜잭션이라, 나중에 커밋된 결과의 id 가 항상 더 크다.
+        sql = (
+            "SELECT id, created_at, cohort, mbti_type, " + ", ".join(SCORE_KEYS)
+            + " FROM results WHERE id > ? ORDER BY id"
+        )
+        with self._reader() as conn:
+            cursor = conn.execute(sql, (after_id,))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for r in rows:
+                    yield (
+                        r["id"],
+                        datetime.fromisoformat(r["created_at"]).timestamp(),
+                        r["cohort"],
+                        r["mbti_type"],
+                        {k: r[k] for k in SCORE_KEYS},
+                    )
+
+    def iter_answer_batches(
+        self,
+        bank_version: Optional[str] = None,
+        batch_size: int = 5000,
+    ) -> Iterator[List[Tuple[str, Optional[int], Optional[int]]]]:
+        # [(answers JSON, answered_mask, choice_mask), …] 을 batch_size 개씩 (문항 분석용)
+        sql = "SELECT answers, answered_mask, choice_mask FROM results"
+        params: List[str] = []
+        if bank_version is not None:
+            sql += " WHERE bank_version = ?"
+            params.append(bank_version)
+        sql += " ORDER BY id"
+        with self._reader() as conn:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [(r["answers"], r["answered_mask"], r["choice_mask"]) for r in rows]
+
+    def type_counts(self) -> Dict[str, int]:
+        with self._reader() as conn:
+            rows = conn.execute("SELECT mbti_type, COUNT(*) FROM results GROUP BY mbti_type")
+            return {t: n for t, n in rows}
@@ -0,0 +1,149 @@
+import math
+from html import escape
+from string import Template
+from typing import Dict, List
+
+from scoring import AXIS_PAIRS
+
+
+# =========================================
+# 결과 요약 이미지 (SVG 템플릿)
+#  - create_result_figure(matplotlib)와 같은 내용을 SVG 문자열로 바로 만든다.
+#  - 고정된 틀(제목, 축, 범례, 안내 문구)은 import 할 때 한 번만 만들고,
+#    유형·막대·추천 목록만 채워 넣는다. (한 장에 수 ms 이하)
+#  - 한글은 보는 쪽(브라우저 등)의 글꼴로 그려지므로 matplotlib 글꼴 캐시가 필요 없다.
+#  - PNG가 필요하면 svg_to_png() (cairosvg 설치 시)
+# =========================================
+WIDTH, HEIGHT = 700, 1000  # 7 x 10 인치 비율
+FONT_FAMILY = "'Noto Sans KR', 'Malgun Gothic', 'Apple SD Gothic Neo', 'NanumGothic', sans-serif"
+FRONT_COLOR = "#1f77b4"  # 앞 글자(E/S/T/J) — matplotlib 기본 색과 같게
+BACK_COLOR = "#ff7f0e"   # 뒷 글자(I/N/F/P)
+
+# 막대 그래프 영역
+CHART_LEFT, CHART_RIGHT = 110, 660
+CHART_TOP, GROUP_HEIGHT = 130, 105
+BAR_HEIGHT = 30
+CHART_BOTTOM = CHART_TOP + GROUP_HEIGHT * len(AXIS_PAIRS)
+
+# 추천 상자
+BOX_X, BOX_Y, BOX_WIDTH = 364, 640, 320
+LINE_HEIGHT = 20
+
+
+def _build_template() -> Template:
+    labels = "".join(
+        f'<text x="{CHART_LEFT - 10}" y="{CHART_TOP + GROUP_HEIGHT * i + GROUP_HEIGHT / 2 + 5}" '
+        f'text-anchor="end" font-size="14">{a} / {b}</text>'
+        for i, (a, b) in enumerate(AXIS_PAIRS)
+    )
+    legend_x, legend_y = CHART_RIGHT - 170, CHART_BOTTOM - 52
+    # $ 는 Template 자리표시자이므로 고정 문자열에는 쓰지 않는다.
+    return Template(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+        f'viewBox="0 0 {WIDTH} {HEIGHT}" font-family="{FONT_FAMILY}">'
+        f'<rect width="{WIDTH}" height="{HEIGHT}" fill="#ffffff"/>'
+        f'<text x="{WIDTH / 2}" y="40" text-anchor="middle" font-size="22" font-weight="bold">'
+        "고등학생 진로 MBTI 결과 요약</text>"
+        f'<text x="{WIDTH / 2}" y="88" text-anchor="middle" font-size="26" font-weight="bold">'
+        "MBTI 유형: ${mbti_type}</text>"
+        "${grid}"
+        f'<rect x="{CHART_LEFT}" y="{CHART_TOP}" width="{CHART_RIGHT - CHART_LEFT}" '
+        f'height="{CHART_BOTTOM - CHART_TOP}" fill="none" stroke="#000000" stroke-width="1"/>'
+        "${bars}"
+        f"{labels}"
+        f'<text x="{(CHART_LEFT + CHART_RIGHT) / 2}" y="{CHART_BOTTOM + 45}" '
+        'text-anchor="middle" font-size="14">점수(문항 수)</text>'
+        f'<g font-size="12"><rect x="{legend_x - 8}" y="{legend_y - 8}" width="172" height="52" '
+        'fill="#ffffff" fill-opacity="0.8" stroke="#cccccc" rx="4"/>'
+        f'<rect x="{legend_x}" y="{legend_y}" width="20" height="10" fill="{FRONT_COLOR}"/>'
+        f'<text x="{legend_x + 28}" y="{legend_y + 10}">앞 글자(E/S/T/J)</text>'
+        f'<rect x="{legend_x}" y="{legend_y + 22}" width="20" height="10" fill="{BACK_COLOR}"/>'
+        f'<text x="{legend_x + 28}" y="{legend_y + 32}">뒷 글자(I/N/F/P)</text></g>'
+        "${recommendations}"
+        f'<text x="14" y="{HEIGHT - 16}" font-size="11" fill="#808080">'
+        "※ 본 결과는 참고용이며, 공식 심리검사를 대체하지 않습니다.</text>"
+        "</svg>"
+    )
+
+
+_TEMPLATE = _build_template()
+
+
+def _axis_max(scores: Dict[str, int]) -> int:
+    return max(1, max(int(v) for v in scores.values()))
+
+
+def _grid(axis_max: int) -> str:
+    step = max(1, math.ceil(axis_max / 10))
+    width = CHART_RIGHT - CHART_LEFT
+    parts = []
+    for tick in range(0, axis_max + 1, step):
+        x = CHART_LEFT + width * tick / axis_max
+        parts.append(
+            f'<line x1="{x:.1f}" y1="{CHART_TOP}" x2="{x:.1f}" y2="{CHART_BOTTOM}" '
+            'stroke="#b0b0b0" stroke-dasharray="4 3"/>'
+            f'<text x="{x:.1f}" y="{CHART_BOTTOM + 18}" text-anchor="middle" font-size="12">{tick}</text>'
+        )
+    return "".join(parts)
+
+
+def _bars(scores: Dict[str, int], axis_max: int) -> str:
+    width = CHART_RIGHT - CHART_LEFT
+    parts = []
+    for i, (a, b) in enumerate(AXIS_PAIRS):
+        center = CHART_TOP + GROUP_HEIGHT * i + GROUP_HEIGHT / 2
+        for key, y, color in (
+            (a, center - BAR_HEIGHT - 1, FRONT_COLOR),
+            (b, center + 1, BACK_COLOR),
+        ):
+            w = width * int(scores[key]) / axis_max
+            parts.append(
+                f'<rect x="{CHART_LEFT}" y="{y:.1f}" width="{w:.1f}" height="{BAR_HEIGHT}" fill="{color}"/>'
+            )
+    return "".join(parts)
+
+
+def _recommendations(recommendations: Dict[str, List[str]]) -> str:
+    majors = recommendations.get("majors", [])
+    careers = recommendations.get("careers", [])
+    lines = (["추천 전공 예시"] + [f"- {m}" for m in majors]) if majors else ["추천 전공 데이터 없음"]
+    lines += [""]
+    lines += (["추천 직업군 예시"] + [f"- {c}" for c in careers]) if careers else ["추천 직업군 데이터 없음"]
+
+    height = LINE_HEIGHT * len(lines) + 20
+    text = "".join(
+        f'<tspan x="{BOX_X + 12}" dy="{LINE_HEIGHT if i else 0}">{escape(line) or " "}</tspan>'
+        for i, line in enumerate(lines)
+    )
+    return (
+        f'<rect x="{BOX_X}" y="{BOX_Y}" width="{BOX_WIDTH}" height="{height}" rx="10" '
+        'fill="#f5f5f5" fill-opacity="0.9" stroke="#000000"/>'
+        f'<text x="{BOX_X + 12}" y="{BOX_Y + 26}" font-size="14" xml:space="preserve">{text}</text>'
+    )
+
+
+def render_result_svg(
+    mbti_type: str,
+    scores: Dict[str, int],
+    recommendations: Dict[str, List[str]],
+) -> bytes:
+    axis_max = _axis_max(scores)
+    svg = _TEMPLATE.substitute(
+        mbti_type=escape(mbti_type),
+        grid=_grid(axis_max),
+        bars=_bars(scores, axis_max),
+        recommendations=_recommendations(recommendations),
+    )
+    return svg.encode("utf-8")
+
+
+def svg_to_png(svg: bytes, scale: float = 1.5) -> bytes:
+    # cairosvg 가 없으면 ImportError, libcairo 가 없으면 OSError
+    # — 호출한 쪽(result_figure)에서 matplotlib 으로 대신 그린다.
+    import cairosvg
+
+    return cairosvg.svg2png(
+        bytestring=svg,
+        output_width=int(WIDTH * scale),
+        output_height=int(HEIGHT * scale),
+    )
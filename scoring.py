@@ -0,0 +1,140 @@
+import itertools
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+
+# =========================================
+# 배치 채점 엔진 (NumPy)
+#  - 학생 N명 x 문항 M개 응답 행렬을 한 번에 채점한다.
+#  - 응답 값: 0 = 무응답, 1 = option_a 선택, 2 = option_b 선택
+# =========================================
+SCORE_KEYS = ("E", "I", "S", "N", "T", "F", "J", "P")
+AXIS_PAIRS = (("E", "I"), ("S", "N"), ("T", "F"), ("J", "P"))
+CODE_INDEX: Dict[str, int] = {code: i for i, code in enumerate(SCORE_KEYS)}
+# 16개 유형 (ESTJ, ESTP, … INFP 순서)
+ALL_TYPES: Tuple[str, ...] = tuple("".join(letters) for letters in itertools.product(*AXIS_PAIRS))
+
+ANSWER_NONE = 0
+ANSWER_A = 1
+ANSWER_B = 2
+
+# 축별 (앞 글자, 뒷 글자) 열 번호: [[0, 1], [2, 3], [4, 5], [6, 7]]
+_PAIR_COLUMNS = np.array([[CODE_INDEX[a], CODE_INDEX[b]] for a, b in AXIS_PAIRS])
+_FRONT_LETTERS = np.array([a for a, _ in AXIS_PAIRS])
+_BACK_LETTERS = np.array([b for _, b in AXIS_PAIRS])
+
+
+@dataclass(frozen=True)
+class ItemIndex:
+    ids: np.ndarray          # (M,) 문항 id
+    a_codes: np.ndarray      # (M,) option_a_code 의 열 번호 (없으면 -1)
+    b_codes: np.ndarray      # (M,) option_b_code 의 열 번호 (없으면 -1)
+    position: Dict[int, int]  # 문항 id -> 열 위치
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def build_item_index(
+    ids: Sequence[int],
+    a_codes: Sequence[str],
+    b_codes: Sequence[str],
+) -> ItemIndex:
+    return _index_from_code_arrays(
+        tuple(int(i) for i in ids),
+        tuple(CODE_INDEX.get(str(c), -1) for c in a_codes),
+        tuple(CODE_INDEX.get(str(c), -1) for c in b_codes),
+    )
+
+
+@lru_cache(maxsize=16)
+def _index_from_code_arrays(
+    ids: Tuple[int, ...],
+    a_code_index: Tuple[int, ...],
+    b_code_index: Tuple[int, ...],
+) -> ItemIndex:
+    ids_arr = np.asarray(ids, dtype=np.int64)
+    a_arr = np.asarray(a_code_index, dtype=np.int8)
+    b_arr = np.asarray(b_code_index, dtype=np.int8)
+    for arr in (ids_arr, a_arr, b_arr):
+        arr.setflags(write=False)
+    position = {qid: pos for pos, qid in enumerate(ids)}
+    return ItemIndex(ids=ids_arr, a_codes=a_arr, b_codes=b_arr, position=position)
+
+
+def item_index_from_bank(bank) -> ItemIndex:
+    # item_bank.ItemBank 에 미리 계산된 코드 배열을 그대로 쓴다.
+    return _index_from_code_arrays(bank.ids, bank.a_code_index, bank.b_code_index)
+
+
+def item_index_from_frame(df_items) -> ItemIndex:
+    return build_item_index(
+        df_items["id"].tolist(),
+        df_items["option_a_code"].tolist(),
+        df_items["option_b_code"].tolist(),
+    )
+
+
+def choices_to_codes(index: ItemIndex, choices: np.ndarray) -> np.ndarray:
+    choices = np.asarray(choices)
+    return np.where(
+        choices == ANSWER_A,
+        index.a_codes,
+        np.where(choices == ANSWER_B, index.b_codes, -1),
+    ).astype(np.int8)
+
+
+def score_codes(codes: np.ndarray) -> np.ndarray:
+    # codes: (N, M) 코드 열 번호 행렬 (-1 = 무응답) -> (N, 8) 점수 행렬
+    codes = np.atleast_2d(np.asarray(codes, dtype=np.int64))
+    n = codes.shape[0]
+    width = len(SCORE_KEYS)
+    valid = codes >= 0
+    flat = (codes + width * np.arange(n)[:, None])[valid]
+    return np.bincount(flat, minlength=width * n).reshape(n, width)
+
+
+def types_from_score_matrix(score_matrix: np.ndarray) -> np.ndarray:
+    # 동점이면 앞 글자(E/S/T/J)를 택한다. (>= 규칙)
+    front = score_matrix[:, _PAIR_COLUMNS[:, 0]]
+    back = score_matrix[:, _PAIR_COLUMNS[:, 1]]
+    letters = np.where(front >= back, _FRONT_LETTERS, _BACK_LETTERS)
+    if len(letters) == 0:
+        return np.empty(0, dtype="<U4")
+    return np.char.add(
+        np.char.add(letters[:, 0], letters[:, 1]),
+        np.char.add(letters[:, 2], letters[:, 3]),
+    )
+
+
+def score_batch(index: ItemIndex, choices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # choices: (N, M) 응답 행렬 -> (유형 배열 (N,), 점수 행렬 (N, 8))
+    score_matrix = score_codes(choices_to_codes(index, choices))
+    return types_from_score_matrix(score_matrix), score_matrix
+
+
+def mbti_type_from_scores(scores: Dict[str, int]) -> str:
+    return "".join(a if scores[a] >= scores[b] else b for a, b in AXIS_PAIRS)
+
+
+def scores_to_dict(row: Sequence[int]) -> Dict[str, int]:
+    return {k: int(v) for k, v in zip(SCORE_KEYS, row)}
+
+
+def answers_to_codes(index: ItemIndex, answers: Dict[int, str]) -> np.ndarray:
+    # 세션의 {문항 id: 코드} 딕셔너리를 한 줄짜리 코드 행렬로 바꾼다.
+    row = np.full((1, len(index)), -1, dtype=np.int8)
+    for qid, code in answers.items():
+        pos = index.position.get(qid)
+        if pos is not None and code in CODE_INDEX:
+            row[0, pos] = CODE_INDEX[code]
+    return row
+
+
+def score_answers(index: ItemIndex, answers: Dict[int, str]) -> Tuple[str, Dict[str, int]]:
+    score_matrix = score_codes(answers_to_codes(index, answers))
+    return str(types_from_score_matrix(score_matrix)[0]), scores_to_dict(score_matrix[0])
+
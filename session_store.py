@@ -0,0 +1,276 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional, Tuple
+
+
+# =========================================
+# 검사 진행 상태 저장소 (워커 프로세스 공유)
+#  - 문항 하나에 답할 때마다 진행 상태(idx, answers, finished …)를 저장한다.
+#  - 주소의 ?sid= 로 어느 워커에서든 이어서 할 수 있다.
+#    (워커 재시작·로드밸런서 뒤 여러 프로세스)
+#  - 오래 쓰지 않은 세션은 ttl 이 지나면 지운다.
+#  - 읽기는 새 연결(새로고침·재접속)에서만 일어나고, 그때는 다른 워커가 저장했을 수 있으므로
+#    프로세스 안 캐시 없이 항상 백엔드에서 읽는다. (진행 중인 세션은 st.session_state 에 있다)
+#  - 백엔드: "sqlite:경로" (기본), "file:디렉터리", "memory"
+# =========================================
+_SESSION_ID = re.compile(r"^[0-9a-f]{32}$")  # uuid4().hex — 주소에서 오므로 형식을 검사한다.
+
+
+def valid_session_id(session_id: Optional[str]) -> bool:
+    return bool(session_id) and _SESSION_ID.match(session_id) is not None
+
+
+@dataclass
+class SessionRecord:
+    session_id: str
+    idx: int = 0
+    answers: Dict[int, str] = field(default_factory=dict)
+    finished: bool = False
+    result_saved: bool = False
+    cohort: Optional[str] = None
+    adaptive: bool = False
+    bank_name: Optional[str] = None     # 문항 은행 이름과
+    bank_version: Optional[str] = None  # 시작할 때의 버전(content_hash)
+    updated_at: float = field(default_factory=time.time)
+
+    # st.session_state 와 주고받는 키
+    STATE_KEYS = (
+        "session_id", "idx", "answers", "finished", "result_saved", "cohort", "adaptive",
+        "bank_name", "bank_version",
+    )
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "idx": self.idx,
+                "answers": {str(int(k)): v for k, v in self.answers.items()},
+                "finished": self.finished,
+                "result_saved": self.result_saved,
+                "cohort": self.cohort,
+                "adaptive": self.adaptive,
+                "bank_name": self.bank_name,
+                "bank_version": self.bank_version,
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, session_id: str, payload: str, updated_at: float) -> "SessionRecord":
+        data = json.loads(payload)
+        return cls(
+            session_id=session_id,
+            idx=int(data.get("idx", 0)),
+            answers={int(k): v for k, v in data.get("answers", {}).items()},
+            finished=bool(data.get("finished", False)),
+            result_saved=bool(data.get("result_saved", False)),
+            cohort=data.get("cohort"),
+            adaptive=bool(data.get("adaptive", False)),
+            bank_name=data.get("bank_name"),
+            bank_version=data.get("bank_version"),
+            updated_at=updated_at,
+        )
+
+    def to_state(self) -> Dict[str, object]:
+        return {k: getattr(self, k) for k in self.STATE_KEYS}
+
+    @classmethod
+    def from_state(cls, state) -> "SessionRecord":
+        return cls(**{k: state[k] for k in cls.STATE_KEYS})
+
+
+# =========================================
+# 백엔드 (payload 문자열 + 마지막 갱신 시각만 다룬다)
+# =========================================
+class SessionBackend(ABC):
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Tuple[str, float]]:
+        ...
+
+    @abstractmethod
+    def put(self, session_id: str, payload: str, updated_at: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def expire(self, cutoff: float) -> int:
+        # updated_at < cutoff 인 세션을 지우고 지운 수를 돌려준다.
+        ...
+
+
+class MemorySessionBackend(SessionBackend):
+    # 프로세스 하나에서만 쓸 때 (개발용)
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        return self._data.get(session_id)
+
+    def put(self, session_id, payload, updated_at):
+        with self._lock:
+            self._data[session_id] = (payload, updated_at)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def expire(self, cutoff):
+        with self._lock:
+            old = [sid for sid, (_, t) in self._data.items() if t < cutoff]
+            for sid in old:
+                del self._data[sid]
+        return len(old)
+
+
+class SQLiteSessionBackend(SessionBackend):
+    # 같은 서버의 여러 워커 프로세스가 한 파일을 같이 쓴다. (WAL)
+    def __init__(self, path: str = "mbti_sessions.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at);
+            """
+        )
+
+    def get(self, session_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, updated_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def put(self, session_id, payload, updated_at):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, updated_at, payload) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET updated_at = excluded.updated_at, "
+                "payload = excluded.payload",
+                (session_id, updated_at, payload),
+            )
+
+    def delete(self, session_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def expire(self, cutoff):
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,)).rowcount
+
+
+class FileSessionBackend(SessionBackend):
+    # 세션 하나 = JSON 파일 하나 (공유 디스크로 여러 서버가 같이 쓸 때)
+    # 마지막 갱신 시각은 파일 수정 시각으로 둔다.
+    def __init__(self, directory: str = ".mbti_sessions"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def get(self, session_id):
+        path = self._path(session_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = f.read()
+            return payload, os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def put(self, session_id, payload, updated_at):
+        path = self._path(session_id)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.utime(tmp, (updated_at, updated_at))
+        os.replace(tmp, path)
+
+    def delete(self, session_id):
+        try:
+            os.remove(self._path(session_id))
+        except OSError:
+            pass
+
+    def expire(self, cutoff):
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    pass  # 다른 워커가 먼저 지웠다.
+        return removed
+
+
+def open_session_backend(spec: str = "sqlite:mbti_sessions.db") -> SessionBackend:
+    kind, _, target = spec.partition(":")
+    if kind == "sqlite":
+        return SQLiteSessionBackend(target or "mbti_sessions.db")
+    if kind == "file":
+        return FileSessionBackend(target or ".mbti_sessions")
+    if kind == "memory":
+        return MemorySessionBackend()
+    raise ValueError(f"알 수 없는 세션 저장소입니다: {spec!r} (sqlite:경로, file:디렉터리, memory)")
+
+
+# =========================================
+# 만료 처리
+# =========================================
+class SessionStore:
+    def __init__(
+        self,
+        backend: SessionBackend,
+        ttl: float = 2 * 60 * 60,
+        sweep_interval: float = 60.0,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+
+    def load(self, session_id: Optional[str]) -> Optional[SessionRecord]:
+        if not valid_session_id(session_id):
+            return None
+        stored = self.backend.get(session_id)
+        if stored is None or time.time() - stored[1] > self.ttl:
+            return None
+        return SessionRecord.from_json(session_id, *stored)
+
+    def save(self, record: SessionRecord) -> None:
+        record = replace(record, updated_at=time.time())
+        self.backend.put(record.session_id, record.to_json(), record.updated_at)
+        if record.updated_at - self._last_sweep >= self.sweep_interval:
+            self.sweep(record.updated_at)
+
+    def delete(self, session_id: str) -> None:
+        self.backend.delete(session_id)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        self._last_sweep = now
+        try:
+            return self.backend.expire(now - self.ttl)
+        except (OSError, sqlite3.Error):
+            return 0  # 다음 주기에 다시 시도한다.
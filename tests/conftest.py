@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from item_bank import load_item_bank  # noqa: E402
+from scoring import ANSWER_A, ANSWER_B, AXIS_PAIRS, SCORE_KEYS  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def bank(tmp_path_factory):
+    # 컴파일 산출물은 임시 폴더에 둔다. (저장소의 캐시를 건드리지 않게)
+    return load_item_bank(os.path.join(ROOT, "mbti.csv"), cache_dir=str(tmp_path_factory.mktemp("bank_cache")))
+
+
+# =========================================
+# 기준 구현: 문항을 하나씩 보며 선택한 코드에 1점 (동점이면 E/S/T/J)
+# =========================================
+def reference_score(bank, answers):
+    scores = {k: 0 for k in SCORE_KEYS}
+    for qid in bank.ids:
+        code = answers.get(qid)
+        if code in scores:
+            scores[code] += 1
+    return "".join(a if scores[a] >= scores[b] else b for a, b in AXIS_PAIRS), scores
+
+
+def choices_to_answers(bank, row):
+    answers = {}
+    for qid, a_code, b_code, value in zip(bank.ids, bank.a_codes, bank.b_codes, row):
+        if value == ANSWER_A:
+            answers[qid] = a_code
+        elif value == ANSWER_B:
+            answers[qid] = b_code
+    return answers
+
+
+def random_answers(bank, rng, p_missing=0.2):
+    answers = {}
+    for qid, a_code, b_code in zip(bank.ids, bank.a_codes, bank.b_codes):
+        r = rng.random()
+        if r < p_missing:
+            continue
+        answers[qid] = a_code if r < p_missing + (1 - p_missing) / 2 else b_code
+    return answers
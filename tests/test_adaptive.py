@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from adaptive import get_adaptive_plan
+from conftest import random_answers, reference_score
+from scoring import AXIS_PAIRS, CODE_INDEX
+
+
+# =========================================
+# 적응형 출제: 결정된 축은 남은 문항을 어떻게 답해도 글자가 바뀌지 않는다.
+# =========================================
+def _letter_is_fixed(plan, answers, axis):
+    front, back, answered = plan.axis_counts(answers)[axis]
+    remaining = plan.axis_totals[axis] - answered
+    # 남은 문항을 모두 앞 글자 / 모두 뒷 글자로 답한 두 극단이 같은 글자면 결정된 것이다.
+    return (front + remaining >= back) == (front >= back + remaining)
+
+
+def test_adaptive_decided_axes_match_brute_force(bank):
+    plan = get_adaptive_plan(bank)
+    rng = np.random.default_rng(4)
+    for _ in range(2000):
+        answers = random_answers(bank, rng, p_missing=rng.random())
+        decided = plan.decided_axes(answers)
+        for axis in range(len(AXIS_PAIRS)):
+            assert decided[axis] == _letter_is_fixed(plan, answers, axis)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_adaptive_run_gives_full_test_type(bank, seed):
+    plan = get_adaptive_plan(bank)
+    rng = np.random.default_rng(seed)
+    full = random_answers(bank, rng, p_missing=0.0)
+    asked = {}
+    while True:
+        pos = plan.next_position(asked)
+        if pos is None:
+            break
+        qid = bank.ids[pos]
+        asked[qid] = full[qid]
+    assert reference_score(bank, asked)[0] == reference_score(bank, full)[0]
+    assert set(plan.skipped(asked)) == set(bank.ids) - set(asked)
+    # 축당 과반(9문항이면 5개)만 모이면 끝나므로 전체보다 적거나 같다.
+    assert len(asked) <= len(bank)
+    for axis, total in enumerate(plan.axis_totals):
+        front, back, _ = plan.axis_counts(asked)[axis]
+        assert max(front, back) >= total // 2 + (total % 2)
+
+
+def test_adaptive_axes_follow_codes(bank):
+    plan = get_adaptive_plan(bank)
+    for axis, a_index in zip(plan.axes, bank.a_code_index):
+        assert axis == a_index // 2
+    assert sorted(plan.order) == list(range(len(bank)))
+    assert all(CODE_INDEX[c] // 2 == axis for c, axis in zip(bank.a_codes, plan.axes))
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from aggregates import ALL_COHORTS, BUCKET_SECONDS, DistributionAggregator
+from scoring import ALL_TYPES
+
+SCORES = {"E": 3, "I": 0, "S": 2, "N": 1, "T": 3, "F": 0, "J": 1, "P": 2}
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def _agg(clock, windows=(600, 3600)):
+    return DistributionAggregator(max_score=3, windows=windows, clock=clock)
+
+
+def test_cohort_paths_roll_up_to_parents(clock):
+    agg = _agg(clock)
+    agg.record("ESTJ", SCORES, "A고/2학년/3반")
+    agg.record("INFP", SCORES, "A고/1학년/1반")
+    assert agg.cohorts() == [ALL_COHORTS, "A고", "A고/1학년", "A고/1학년/1반", "A고/2학년", "A고/2학년/3반"]
+    assert agg.snapshot("A고").count == 2
+    assert agg.snapshot("A고/2학년").type_counts()["ESTJ"] == 1
+    assert agg.snapshot(ALL_COHORTS).mean_scores()["E"] == 3
+
+
+def test_window_expires_old_buckets(clock):
+    agg = _agg(clock)
+    agg.record("ESTJ", SCORES)
+    clock.now += 5 * 60
+    agg.record("ENFP", SCORES)
+    assert agg.snapshot(window=600).count == 2
+    clock.now += 6 * 60  # 첫 결과는 10분 창을 벗어남
+    assert agg.snapshot(window=600).type_counts()["ESTJ"] == 0
+    assert agg.snapshot(window=600).count == 1
+    assert agg.snapshot(window=3600).count == 2
+    assert agg.snapshot().count == 2
+
+
+def test_late_result_is_added_to_its_bucket(clock):
+    agg = _agg(clock)
+    agg.record("ESTJ", SCORES)
+    # 3분 전에 끝난 결과가 나중에 들어온다 (다른 워커의 write-behind 지연 등)
+    agg.record("ISTP", SCORES, timestamp=clock.now - 3 * 60)
+    assert agg.snapshot(window=600).count == 2
+    clock.now += 8 * 60  # 늦은 결과(11분 전)만 10분 창을 벗어남
+    window = agg.snapshot(window=600)
+    assert window.count == 1 and window.type_counts()["ESTJ"] == 1
+    assert agg.snapshot(window=3600).count == 2
+
+
+def test_result_older_than_window_counts_only_in_wider_totals(clock):
+    agg = _agg(clock)
+    agg.record("ESTJ", SCORES)
+    agg.record("ISTP", SCORES, timestamp=clock.now - 30 * 60)
+    agg.record("ISFP", SCORES, timestamp=clock.now - 2 * 3600)
+    assert agg.snapshot(window=600).count == 1
+    assert agg.snapshot(window=3600).count == 2
+    assert agg.snapshot().count == 3
+
+
+def test_windows_match_brute_force(clock):
+    rng = random.Random(7)
+    agg = _agg(clock)
+    results = []
+    for _ in range(500):
+        clock.now += rng.uniform(0, 20)
+        # 대부분은 지금, 일부는 최대 90분 늦게 들어온다.
+        ts = clock.now - (rng.uniform(0, 90 * 60) if rng.random() < 0.3 else 0)
+        mbti_type = rng.choice(ALL_TYPES)
+        agg.record(mbti_type, SCORES, timestamp=ts)
+        results.append((int(ts // BUCKET_SECONDS), mbti_type))
+        if rng.random() < 0.1:
+            now_bucket = int(clock.now // BUCKET_SECONDS)
+            for seconds in (600, 3600):
+                in_window = [t for b, t in results if b > now_bucket - seconds // BUCKET_SECONDS]
+                snapshot = agg.snapshot(window=seconds)
+                assert snapshot.count == len(in_window)
+                assert snapshot.type_counts() == {t: in_window.count(t) for t in ALL_TYPES}
+    assert agg.snapshot().count == 500
+
+
+def test_catch_up_reads_each_result_once(clock):
+    agg = _agg(clock)
+    rows = [(i, clock.now, "A고/1학년/1반", "ENTP", SCORES) for i in range(1, 6)]
+    calls = []
+
+    def summaries_after(last_id):
+        calls.append(last_id)
+        return [r for r in rows if r[0] > last_id]
+
+    assert agg.catch_up(summaries_after) == 5
+    assert agg.catch_up(summaries_after) == 0
+    rows.append((6, clock.now, None, "ISFJ", SCORES))
+    assert agg.catch_up(summaries_after) == 1
+    assert calls == [0, 5, 5]
+    assert agg.last_id == 6
+    assert agg.snapshot().count == 6
+    assert agg.snapshot("A고").count == 5
@@ -0,0 +1,26 @@
+import numpy as np
+
+from answer_bits import get_bank_masks
+from conftest import random_answers, reference_score
+
+
+# =========================================
+# 비트 응답: popcount 채점, 인코딩, 결과 코드(?r=)
+# =========================================
+def test_bitmask_score_matches_reference(bank):
+    rng = np.random.default_rng(2)
+    masks = get_bank_masks(bank)
+    for _ in range(2000):
+        answers = random_answers(bank, rng)
+        bits = masks.encode(answers)
+        assert masks.score(bits) == reference_score(bank, answers)
+        assert masks.decode(bits) == answers
+
+
+def test_answer_token_round_trip(bank):
+    rng = np.random.default_rng(3)
+    masks = get_bank_masks(bank)
+    answers = random_answers(bank, rng)
+    bits, flags = masks.from_token(masks.to_token(masks.encode(answers), 3))
+    assert flags == 3
+    assert masks.decode(bits) == answers
@@ -0,0 +1,79 @@
+import os
+import shutil
+import time
+
+import pytest
+
+from bank_registry import BankRegistry, parse_bank_spec
+from conftest import ROOT
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("MBTI_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "bank.csv"
+    shutil.copy(os.path.join(ROOT, "mbti.csv"), path)
+    return path
+
+
+def _edit(path, old="처음보는", new="처음 보는"):
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
+
+
+def _wait(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_parse_bank_spec():
+    assert parse_bank_spec(" default=mbti.csv, banks/screener.csv ,") == {
+        "default": "mbti.csv",
+        "screener": "banks/screener.csv",
+    }
+
+
+def test_watcher_swaps_current_and_keeps_old_version(csv_path):
+    registry = BankRegistry({"default": str(csv_path)})
+    old = registry.current()
+    registry.start_watcher(0.01)
+    _edit(csv_path)
+    _wait(lambda: registry.current().content_hash != old.content_hash)
+
+    new = registry.current()
+    assert new.a_texts[0].startswith("처음 보는")
+    # 이미 시작한 세션은 시작할 때의 버전을 계속 쓴다.
+    assert registry.get(old.content_hash) is old
+    assert [b.content_hash for b in registry.versions()] == [new.content_hash, old.content_hash]
+    assert registry.status()["default"]["versions_loaded"] == 2
+
+
+def test_broken_edit_keeps_current_version(csv_path):
+    registry = BankRegistry({"default": str(csv_path)})
+    old = registry.current()
+    csv_path.write_text("id,question\n1,x\n", encoding="utf-8")
+    assert registry.reload("default") is False
+    assert registry.current() is old
+    assert registry.status()["default"]["last_error"]
+
+
+def test_old_version_loaded_by_another_worker(csv_path):
+    # 워커 A 가 옛 버전으로 세션을 시작한 뒤 파일이 바뀌고, 그 세션이 워커 B 로 넘어온 경우
+    old_hash = BankRegistry({"default": str(csv_path)}).current().content_hash
+    _edit(csv_path)
+    worker_b = BankRegistry({"default": str(csv_path)})
+    assert worker_b.current().content_hash != old_hash
+
+    bank = worker_b.get(old_hash, "default")
+    assert bank.content_hash == old_hash
+    assert bank.a_texts[0].startswith("처음보는")
+    assert worker_b.get(old_hash) is bank
+
+
+def test_unknown_version_falls_back_to_current(csv_path):
+    registry = BankRegistry({"default": str(csv_path)})
+    assert registry.get("0" * 64) is registry.current()
+    assert registry.get(None, "missing-name") is registry.current()
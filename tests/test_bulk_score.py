@@ -0,0 +1,89 @@
+import csv
+import io
+
+import numpy as np
+import pytest
+
+from bulk_score import AnswerSheetError, AnswerSheetScorer, score_answer_stream
+from conftest import random_answers, reference_score
+from scoring import SCORE_KEYS
+
+
+# =========================================
+# 답안 CSV 스트리밍 채점
+# =========================================
+def _sheet(bank, rows, encoding="utf-8"):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["학번", "이름"] + [f"q{qid}" for qid in bank.ids])
+    for student, name, answers in rows:
+        writer.writerow([student, name] + [answers.get(qid, "") for qid in bank.ids])
+    return io.BytesIO(buf.getvalue().encode(encoding))
+
+
+def _read_results(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_stream_scores_every_row_across_chunks(bank, tmp_path):
+    rng = np.random.default_rng(0)
+    sheets = [random_answers(bank, rng, p_missing=0.0) for _ in range(250)]
+    stream = _sheet(bank, [(str(i), f"학생{i}", a) for i, a in enumerate(sheets)])
+    out = tmp_path / "out.csv"
+
+    seen = []
+    state = score_answer_stream(
+        stream, AnswerSheetScorer.from_bank(bank), str(out), chunk_size=64, progress=seen.append
+    )
+    assert (state.rows, state.scored, state.invalid) == (250, 250, 0)
+    assert len(seen) == 4  # 64 + 64 + 64 + 58
+
+    rows = _read_results(out)
+    assert [r["학번"] for r in rows] == [str(i) for i in range(250)]
+    for row, answers in zip(rows, sheets):
+        mbti_type, scores = reference_score(bank, answers)
+        assert row["mbti_type"] == mbti_type
+        assert [int(row[k]) for k in SCORE_KEYS] == [scores[k] for k in SCORE_KEYS]
+
+
+def test_unknown_value_marks_row_invalid(bank, tmp_path):
+    answers = {qid: code for qid, code in zip(bank.ids, bank.a_codes)}
+    bad = {**answers, bank.ids[0]: "?"}
+    stream = _sheet(bank, [("1", "가", answers), ("2", "나", bad)])
+    out = tmp_path / "out.csv"
+    state = score_answer_stream(stream, AnswerSheetScorer.from_bank(bank), str(out))
+    assert (state.scored, state.invalid) == (1, 1)
+    rows = _read_results(out)
+    assert rows[1]["mbti_type"] == ""
+    assert f"{bank.ids[0]}번 문항" in rows[1]["error"]
+
+
+def test_cp949_sheet_is_detected(bank, tmp_path):
+    answers = {qid: code for qid, code in zip(bank.ids, bank.b_codes)}
+    stream = _sheet(bank, [("1", "김철수", answers)], encoding="cp949")
+    out = tmp_path / "out.csv"
+    state = score_answer_stream(stream, AnswerSheetScorer.from_bank(bank), str(out))
+    assert state.scored == 1
+    assert _read_results(out)[0]["이름"] == "김철수"
+
+
+def test_decode_error_after_sample_names_the_line(bank, tmp_path):
+    # 앞 64KB 는 ASCII 라 utf-8 로 감지되고, 맨 끝 줄에만 cp949 한글이 있다.
+    answers = {qid: code for qid, code in zip(bank.ids, bank.a_codes)}
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["name"] + [str(qid) for qid in bank.ids])
+    for i in range(3000):
+        writer.writerow([f"s{i}"] + [answers[qid] for qid in bank.ids])
+    writer.writerow(["김철수"] + [answers[qid] for qid in bank.ids])
+    stream = io.BytesIO(buf.getvalue().encode("cp949"))
+
+    with pytest.raises(AnswerSheetError, match="3002행"):
+        score_answer_stream(stream, AnswerSheetScorer.from_bank(bank), str(tmp_path / "out.csv"))
+
+
+def test_missing_item_column_is_rejected(bank, tmp_path):
+    stream = io.BytesIO("name,q1\n가,A\n".encode("utf-8"))
+    with pytest.raises(AnswerSheetError):
+        score_answer_stream(stream, AnswerSheetScorer.from_bank(bank), str(tmp_path / "out.csv"))
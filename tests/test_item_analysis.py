@@ -0,0 +1,106 @@
+import json
+
+import numpy as np
+import pytest
+
+from item_analysis import ItemAnalyzer, analyze, choices_from_rows
+from scoring import ANSWER_A, ANSWER_B, ANSWER_NONE, AXIS_PAIRS
+
+
+def _simulate(bank, n, seed=0, p_missing=0.1):
+    # 축마다 잠재 성향이 있는 응답 (문항끼리 상관이 생기게)
+    rng = np.random.default_rng(seed)
+    trait = rng.normal(size=(n, len(AXIS_PAIRS)))
+    choices = np.empty((n, len(bank)), dtype=np.int8)
+    for pos, code in enumerate(bank.a_codes):
+        axis = next(i for i, pair in enumerate(AXIS_PAIRS) if code in pair)
+        sign = 1 if code == AXIS_PAIRS[axis][0] else -1
+        p_a = 1 / (1 + np.exp(-(sign * trait[:, axis] * rng.uniform(0.3, 2.0) + rng.normal(0, 0.5))))
+        choices[:, pos] = np.where(rng.random(n) < p_a, ANSWER_A, ANSWER_B)
+    choices[rng.random(choices.shape) < p_missing] = ANSWER_NONE
+    return choices
+
+
+def _front_matrix(bank, choices, axis):
+    # 그 축 문항에 모두 답한 응답만, 앞 글자를 골랐으면 1
+    positions = [p for p, code in enumerate(bank.a_codes) if code in AXIS_PAIRS[axis]]
+    sub = choices[:, positions]
+    sub = sub[(sub != ANSWER_NONE).all(axis=1)]
+    codes = np.where(sub == ANSWER_A, np.array(bank.a_codes)[positions], np.array(bank.b_codes)[positions])
+    return positions, (codes == AXIS_PAIRS[axis][0]).astype(float)
+
+
+def _alpha(x):
+    k = x.shape[1]
+    return k / (k - 1) * (1 - x.var(axis=0, ddof=1).sum() / x.sum(axis=1).var(ddof=1))
+
+
+@pytest.fixture(scope="module")
+def simulated(bank):
+    return _simulate(bank, 3000)
+
+
+def test_alpha_and_item_rest_match_brute_force(bank, simulated):
+    result = analyze(bank, np.array_split(simulated, 7))
+    assert result.n_responses == len(simulated)
+    for axis, stats in enumerate(result.axes):
+        positions, x = _front_matrix(bank, simulated, axis)
+        assert stats.n_items == len(positions)
+        assert stats.n_complete == len(x)
+        assert stats.alpha == pytest.approx(_alpha(x), abs=1e-9)
+        for j, pos in enumerate(positions):
+            item = result.items[pos]
+            rest = np.delete(x, j, axis=1)
+            assert item.item_rest_r == pytest.approx(np.corrcoef(x[:, j], rest.sum(axis=1))[0, 1], abs=1e-9)
+            assert item.alpha_if_deleted == pytest.approx(_alpha(rest), abs=1e-9)
+
+
+def test_rates_and_chunking_and_merge(bank, simulated):
+    whole = analyze(bank, [simulated])
+    left, right = ItemAnalyzer(bank), ItemAnalyzer(bank)
+    left.add(simulated[:1234])
+    right.add(simulated[1234:])
+    left.merge(right)
+    merged = left.result()
+    for a, b in zip(whole.items, merged.items):
+        assert a.n_answered == b.n_answered
+        assert a.item_rest_r == pytest.approx(b.item_rest_r, abs=1e-9)
+
+    answered = (simulated != ANSWER_NONE).sum(axis=0)
+    a_rate = (simulated == ANSWER_A).sum(axis=0) / answered
+    for pos, item in enumerate(whole.items):
+        assert item.n_answered == answered[pos]
+        assert item.a_rate == pytest.approx(a_rate[pos])
+        assert item.a_rate + item.b_rate == pytest.approx(1.0)
+
+
+def test_uninformative_item_is_flagged(bank, simulated):
+    noisy = simulated.copy()
+    rng = np.random.default_rng(1)
+    noisy[:, 0] = rng.choice([ANSWER_A, ANSWER_B], size=len(noisy))  # 성향과 무관한 문항
+    item = analyze(bank, [noisy]).items[0]
+    assert abs(item.item_rest_r) < 0.1
+    assert "변별 낮음" in item.flags
+
+
+def test_too_few_responses_give_nan(bank):
+    result = analyze(bank, [np.full((1, len(bank)), ANSWER_A, dtype=np.int8)])
+    assert all(np.isnan(a.alpha) for a in result.axes)
+    assert all(np.isnan(i.item_rest_r) for i in result.items)
+
+
+def test_choices_from_bit_and_json_rows(bank, simulated):
+    rows = []
+    expected = simulated[:5]
+    for row in expected[:3]:
+        answered = sum(1 << p for p, c in enumerate(row) if c != ANSWER_NONE)
+        chosen_b = sum(1 << p for p, c in enumerate(row) if c == ANSWER_B)
+        rows.append(("", answered, chosen_b))
+    for row in expected[3:]:
+        answers = {
+            str(bank.ids[p]): bank.a_codes[p] if c == ANSWER_A else bank.b_codes[p]
+            for p, c in enumerate(row)
+            if c != ANSWER_NONE
+        }
+        rows.append((json.dumps(answers), None, None))
+    np.testing.assert_array_equal(choices_from_rows(bank, rows), expected)
@@ -0,0 +1,119 @@
+import random
+
+import numpy as np
+
+from norms import KLLSketch, NormStore
+
+
+# =========================================
+# KLL 스케치: 순위 오차, 합치기, 직렬화
+# =========================================
+def _max_rank_error(sketch, values):
+    values = np.sort(np.asarray(values))
+    worst = 0.0
+    for q in np.linspace(0.01, 0.99, 99):
+        x = float(np.quantile(values, q))
+        # 중간 순위(mid-rank): 작은 값 수 + 같은 값 수의 절반
+        true = (np.searchsorted(values, x, "left") + np.searchsorted(values, x, "right")) / 2 / len(values)
+        worst = max(worst, abs(sketch.rank(x) - true))
+    return worst
+
+
+def test_rank_error_within_bound():
+    rng = random.Random(0)
+    values = [rng.gauss(0, 1) for _ in range(100_000)]
+    sketch = KLLSketch(k=200)
+    for v in values:
+        sketch.update(v)
+    assert sketch.n == len(values)
+    # k=200 이면 보통 1% 안팎이다. (무작위 압축이므로 여유를 둔다)
+    assert _max_rank_error(sketch, values) < 0.03
+
+
+def test_merge_keeps_exact_weight_and_error():
+    rng = random.Random(1)
+    parts = [[rng.uniform(-1, 1) for _ in range(20_000)] for _ in range(5)]
+    merged = KLLSketch(k=200)
+    for part in parts:
+        sketch = KLLSketch(k=200)
+        for v in part:
+            sketch.update(v)
+        merged.merge(sketch)
+    assert merged.n == sum(len(p) for p in parts)
+    assert _max_rank_error(merged, [v for p in parts for v in p]) < 0.03
+
+
+def test_small_sketch_is_exact():
+    sketch = KLLSketch(k=200)
+    for v in [1, 2, 3, 4]:
+        sketch.update(v)
+    assert sketch.rank(0) == 0.0
+    assert sketch.rank(2) == 0.375  # (작은 값 1개 + 같은 값 1개의 절반) / 4
+    assert sketch.rank(5) == 1.0
+    assert sketch.quantile(0.0) == 1
+
+
+def test_bytes_round_trip():
+    rng = random.Random(2)
+    sketch = KLLSketch(k=100)
+    for _ in range(10_000):
+        sketch.update(rng.randint(0, 9))
+    restored = KLLSketch.from_bytes(sketch.to_bytes())
+    assert restored.n == sketch.n
+    for x in range(10):
+        assert abs(restored.rank(x) - sketch.rank(x)) < 1e-6
+
+
+def test_empty_sketch():
+    sketch = KLLSketch()
+    assert sketch.rank(1.0) is None
+    assert sketch.quantile(0.5) is None
+
+
+def test_odd_compaction_holds_back_either_end():
+    # 홀수 개를 압축할 때 남기는 값이 항상 가장 큰 값이면 위쪽 분위수가 치우친다.
+    held = set()
+    for seed in range(20):
+        sketch = KLLSketch(k=3)
+        sketch._rng = random.Random(seed)
+        for v in (1.0, 2.0, 3.0):
+            sketch.update(v)
+        assert sketch.n == 3 and sum(len(items) << h for h, items in enumerate(sketch.levels)) == 3
+        held.update(sketch.levels[0])
+    assert held == {1.0, 3.0}
+
+
+# =========================================
+# NormStore: 채우기(backfill)는 prepare() 에서 한 번만
+# =========================================
+SCORES = {"E": 6, "I": 3, "S": 2, "N": 7, "T": 5, "F": 4, "J": 1, "P": 8}
+
+
+def test_store_backfills_once_in_prepare(tmp_path):
+    path = str(tmp_path / "r.db")
+    calls = []
+
+    def summaries():
+        calls.append(1)
+        return [(0.0, "A고/1학년", "ENTP", SCORES)] * 40
+
+    store = NormStore(path, backfill=summaries)
+    assert calls == [] and store.count() == 0  # 만들기만 해서는 DB 를 읽지 않는다.
+    store.prepare()
+    assert calls == [1]
+    assert store.count() == 40 and store.count("A고/1학년") == 40
+    store.prepare()
+    assert calls == [1]
+
+    other = NormStore(path, backfill=summaries)  # 다른 워커: 이미 채웠으므로 읽기만 한다.
+    other.prepare()
+    assert calls == [1] and other.count() == 40
+
+    store.record(SCORES, "B고")
+    assert store.count() == 41 and other.count() == 40
+    store.sync()
+    other.sync()
+    assert other.count("B고") == 1
+    norm = other.percentiles(SCORES, "A고/1학년")
+    assert norm.cohort == "A고/1학년" and norm.count == 40
+    assert other.percentiles(SCORES, "B고").cohort == "*"
@@ -0,0 +1,108 @@
+import os
+import random
+
+import pytest
+
+from recommendations import (
+    RecommendationIndex,
+    RecommendationSource,
+    parse_recommendation_table,
+    score_vector,
+    type_vector,
+)
+from scoring import ALL_TYPES, AXIS_PAIRS
+
+TABLE_CSV = (
+    "mbti_type,kind,name,weight\n"
+    "INTJ,major,정책학,0.5\n"
+    "INTJ,major,컴퓨터공학,1\n"
+    "INTJ,career,연구원,\n"
+    "ESFP,전공,공연예술,\n"
+    "ENFJ,직업,교사,\n"
+    "\n"
+)
+
+
+def _table(types):
+    return {t: {"majors": [f"{t} 전공"], "careers": [f"{t} 직업"]} for t in types}
+
+
+def _brute_force(covered, mbti_type, vector):
+    # 추천이 있는 유형 중 거리가 가장 가까운 것 (같으면 ALL_TYPES 순서가 앞선 것)
+    if mbti_type in covered:
+        return mbti_type
+    candidates = [t for t in ALL_TYPES if t in covered]
+    return min(candidates, key=lambda t: (sum((p - q) ** 2 for p, q in zip(vector, type_vector(t))), ALL_TYPES.index(t)))
+
+
+def test_parse_orders_by_weight_and_accepts_korean_kinds():
+    table = parse_recommendation_table(TABLE_CSV.encode("cp949"))
+    assert table["INTJ"] == {"majors": ["컴퓨터공학", "정책학"], "careers": ["연구원"]}
+    assert table["ESFP"] == {"majors": ["공연예술"]}
+    assert table["ENFJ"] == {"careers": ["교사"]}
+
+
+@pytest.mark.parametrize(
+    "row, message",
+    [("XXXX,major,a,", "알 수 없는 유형"), ("INTJ,hobby,a,", "kind"), ("INTJ,major,a,high", "weight")],
+)
+def test_parse_errors_name_the_line(row, message):
+    with pytest.raises(ValueError, match=message) as e:
+        parse_recommendation_table(f"mbti_type,kind,name,weight\n{row}\n".encode("utf-8"))
+    assert "2행" in str(e.value)
+
+
+def test_type_only_lookup_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(30):
+        covered = set(rng.sample(ALL_TYPES, rng.randint(1, 15)))
+        index = RecommendationIndex(_table(covered))
+        for t in ALL_TYPES:
+            rec = index.lookup(t)
+            assert rec.mbti_type == t
+            assert rec.source_type == _brute_force(covered, t, type_vector(t))
+            assert rec.majors == (f"{rec.source_type} 전공",)
+
+
+def test_score_lookup_matches_brute_force():
+    rng = random.Random(5)
+    for _ in range(20):
+        covered = set(rng.sample(ALL_TYPES, rng.randint(1, 15)))
+        index = RecommendationIndex(_table(covered))
+        for _ in range(50):
+            scores = {}
+            for a, b in AXIS_PAIRS:
+                scores[a] = rng.randint(0, 9)
+                scores[b] = rng.randint(0, 9 - scores[a]) if rng.random() < 0.3 else 9 - scores[a]
+            t = "".join(a if scores[a] >= scores[b] else b for a, b in AXIS_PAIRS)
+            assert index.lookup(t, scores).source_type == _brute_force(covered, t, score_vector(scores))
+
+
+def test_exact_type_ignores_scores_and_empty_table_gives_empty():
+    index = RecommendationIndex(_table(["ISTJ"]))
+    assert index.lookup("ISTJ", {"E": 9, "I": 0}).exact
+    assert not index.lookup("ESTJ").exact
+    empty = RecommendationIndex({})
+    rec = empty.lookup("ENFP")
+    assert (rec.source_type, rec.majors, rec.careers) == ("ENFP", (), ())
+    assert empty.covered_types == []
+
+
+def test_source_reloads_changed_file_and_keeps_index_on_error(tmp_path):
+    path = tmp_path / "rec.csv"
+    source = RecommendationSource(str(path), _table(["ENTP"]), check_interval=0)
+    assert source.index().version == "builtin"
+    assert source.index().lookup("INTJ").source_type == "ENTP"
+
+    path.write_text(TABLE_CSV, encoding="utf-8")
+    index = source.index()
+    assert index.version != "builtin"
+    assert index.lookup("INTJ").majors == ("컴퓨터공학", "정책학")
+
+    path.write_text("mbti_type,kind\nINTJ,major\n", encoding="utf-8")
+    os.utime(path, ns=(1, 1))  # 크기가 같아도 바뀐 것으로 보이게
+    assert source.index() is index
+    assert "name" in source.last_error
+
+    path.unlink()
+    assert source.index().version == "builtin"
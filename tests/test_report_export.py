@@ -0,0 +1,67 @@
+import csv
+import io
+import threading
+import zipfile
+
+import pytest
+
+from report_export import SUMMARY_NAME, ReportJob, export_reports, read_report_jobs
+from scoring import SCORE_KEYS
+
+RESULTS_CSV = (
+    "학번,이름,mbti_type,E,I,S,N,T,F,J,P,error\n"
+    "10101,김 하나,ESTJ,5,4,6,3,7,2,8,1,\n"
+    "10102,이둘,,0,0,0,0,0,0,0,0,\"3번 문항 값이 올바르지 않습니다\"\n"
+    "10103,박/셋,infp,1,8,2,7,3,6,4,5,\n"
+)
+
+
+def _summary(zf: zipfile.ZipFile):
+    return list(csv.DictReader(io.StringIO(zf.read(SUMMARY_NAME).decode("utf-8-sig"))))
+
+
+def test_read_report_jobs_skips_error_rows():
+    jobs = read_report_jobs(io.BytesIO(RESULTS_CSV.encode("utf-8")))
+    assert [(j.label, j.mbti_type) for j in jobs] == [("10101_김 하나", "ESTJ"), ("10103_박/셋", "INFP")]
+    assert jobs[1].scores["I"] == 8
+
+
+def test_read_report_jobs_requires_score_columns():
+    with pytest.raises(ValueError, match="mbti_type"):
+        read_report_jobs(io.BytesIO("학번,E\n1,2\n".encode("utf-8")))
+
+
+def test_export_zip_records_failed_jobs_and_continues(tmp_path):
+    jobs = read_report_jobs(io.BytesIO(RESULTS_CSV.encode("utf-8")))
+    jobs.append(ReportJob("broken", "ENFP", {"E": 1}))  # 점수가 빠져 그리다 실패한다.
+    jobs.append(ReportJob("10104", "ISTP", {k: 1 for k in SCORE_KEYS}))
+    out = tmp_path / "reports.zip"
+    progress = []
+
+    state = export_reports(jobs, str(out), workers=1, renderer="svg", progress=lambda s: progress.append(s.done))
+
+    assert (state.done, state.failed, state.cancelled) == (4, 1, False)
+    assert progress[-1] == 4
+    with zipfile.ZipFile(out) as zf:
+        names = sorted(n for n in zf.namelist() if n != SUMMARY_NAME)
+        assert names == ["0001_10101_김_하나_ESTJ.svg", "0002_10103_박_셋_INFP.svg", "0004_10104_ISTP.svg"]
+        assert zf.read(names[0]).lstrip().startswith(b"<")
+        summary = _summary(zf)
+    assert [r["file"] for r in summary] == names + [""]
+    assert summary[-1]["label"] == "broken"
+    assert summary[-1]["error"].startswith("KeyError")
+    assert all(r["error"] == "" for r in summary[:-1])
+
+
+def test_export_cancel_stops_queueing(tmp_path):
+    jobs = [ReportJob(str(i), "ESTJ", {k: i % 3 for k in SCORE_KEYS}) for i in range(50)]
+    cancel = threading.Event()
+    cancel.set()
+    out = tmp_path / "reports.zip"
+
+    state = export_reports(jobs, str(out), workers=1, renderer="svg", cancel=cancel, max_in_flight=2)
+
+    assert state.cancelled
+    assert 0 < state.done <= 2
+    with zipfile.ZipFile(out) as zf:
+        assert len(_summary(zf)) == state.done
@@ -0,0 +1,80 @@
+import sqlite3
+import time
+
+import pytest
+
+from result_store import ResultRecord, ResultStore
+from scoring import SCORE_KEYS
+
+SCORES = {k: 1 for k in SCORE_KEYS}
+
+
+def _wait(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "r.db"), flush_interval=0.01, retry_delay=0.01, busy_timeout=0.05)
+    yield store
+    store.close()
+
+
+# =========================================
+# write-behind 쓰기 / 잠금 재시도
+# =========================================
+def test_submit_and_query(store):
+    for i in range(5):
+        store.submit(ResultRecord("ESTJ", SCORES, {1: "E"}, cohort=f"A고/2학년/{i}반"))
+    store.flush()
+    assert store.count() == 5
+    assert len(store.query(cohort="A고")) == 5
+    assert store.query(cohort="A고/2학년/3반")[0].answers == {1: "E"}
+
+
+def test_locked_database_is_retried_not_dropped(store):
+    lock = sqlite3.connect(store.path, isolation_level=None)
+    lock.execute("BEGIN IMMEDIATE")  # 다른 프로세스가 쓰기 잠금을 오래 잡고 있는 상황
+    try:
+        for _ in range(3):
+            store.submit(ResultRecord("ENFP", SCORES, {}))
+        _wait(lambda: store.retrying == 3)
+        assert store.written == 0
+        assert store.status()["last_error"].startswith("OperationalError")
+    finally:
+        lock.execute("COMMIT")
+        lock.close()
+
+    _wait(lambda: store.written == 3)
+    assert store.count() == 3
+    assert store.dropped == 0
+    assert store.retrying == 0
+    assert store.status()["last_error"] is None
+
+
+def test_results_written_after_lock_join_later_batch(store):
+    lock = sqlite3.connect(store.path, isolation_level=None)
+    lock.execute("BEGIN IMMEDIATE")
+    store.submit(ResultRecord("ENFP", SCORES, {}))
+    _wait(lambda: store.retrying == 1)
+    lock.execute("COMMIT")
+    lock.close()
+    store.submit(ResultRecord("ISTP", SCORES, {}))
+    _wait(lambda: store.written == 2)
+    assert store.type_counts() == {"ENFP": 1, "ISTP": 1}
+
+
+def test_readonly_store_does_not_create_or_write(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        ResultStore(str(tmp_path / "missing.db"), readonly=True)
+    assert not (tmp_path / "missing.db").exists()
+
+    ResultStore(str(tmp_path / "r.db")).close()
+    store = ResultStore(str(tmp_path / "r.db"), readonly=True, read_pool_size=1)
+    with pytest.raises(RuntimeError):
+        store.submit(ResultRecord("ESTJ", SCORES, {}))
+    assert store.count() == 0
+    store.close()
@@ -0,0 +1,34 @@
+import numpy as np
+
+from conftest import choices_to_answers, random_answers, reference_score
+from mbti_core import compute_mbti
+from scoring import ANSWER_B, ANSWER_NONE, SCORE_KEYS, item_index_from_bank, score_batch
+
+
+# =========================================
+# 배치 채점 엔진 / compute_mbti
+# =========================================
+def test_score_batch_matches_reference(bank):
+    rng = np.random.default_rng(0)
+    choices = rng.integers(ANSWER_NONE, ANSWER_B + 1, size=(20_000, len(bank)), dtype=np.int8)
+    types, score_matrix = score_batch(item_index_from_bank(bank), choices)
+    for row, mbti_type, scores in zip(choices, types, score_matrix):
+        expected_type, expected = reference_score(bank, choices_to_answers(bank, row))
+        assert str(mbti_type) == expected_type
+        assert scores.tolist() == [expected[k] for k in SCORE_KEYS]
+
+
+def test_score_batch_ties_go_to_front_letter(bank):
+    types, score_matrix = score_batch(item_index_from_bank(bank), np.zeros((1, len(bank)), dtype=np.int8))
+    assert str(types[0]) == "ESTJ"
+    assert score_matrix[0].tolist() == [0] * len(SCORE_KEYS)
+
+
+def test_compute_mbti_matches_reference(bank):
+    rng = np.random.default_rng(1)
+    df = bank.to_frame()
+    for _ in range(500):
+        answers = random_answers(bank, rng)
+        expected = reference_score(bank, answers)
+        assert compute_mbti(bank, answers) == expected
+        assert compute_mbti(df, answers) == expected
@@ -0,0 +1,91 @@
+import time
+import uuid
+
+import pytest
+
+from session_store import (
+    FileSessionBackend,
+    MemorySessionBackend,
+    SessionBackend,
+    SessionRecord,
+    SessionStore,
+    SQLiteSessionBackend,
+    open_session_backend,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "file"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionBackend()
+    if request.param == "sqlite":
+        return SQLiteSessionBackend(str(tmp_path / "s.db"))
+    return FileSessionBackend(str(tmp_path / "sessions"))
+
+
+def _record(**kwargs) -> SessionRecord:
+    return SessionRecord(session_id=uuid.uuid4().hex, **kwargs)
+
+
+# =========================================
+# 백엔드 공통 동작
+# =========================================
+def test_round_trip(backend):
+    store = SessionStore(backend)
+    record = _record(idx=3, answers={1: "E", 2: "N"}, cohort="A고/1학년", adaptive=True, bank_name="default")
+    store.save(record)
+    loaded = store.load(record.session_id)
+    assert loaded.to_state() == record.to_state()
+
+
+def test_save_from_another_worker_is_seen(backend):
+    # 워커 두 개가 같은 백엔드를 쓴다. 새로 연결한 워커는 항상 마지막 저장 값을 읽어야 한다.
+    first, second = SessionStore(backend), SessionStore(backend)
+    record = _record(idx=1, answers={1: "E"})
+    first.save(record)
+    assert second.load(record.session_id).idx == 1
+    record.idx, record.answers = 2, {1: "E", 2: "S"}
+    second.save(record)
+    assert first.load(record.session_id).answers == {1: "E", 2: "S"}
+
+
+def test_expired_session_is_not_loaded_and_swept(backend):
+    store = SessionStore(backend, ttl=60, sweep_interval=1e9)
+    old, new = _record(), _record()
+    store.save(old)
+    store.save(new)
+    backend.put(old.session_id, old.to_json(), time.time() - 120)
+    assert store.load(old.session_id) is None
+    assert store.sweep() == 1
+    assert backend.get(old.session_id) is None
+    assert store.load(new.session_id) is not None
+
+
+def test_delete(backend):
+    store = SessionStore(backend)
+    record = _record()
+    store.save(record)
+    store.delete(record.session_id)
+    assert store.load(record.session_id) is None
+
+
+@pytest.mark.parametrize("session_id", [None, "", "../etc/passwd", "ABC", uuid.uuid4().hex.upper()])
+def test_invalid_session_id_is_ignored(backend, session_id):
+    assert SessionStore(backend).load(session_id) is None
+
+
+def test_backend_spec(tmp_path):
+    assert isinstance(open_session_backend("memory"), MemorySessionBackend)
+    assert isinstance(open_session_backend(f"sqlite:{tmp_path / 's.db'}"), SQLiteSessionBackend)
+    assert isinstance(open_session_backend(f"file:{tmp_path / 'd'}"), FileSessionBackend)
+    with pytest.raises(ValueError):
+        open_session_backend("redis:localhost")
+
+
+def test_backend_must_implement_every_method():
+    class Partial(SessionBackend):
+        def get(self, session_id):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
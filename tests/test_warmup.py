@@ -0,0 +1,48 @@
+import json
+import socket
+import urllib.error
+import urllib.request
+
+import warmup
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(port, path):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_health_server_reports_readiness(monkeypatch):
+    monkeypatch.setattr(warmup, "state", warmup.WarmupState())
+    monkeypatch.setattr(warmup, "_health_server", None)
+    port, app_port = _free_port(), _free_port()
+    server = warmup.start_health_server(port, host="127.0.0.1", app_port=app_port)
+    try:
+        # 앱(app.py)이 MBTI_HEALTH_PORT 로 다시 불러도 같은 서버를 쓴다.
+        assert warmup.start_health_server(port, host="127.0.0.1") is server
+        assert _get(port, "/live")[0] == 200
+        assert _get(port, "/ready")[0] == 503
+        assert _get(port, "/nope")[0] == 404
+
+        warmup.state.started_at = warmup.state.finished_at = 1.0
+        code, body = _get(port, "/ready")
+        assert (code, body["ready"], body["app_listening"]) == (503, True, False)
+
+        with socket.socket() as app:
+            app.bind(("127.0.0.1", app_port))
+            app.listen()
+            assert _get(port, "/ready")[0] == 200
+
+        warmup.state.error = "font: OSError: x"
+        assert _get(port, "/ready")[0] == 503
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,237 @@
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from metrics import registry
+
+
+# =========================================
+# 시작 준비(warm-up) & 준비 상태 확인
+#  - 첫 학생이 치르던 준비 비용을 프로세스가 시작할 때 미리 치른다.
+#      item_banks : 등록된 문항 은행 컴파일(또는 산출물 읽기), 채점 마스크, 적응형 순서
+#      profiles   : 진로 추천 표 색인, 유형별 설명·추천 블록, SVG 틀
+#      font       : 한글 글꼴 찾기 (matplotlib 글꼴 캐시 생성 포함)
+#      figure     : 버리는 결과 이미지 한 장 (Agg 백엔드, 텍스트 배치 준비)
+#  - 여러 번 불러도 한 번만 실행한다. (동시에 부르면 끝날 때까지 기다림)
+#  - 준비 상태 HTTP: GET /ready -> 200 준비 완료 / 503 준비 중·실패, GET /live -> 200
+#    로드밸런서는 /ready 가 200인 워커에만 학생을 보내도록 설정한다.
+#
+#  준비 상태 서버는 둘 중 한 가지로 띄운다.
+#    python -m warmup serve --health-port 8502 -- --server.port 8501   # 준비 후 streamlit 실행
+#    MBTI_HEALTH_PORT=8502 streamlit run app.py                        # 앱이 첫 접속 때 띄움
+#  (그냥 streamlit run 이면 /ready 가 없다. 두 번째 방법은 첫 요청이 들어와야 준비를 시작하므로
+#   로드밸런서 뒤에서는 serve 를 권한다)
+#  python -m warmup check                                            # 준비만 해 보고 결과 출력
+# =========================================
+registry.describe("warmup_seconds", "시작 준비 단계별 시간(초)")
+
+
+@dataclass
+class WarmupState:
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    steps: Dict[str, float] = field(default_factory=dict)  # 단계 -> 걸린 시간(초)
+    font: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None and self.error is None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": dict(self.steps),
+            "font": self.font,
+            "error": self.error,
+        }
+
+
+state = WarmupState()
+_lock = threading.Lock()
+_health_server: Optional[ThreadingHTTPServer] = None  # 프로세스당 하나
+_health_lock = threading.Lock()
+
+
+# -----------------------------
+# 준비 단계
+# -----------------------------
+def _warm_item_banks() -> None:
+    import pandas  # noqa: F401  (화면용 DataFrame 만들 때 쓰는 import 비용)
+
+    from adaptive import get_adaptive_plan
+    from answer_bits import get_bank_masks
+    from bank_registry import DEFAULT_BANK, configured_banks
+    from item_bank import load_item_bank
+
+    for name, path in configured_banks().items():
+        try:
+            bank = load_item_bank(path)
+        except (OSError, ValueError):
+            if name == DEFAULT_BANK:
+                raise
+            continue  # 추가 문항 은행은 앱의 BankRegistry 가 상태를 보여 준다.
+        get_bank_masks(bank)
+        get_adaptive_plan(bank)
+
+
+def _warm_profiles() -> None:
+    import result_svg  # noqa: F401  (SVG 틀은 import 할 때 만든다)
+    from mbti_core import ALL_TYPES, get_result_fragments
+
+    for mbti_type in ALL_TYPES:
+        get_result_fragments(mbti_type)
+
+
+def _warm_font() -> None:
+    from result_figure import resolve_korean_font
+
+    state.font = resolve_korean_font()
+
+
+def _warm_figure() -> None:
+    from mbti_core import recommendations_for
+    from result_figure import configured_renderer, render_result_image
+
+    scores = {"E": 5, "I": 4, "S": 3, "N": 6, "T": 6, "F": 3, "J": 2, "P": 7}
+    render_result_image("ENTP", scores, recommendations_for("ENTP", scores), configured_renderer())
+
+
+STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("item_banks", _warm_item_banks),
+    ("profiles", _warm_profiles),
+    ("font", _warm_font),
+    ("figure", _warm_figure),
+]
+
+
+def run_warmup() -> WarmupState:
+    with _lock:
+        if state.started_at is not None:
+            return state
+        state.started_at = time.time()
+        for name, step in STEPS:
+            started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:  # 어떤 단계든 실패하면 준비 안 됨으로 둔다. (/ready 503)
+                state.error = f"{name}: {type(e).__name__}: {e}"
+                break
+            finally:
+                state.steps[name] = time.perf_counter() - started
+                registry.observe("warmup_seconds", state.steps[name], step=name)
+        state.finished_at = time.time()
+    return state
+
+
+def start_warmup_thread() -> threading.Thread:
+    thread = threading.Thread(target=run_warmup, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# =========================================
+# 준비 상태 HTTP 서버
+#  - app_port 를 주면 그 포트(streamlit)가 열려 있어야 준비 완료로 본다.
+#  - 이미 띄웠으면 그 서버를 돌려준다. (serve 로 띄운 뒤 app.py 가 다시 불러도 됨)
+# =========================================
+def _port_open(port: int, host: str = "127.0.0.1") -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def start_health_server(port: int, host: str = "0.0.0.0", app_port: Optional[int] = None) -> ThreadingHTTPServer:
+    global _health_server
+    with _health_lock:
+        if _health_server is None:
+            _health_server = _serve_health(port, host, app_port)
+        return _health_server
+
+
+def _serve_health(port: int, host: str, app_port: Optional[int]) -> ThreadingHTTPServer:
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            path = self.path.split("?", 1)[0]
+            body = state.to_dict()
+            if path == "/live":
+                code = 200
+            elif path == "/ready":
+                app_up = app_port is None or _port_open(app_port)
+                body["app_listening"] = app_up
+                code = 200 if state.ready and app_up else 503
+            else:
+                code, body = 404, {"error": "not found"}
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args) -> None:
+            pass  # 로드밸런서가 몇 초마다 부르므로 접속 로그는 남기지 않는다.
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="health-server", daemon=True).start()
+    return server
+
+
+# =========================================
+# CLI
+# =========================================
+def _streamlit_port(args: Sequence[str]) -> int:
+    for i, arg in enumerate(args):
+        if arg.startswith("--server.port="):
+            return int(arg.split("=", 1)[1])
+        if arg == "--server.port" and i + 1 < len(args):
+            return int(args[i + 1])
+    return 8501
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="시작 준비(warm-up) 후 streamlit 실행 / 준비 상태 확인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="준비 상태 서버를 띄우고, 준비를 마친 뒤 streamlit 실행")
+    serve.add_argument("--script", default="app.py")
+    serve.add_argument("--health-port", type=int, default=8502)
+    serve.add_argument("streamlit_args", nargs=argparse.REMAINDER, help="-- 뒤는 streamlit run 옵션")
+    sub.add_parser("check", help="준비 단계만 실행하고 결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    # python warmup.py / python -m warmup 으로 실행하면 이 모듈은 __main__ 이다.
+    # app.py 의 `import warmup` 이 새 모듈(따로 노는 state)을 만들지 않도록 같은 모듈로 등록한다.
+    sys.modules.setdefault("warmup", sys.modules[__name__])
+
+    if args.command == "check":
+        result = run_warmup()
+        print(json.dumps(result.to_dict(), ensure_ascii=False, indent=2))
+        return 0 if result.ready else 1
+
+    streamlit_args = [a for a in args.streamlit_args if a != "--"]
+    start_health_server(args.health_port, app_port=_streamlit_port(streamlit_args))
+    result = run_warmup()
+    if not result.ready:
+        # 그래도 streamlit 은 띄운다. (/live 는 200, /ready 는 503 으로 남아 원인을 볼 수 있게)
+        print(f"시작 준비 실패: {result.error}", file=sys.stderr)
+
+    # 같은 프로세스에서 streamlit 을 실행해야 준비한 모듈·캐시를 그대로 쓴다.
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", args.script, *streamlit_args]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())